@@ -0,0 +1,67 @@
+"""
+Compares the CSV writer used when the column order is not known (`CsvWriter`, backed by
+`csv.DictWriter`) with the one driven by the schema definition (`SchemaCsvWriter`, which converts
+rows to tuples in bulk), by writing the same rows, in batches the size of an SSE event, to a
+temporary file with each of them:
+
+    python benchmarks/csv_writer_benchmark.py --rows 200000 --batch-size 100 --repeat 3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from synthex.writers import CsvWriter, OutputWriter, SchemaCsvWriter
+
+
+COLUMNS = ["question", "option-a", "option-b", "option-c", "option-d", "answer", "score"]
+
+
+def make_rows(count: int) -> List[dict]:
+    # Keys in a different order than the schema, as a server may send them.
+    return [
+        {
+            "answer": "option-a", "score": i * 0.5, "question": f"What is question number {i}?",
+            "option-a": "The first option", "option-b": "The second option",
+            "option-c": "The third option", "option-d": "The fourth option",
+        }
+        for i in range(count)
+    ]
+
+
+def run(name: str, factory: Callable[[str], OutputWriter], rows: List[dict], batch_size: int,
+        repeat: int) -> float:
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "out.csv")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with factory(path) as writer:
+                for i in range(0, len(rows), batch_size):
+                    writer.write_rows(rows[i:i + batch_size])
+            best = min(best, time.perf_counter() - start)
+        size = os.path.getsize(path)
+    print(f"{name:<16} {best:8.3f}s  {len(rows) / best:12.0f} rows/s  {size / 1024 ** 2:8.1f} MiB")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    baseline = run("CsvWriter", CsvWriter, rows, args.batch_size, args.repeat)
+    schema = run(
+        "SchemaCsvWriter", lambda path: SchemaCsvWriter(path, COLUMNS), rows, args.batch_size,
+        args.repeat
+    )
+    print(f"Speed-up: {baseline / schema:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Measures the per-call cost of turning a successful API response into its model, by comparing
+the previous pipeline (`Response.json()` into a dict, `SuccessResponse(**dict)`, then
+`Model.model_validate(response.data)`) with the single-pass one used by `APIClient`, which
+validates the raw body straight into `SuccessResponse[Model]`.
+
+No network access is needed: responses are served by an in-memory transport, so the numbers only
+reflect parsing and validation.
+
+    python benchmarks/response_parsing_benchmark.py --jobs 100 --calls 2000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+from synthex.api_client import APIClient, response_data
+from synthex.endpoints import LIST_JOBS_ENDPOINT
+from synthex.models import ListJobsResponseModel, SuccessResponse
+from synthex.transports import Response, Transport
+
+
+class _InMemoryResponse:
+    def __init__(self, url: str, body: bytes):
+        self.status_code = 200
+        self.url = url
+        self.body = body
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return {}
+
+    @property
+    def content(self) -> bytes:
+        return self.body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        yield from self.body.splitlines()
+
+    def close(self) -> None:
+        pass
+
+
+class _InMemoryTransport(Transport):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        return _InMemoryResponse(url, self.body)
+
+
+def list_jobs_body(jobs: int) -> bytes:
+    return json.dumps({
+        "status_code": 200,
+        "status": "success",
+        "message": "ok",
+        "data": {
+            "total": jobs,
+            "jobs": [
+                {
+                    "id": f"job-{i:05d}",
+                    "name": f"Job {i}",
+                    "description": "Short English texts, labelled with their sentiment.",
+                    "datapoint_num": 1000,
+                    "output_domain": "text,label,score",
+                    "status": "Completed",
+                    "created_at": "2026-01-01T12:00:00Z",
+                }
+                for i in range(jobs)
+            ],
+        },
+    }).encode("utf-8")
+
+
+def time_calls(call: Callable[[], Any], calls: int) -> float:
+    """
+    Return the mean duration of a call, in microseconds, after a warm-up call.
+    """
+
+    call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=100, help="Jobs in each list response.")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per pipeline.")
+    args = parser.parse_args()
+
+    body = list_jobs_body(args.jobs)
+    client = APIClient("benchmark", transport=_InMemoryTransport(body), coalesce_requests=False)
+
+    def legacy() -> ListJobsResponseModel:
+        response = client._request("GET", f"{client.BASE_URL}/{LIST_JOBS_ENDPOINT}")
+        client._handle_errors(response)
+        envelope = SuccessResponse(**response.json())
+        return ListJobsResponseModel.model_validate(envelope.data)
+
+    def single_pass() -> ListJobsResponseModel:
+        response = client.get(LIST_JOBS_ENDPOINT, model=ListJobsResponseModel)
+        return response_data(response, ListJobsResponseModel)
+
+    assert legacy() == single_pass(), "The pipelines disagree."
+    before = time_calls(legacy, args.calls)
+    after = time_calls(single_pass, args.calls)
+    print(f"Body: {len(body) / 1024:.1f} KiB, {args.jobs} jobs, {args.calls} calls per pipeline")
+    print(f"json() + SuccessResponse(**) + model_validate  {before:9.1f} µs/call")
+    print(f"SuccessResponse[Model].model_validate_json     {after:9.1f} µs/call")
+    print(f"Saved {before - after:.1f} µs/call ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares the default `requests`-based transport with the HTTP/2 transport, by sending many
+concurrent requests to the same server and reporting the wall time and the number of connections
+(and therefore TCP + TLS handshakes) each transport needed.
+
+Run it against a local HTTP/2 server that answers GET requests on `/credits/promotional`, e.g.
+one served by `hypercorn --certfile cert.pem --keyfile key.pem app:app`:
+
+    python benchmarks/transport_benchmark.py --base-url https://localhost:8000 --requests 200 \
+        --concurrency 32
+
+Requires the `http2` extra: `pip install synthex[http2]`. Certificate verification uses the
+default trust store, so point `SSL_CERT_FILE` and `REQUESTS_CA_BUNDLE` at the local certificate.
+
+Results of 6 runs with the command above, against hypercorn 0.18 on the loopback interface
+(self-signed TLS, 1 CPU, httpx 0.28.1, h2 4.4.1), as median [min - max]:
+
+    RequestsTransport   0.75s [0.71 - 0.83]  267 req/s  31-33 connections
+    HTTP2Transport      0.59s [0.57 - 0.63]  341 req/s  1 connection
+
+About 1 run in 20 of the HTTP/2 transport failed with `httpx.WriteError` after a `KeyError` in
+the stream bookkeeping of `h2`, which is not safe under this many threads sharing a connection.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from synthex.api_client import APIClient
+from synthex.endpoints import GET_PROMOTIONAL_CREDITS_ENDPOINT
+from synthex.transports import HTTP2Transport, RequestsTransport, Transport
+
+
+def count_connections(transport: Transport) -> int:
+    """
+    Count the connections opened by a transport so far. Relies on private attributes of
+    `urllib3` and `httpcore`, which is acceptable in a benchmark.
+    """
+
+    if isinstance(transport, RequestsTransport):
+        total = 0
+        for session in list(transport.sessions._sessions):
+            for adapter in session.adapters.values():
+                for pool in adapter.poolmanager.pools._container.values():  # type: ignore[attr-defined]
+                    total += pool.num_connections
+        return total
+    if isinstance(transport, HTTP2Transport):
+        pool: Any = transport.client._transport._pool
+        return len(pool.connections)
+    return -1
+
+
+def run(transport: Transport, base_url: str, requests: int, concurrency: int) -> None:
+    client = APIClient("benchmark", transport=transport, coalesce_requests=False)
+    client.BASE_URL = base_url
+    # Warm-up request, so that both transports start from an established connection.
+    client.get(GET_PROMOTIONAL_CREDITS_ENDPOINT)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: client.get(GET_PROMOTIONAL_CREDITS_ENDPOINT), range(requests)))
+        elapsed = time.perf_counter() - start
+        # Counted before the worker threads exit, which closes their sessions.
+        connections = count_connections(transport)
+
+    print(
+        f"{type(transport).__name__:<20} {elapsed:8.3f}s  {requests / elapsed:9.1f} req/s  "
+        f"{connections:4d} connections"
+    )
+    client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    run(RequestsTransport(per_thread=True), args.base_url, args.requests, args.concurrency)
+    run(HTTP2Transport(), args.base_url, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
-from typing import Optional
+from typing import List, Optional
+from functools import partial
 import os
 from dotenv import load_dotenv
 
 from .api_client import APIClient
+from .client_pool import Client, ClientPool, PoolStrategy
 from .jobs_api import JobsAPI
 from .users_api import UsersAPI
 from .credits_api import CreditsAPI
 from .decorators import handle_validation_errors
 from .exceptions import ConfigurationError
+from .transports import Transport
+from .concurrency import AdaptiveLimiter
 
 
 @handle_validation_errors
@@ -17,23 +21,57 @@ class Synthex:
     Attributes:
         jobs (JobsAPI): Provides access to job-related API operations.
     Methods:
-        __init__(api_key: str):
-            Initializes the Synthex client with the provided API key.
+        __init__(api_key: str, cache_dir: Optional[str] = None, api_keys: Optional[List[str]] = None,
+                pool_strategy: PoolStrategy = "round_robin", thread_safe: bool = False,
+                transport: Optional[Transport] = None, limiter: Optional[AdaptiveLimiter] = None,
+                timeout: Optional[float] = None, profile_dir: Optional[str] = None):
+            Initializes the Synthex client with the provided API key. If `cache_dir` is provided,
+            GET responses are cached on disk and revalidated with conditional requests. If 
+            `api_keys` is provided, requests are spread across all of them according to 
+            `pool_strategy`, and `api_key` is ignored. If `thread_safe` is True, every thread 
+            uses its own HTTP session, so that the instance can be shared by many threads. If 
+            `transport` is provided (e.g. an `HTTP2Transport`), it is used to send all requests. 
+            If `limiter` is provided (an `AdaptiveLimiter`), it adapts the number of requests 
+            in flight to the server's health. If `timeout` is provided, requests that make no 
+            progress for that many seconds fail with a `DeadlineExceededError`. If `profile_dir` 
+            is provided (or the SYNTHEX_PROFILE_DIR environment variable is set), every call is 
+            profiled, and a report splitting its time between network wait, SSE parsing, JSON 
+            decoding, validation and file writes is written to that directory.
         ping() -> bool: Pings the Synthex API to check if it is reachable, returns True if 
             reachable, False otherwise.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self, api_key: Optional[str] = None, cache_dir: Optional[str] = None,
+        api_keys: Optional[List[str]] = None, pool_strategy: PoolStrategy = "round_robin",
+        thread_safe: bool = False, transport: Optional[Transport] = None,
+        limiter: Optional[AdaptiveLimiter] = None, timeout: Optional[float] = None,
+        profile_dir: Optional[str] = None
+    ):
         load_dotenv()
         
-        if not api_key:
-            api_key=os.environ.get("API_KEY")
-        if not api_key:
-            raise ConfigurationError(
-                "An API key is required. Please provide it as an argument or set the API_KEY \
-                environment variable."
+        self._client: Client
+        if api_keys:
+            self._client = ClientPool(
+                api_keys, strategy=pool_strategy, 
+                client_factory=partial(
+                    APIClient, cache_dir=cache_dir, thread_safe=thread_safe, transport=transport,
+                    limiter=limiter, timeout=timeout
+                ),
+                profile_dir=profile_dir
+            )
+        else:
+            if not api_key:
+                api_key=os.environ.get("API_KEY")
+            if not api_key:
+                raise ConfigurationError(
+                    "An API key is required. Please provide it as an argument or set the API_KEY \
+                    environment variable."
+                )
+            self._client = APIClient(
+                api_key, cache_dir=cache_dir, thread_safe=thread_safe, transport=transport,
+                limiter=limiter, timeout=timeout, profile_dir=profile_dir
             )
-        self._client = APIClient(api_key)
         self.jobs = JobsAPI(self._client)
         self.users = UsersAPI(self._client)
         self.credits = CreditsAPI(self._client)
@@ -1,11 +1,47 @@
 import requests
-from typing import Optional, Any
+import hashlib
+import json
+import time
+from urllib.parse import urlsplit
+from typing import Iterable, Optional, Any, TypeVar, Union
+from pydantic import BaseModel
 
 from .endpoints import API_BASE_URL, PING_ENDPOINT
 from .models import SuccessResponse
+from .http_cache import CacheEntry, HTTPCache
+from .coalescing import SingleFlight
+from .transports import (
+    RequestsTransport, Response, Transport, is_network_error, is_timeout_error, on_close
+)
+from .concurrency import AdaptiveLimiter
+from .recording import RecordingTransport
+from .profiling import Profiler, get_profiler, profiled
 from .exceptions import *
 
 
+M = TypeVar("M", bound=BaseModel)
+
+
+def response_data(response: SuccessResponse[Any], model: type[M]) -> M:
+    """
+    Get the data of a successful response that was parsed into a model.
+    Args:
+        response (SuccessResponse[Any]): The response, parsed with `model`.
+        model (type[M]): The model of the response's data.
+    Returns:
+        M: The data of the response.
+    Raises:
+        ServerError: If the response carries no data.
+    """
+
+    if not isinstance(response.data, model):
+        raise ServerError(
+            f"The response carries no {model.__name__}", response.status_code,
+            details=response.message
+        )
+    return response.data
+
+
 class APIClient:
     """
     A utility class for interacting with a RESTful API. It provides methods for sending HTTP 
@@ -13,11 +49,35 @@ class APIClient:
     Attributes:
         BASE_URL (str): The base URL of the API.
         API_KEY (str): The API key used for authentication.
-        session (requests.Session): A persistent session object for making HTTP requests.
+        transport (Transport): The transport used to send HTTP requests. Defaults to a 
+            `RequestsTransport`.
+        session (requests.Session): A persistent session object for making HTTP requests, when 
+            the default transport is used. In thread-safe mode, every thread gets its own session.
+        cache (Optional[HTTPCache]): The on-disk HTTP cache used by GET requests, if enabled.
+        timeout (Optional[float]): The default timeout, in seconds, of every request. See 
+            `Transport.request`.
+        profiler (Optional[Profiler]): The profiler of the client's calls, if profiling is 
+            enabled. Set it to None to stop profiling them.
     Methods:
-        __init__(api_key: str): 
-            Initializes the APIClient with the provided API key and sets up the session headers.
-        _handle_errors(response: requests.Response) -> None:
+        __init__(api_key: str, cache_dir: Optional[str] = None, coalesce_requests: bool = True,
+                thread_safe: bool = False, transport: Optional[Transport] = None,
+                record_to: Optional[str] = None, limiter: Optional[AdaptiveLimiter] = None,
+                timeout: Optional[float] = None, profile_dir: Optional[str] = None): 
+            Initializes the APIClient with the provided API key and sets up the request headers.
+            If `cache_dir` is provided, GET responses are cached there and revalidated with
+            conditional requests. If `coalesce_requests` is True, concurrent identical GET 
+            requests share a single HTTP call. If `thread_safe` is True, every thread uses its 
+            own session, so that the client can be shared by many threads. If `transport` is 
+            provided, it is used to send requests instead of the default, `requests`-based one.
+            If `record_to` is provided, every request/response pair is recorded to that file, 
+            so that it can be replayed later through a `ReplayTransport`. If `limiter` is 
+            provided, it caps the number of requests in flight, adapting the cap to the 
+            server's health. If `timeout` is provided, requests that make no progress for that 
+            many seconds fail with a `DeadlineExceededError`; every verb accepts a `timeout` 
+            argument that overrides it. If `profile_dir` is provided, the client's calls are 
+            profiled, and a report of each of them is written to that directory (see 
+            `synthex.profiling`); other clients are unaffected.
+        _handle_errors(response: Response) -> None:
             Handles HTTP errors in the API response. Raises an HTTPError for non-2xx status codes.
         get(endpoint: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
             Sends a GET request to the specified endpoint with optional query parameters and 
@@ -33,37 +93,118 @@ class APIClient:
         ping() -> bool: 
             Sends a ping request to the server to check connectivity. Returns True if successful,
             False otherwise.
+        close() -> None:
+            Closes the client's transport, releasing its connections.
     """
     
     BASE_URL = API_BASE_URL
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self, api_key: str, cache_dir: Optional[str] = None, coalesce_requests: bool = True,
+        thread_safe: bool = False, transport: Optional[Transport] = None,
+        record_to: Optional[str] = None, limiter: Optional[AdaptiveLimiter] = None,
+        timeout: Optional[float] = None, profile_dir: Optional[str] = None
+    ):
         self.API_KEY = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             "X-API-Key": f"{self.API_KEY}",
             "Accept": "application/json",
-        })
+        }
+        self.transport = transport if transport is not None else RequestsTransport(thread_safe)
+        if record_to:
+            self.transport = RecordingTransport(self.transport, record_to)
+        self.limiter = limiter
+        self.timeout = timeout
+        self.profiler: Optional[Profiler] = (
+            Profiler(profile_dir) if profile_dir else get_profiler()
+        )
+        self.cache = HTTPCache(cache_dir) if cache_dir else None
+        # Scopes cache entries to the API key, without storing the key itself.
+        self._cache_scope = hashlib.sha256(self.API_KEY.encode("utf-8")).hexdigest()
+        self._single_flight: Optional[SingleFlight[Union[str, bytes]]] = (
+            SingleFlight() if coalesce_requests else None
+        )
+        
+        
+    @property
+    def session(self) -> requests.Session:
+        """
+        The session to use in the calling thread, when the default transport is used.
+        """
+        
+        if not isinstance(self.transport, RequestsTransport):
+            raise AttributeError("The client's transport does not use a requests session.")
+        return self.transport.session
+        
+        
+    def _request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        data: Optional[dict[str, Any]] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        """
+        Sends an HTTP request through the client's transport, with the client's headers. If the 
+        client has a limiter, the request waits for an in-flight slot, and holds it until it 
+        completes (or, for streamed responses, until the response is closed). Transport 
+        timeouts are raised as `DeadlineExceededError`.
+        """
+        
+        headers = {**self.headers, **headers} if headers else self.headers
+        timeout = timeout if timeout is not None else self.timeout
+        limiter = self.limiter
+        if limiter is not None:
+            limiter.acquire()
+        started_at = time.monotonic()
+        try:
+            response = self.transport.request(
+                method, url, params=params, json=data, headers=headers, stream=stream,
+                content=content, timeout=timeout
+            )
+        except Exception as e:
+            if limiter is not None:
+                # Only network errors are a sign of congestion, not e.g. an invalid request body.
+                limiter.release(success=False if is_network_error(e) else None)
+            if is_timeout_error(e):
+                raise DeadlineExceededError(
+                    f"Request timed out after {timeout}s", endpoint=url, details=str(e)
+                ) from e
+            raise
+        if limiter is None:
+            return response
+        ttfb = time.monotonic() - started_at
+        endpoint = f"{method} {urlsplit(url).path}"
+        status = response.status_code
+        success = status != 429 and status < 500
+        if stream and status < 400:
+            # Error responses are not consumed, and may never be closed: only successful streams
+            # hold their slot until they are.
+            return on_close(response, lambda: limiter.release(success, ttfb, endpoint))
+        limiter.release(success, ttfb, endpoint)
+        return response
         
         
-    def _handle_errors(self, response: requests.Response) -> None:
+    def _handle_errors(self, response: Response) -> None:
         """
         Handles HTTP response errors by raising appropriate exceptions based on the status code.
+        The body is only read for error responses, so that streamed bodies are left untouched.
         Args:
-            response (requests.Response): The HTTP response object to evaluate.
+            response (Response): The HTTP response object to evaluate.
         Raises:
             AuthenticationError: If the response status code is 401 (Unauthorized).
             NotFoundError: If the response status code is 404 (Not Found).
             RateLimitError: If the response status code is 429 (Rate Limit Exceeded).
             ServerError: If the response status code is in the range 500-599 (Server Error).
         """
+        
+        status = response.status_code
+        if status < 400:
+            return
                 
         try:
             error_details = response.json()
         except ValueError:
             error_details = response.text
-        
-        status = response.status_code
                         
         if status == 401:
             raise AuthenticationError("Unauthorized", status, response.url, error_details)
@@ -75,14 +216,45 @@ class APIClient:
             raise ServerError("Server error", status, response.url, error_details)
                 
         
+    @staticmethod
+    def _parse(
+        body: Union[str, bytes], model: Optional[type[BaseModel]] = None
+    ) -> SuccessResponse[Any]:
+        """
+        Parses a success response body in a single pass: the JSON is decoded and validated
+        straight into the response envelope and, if `model` is provided, its data into that
+        model, without building an intermediate dict.
+        Args:
+            body (Union[str, bytes]): The raw response body.
+            model (Optional[type[BaseModel]]): The model to parse the response's data into. If 
+                None, the data is left as decoded JSON.
+        Returns:
+            SuccessResponse[Any]: The parsed response.
+        """
+        
+        if model is None:
+            return SuccessResponse.model_validate_json(body)
+        return SuccessResponse[model].model_validate_json(body)  # type: ignore[valid-type]
+    
+    
+    @profiled
     def get(
-        self, endpoint: str, params: Optional[dict[str, Any]] = None
+        self, endpoint: str, params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None, model: Optional[type[BaseModel]] = None
     ) -> SuccessResponse[Any]:
         """
-        Sends a GET request to the specified API endpoint.
+        Sends a GET request to the specified API endpoint. If the HTTP cache is enabled, the 
+        request is made conditional on the validators of the cached body, and a 304 response is 
+        served from the cache. Unless coalescing is disabled, concurrent calls with the same 
+        endpoint and parameters share a single HTTP call. Only its raw body is shared: every 
+        caller parses it into a response of its own, which it is free to modify.
         Args:
             endpoint (str): The API endpoint to send the GET request to.
             params (Optional[dict[str, Any]]): Optional query parameters to include in the request.
+            timeout (Optional[float]): The timeout of the request, in seconds. Defaults to the 
+                client's timeout.
+            model (Optional[type[BaseModel]]): The model to parse the response's data into. See 
+                `_parse`.
         Returns:
             SuccessResponse[Any]: A response object containing the parsed JSON data.
         Raises:
@@ -90,19 +262,65 @@ class APIClient:
         """
         
         url = f"{self.BASE_URL}/{endpoint}".rstrip("/")
-        response = self.session.get(url, params=params)
+        if self._single_flight is None:
+            return self._parse(self._get(url, params, timeout), model)
+        key = json.dumps([url, sorted((params or {}).items())], default=str)
+        body = self._single_flight.do(key, lambda: self._get(url, params, timeout))
+        return self._parse(body, model)
+    
+    
+    def _get(
+        self, url: str, params: Optional[dict[str, Any]] = None, timeout: Optional[float] = None
+    ) -> Union[str, bytes]:
+        """
+        Sends a GET request to the specified URL, going through the HTTP cache if it is enabled.
+        Args:
+            url (str): The URL to send the GET request to.
+            params (Optional[dict[str, Any]]): Optional query parameters to include in the request.
+            timeout (Optional[float]): The timeout of the request, in seconds.
+        Returns:
+            Union[str, bytes]: The raw body of the successful response, or of the cached one.
+        Raises:
+            SynthexError: If the response contains an HTTP error status code.
+        """
+        
+        if self.cache is None:
+            response = self._request("GET", url, params=params, timeout=timeout)
+            self._handle_errors(response)
+            return response.content
+        
+        key = self.cache.key(url, params, self._cache_scope)
+        entry = self.cache.get(key)
+        headers = entry.conditional_headers() if entry is not None else None
+        response = self._request("GET", url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            return entry.body
         self._handle_errors(response)
-        return SuccessResponse(**response.json())
+        
+        body = response.content
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.cache.set(key, CacheEntry(
+                url=url, etag=etag, last_modified=last_modified, body=body.decode("utf-8")
+            ))
+        return body
 
 
+    @profiled
     def post(
-        self, endpoint: str, data: Optional[dict[str, Any]] = None
+        self, endpoint: str, data: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None, model: Optional[type[BaseModel]] = None
     ) -> SuccessResponse[Any]:
         """
         Sends a POST request to the specified endpoint with the provided data.
         Args:
             endpoint (str): The API endpoint to send the POST request to.
             data (Optional[dict[str, Any]]): The JSON-serializable data to include in the request body. Defaults to None.
+            timeout (Optional[float]): The timeout of the request, in seconds. Defaults to the 
+                client's timeout.
+            model (Optional[type[BaseModel]]): The model to parse the response's data into. See 
+                `_parse`.
         Returns:
             SuccessResponse[Any]: The JSON response from the server.
         Raises:
@@ -110,19 +328,25 @@ class APIClient:
         """
         
         url = f"{self.BASE_URL}/{endpoint}".rstrip("/")
-        response = self.session.post(url, json=data)
+        response = self._request("POST", url, data=data, timeout=timeout)
         self._handle_errors(response)
-        return SuccessResponse(**response.json())
+        return self._parse(response.content, model)
 
 
+    @profiled
     def put(
-        self, endpoint: str, data: Optional[dict[str, Any]] = None
+        self, endpoint: str, data: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None, model: Optional[type[BaseModel]] = None
     ) -> SuccessResponse[Any]:
         """
         Sends a PUT request to the specified endpoint with the provided data.
         Args:
             endpoint (str): The API endpoint to send the PUT request to.
             data (Optional[dict[str, Any]]): The JSON-serializable dictionary to include in the request body. Defaults to None.
+            timeout (Optional[float]): The timeout of the request, in seconds. Defaults to the 
+                client's timeout.
+            model (Optional[type[BaseModel]]): The model to parse the response's data into. See 
+                `_parse`.
         Returns:
             SuccessResponse[Any]: The JSON response from the server.
         Raises:
@@ -130,16 +354,24 @@ class APIClient:
         """
         
         url = f"{self.BASE_URL}/{endpoint}".rstrip("/")
-        response = self.session.put(url, json=data)
+        response = self._request("PUT", url, data=data, timeout=timeout)
         self._handle_errors(response)
-        return SuccessResponse(**response.json())
+        return self._parse(response.content, model)
 
 
-    def delete(self, endpoint: str) -> SuccessResponse[Any]:
+    @profiled
+    def delete(
+        self, endpoint: str, timeout: Optional[float] = None,
+        model: Optional[type[BaseModel]] = None
+    ) -> SuccessResponse[Any]:
         """
         Sends a DELETE request to the specified endpoint and handles the response.
         Args:
             endpoint (str): The API endpoint to send the DELETE request to.
+            timeout (Optional[float]): The timeout of the request, in seconds. Defaults to the 
+                client's timeout.
+            model (Optional[type[BaseModel]]): The model to parse the response's data into. See 
+                `_parse`.
         Returns:
             SuccessResponse[Any]: The JSON response from the server.
         Raises:
@@ -147,28 +379,45 @@ class APIClient:
         """
         
         url = f"{self.BASE_URL}/{endpoint}".rstrip("/")
-        response = self.session.delete(url)
+        response = self._request("DELETE", url, timeout=timeout)
         self._handle_errors(response)
-        return SuccessResponse(**response.json())
+        return self._parse(response.content, model)
     
     
+    @profiled
     def post_stream(
-        self, endpoint: str, data: Optional[dict[str, Any]] = None
-    ) -> requests.Response:
+        self, endpoint: str, data: Optional[dict[str, Any]] = None,
+        content: Optional[Iterable[bytes]] = None, timeout: Optional[float] = None
+    ) -> Response:
         """
         Sends a POST request to the specified API endpoint and streams the response.
         Args:
             endpoint (str): The API endpoint to send the POST request to.
             data (Optional[dict[str, Any]]): The JSON-serializable data to include in the request body. Defaults to None.
+            content (Optional[Iterable[bytes]]): An already JSON-encoded request body, as an 
+                iterable of chunks, to send instead of `data`. It is streamed with chunked 
+                transfer encoding, so it never needs to be held in memory as a whole.
+            timeout (Optional[float]): The timeout, in seconds, of the request and of every 
+                read of the streamed response. Defaults to the client's timeout.
         Returns:
-            requests.Response: The raw HTTP response object for streaming.
+            Response: The raw HTTP response object for streaming.
         Raises:
             SynthexError: If the response contains an HTTP error status code.
         """
         
         url = f"{self.BASE_URL}/{endpoint}".rstrip("/")
-        response = self.session.post(url, json=data, stream=True)
-        self._handle_errors(response)
+        if content is not None:
+            response = self._request(
+                "POST", url, headers={"Content-Type": "application/json"}, stream=True,
+                content=content, timeout=timeout
+            )
+        else:
+            response = self._request("POST", url, data=data, stream=True, timeout=timeout)
+        try:
+            self._handle_errors(response)
+        except SynthexError:
+            response.close()
+            raise
         return response
     
     
@@ -183,4 +432,12 @@ class APIClient:
             self.get(PING_ENDPOINT)
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
+        
+        
+    def close(self) -> None:
+        """
+        Closes the client's transport, releasing its connections.
+        """
+        
+        self.transport.close()
@@ -0,0 +1,325 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, BinaryIO, List, Optional, Union
+from pydantic import BaseModel
+import pydantic
+
+from .config import CLI_DEFAULT_SHARD_SIZE
+from .exceptions import (
+    AuthenticationError, ConfigurationError, DeadlineExceededError, InsufficientCreditsError,
+    NotFoundError, RateLimitError, ServerError, SynthexError, ValidationError
+)
+from .models import JobOutputDomainType, JobOutputFormats
+from .progress import GenerationProgress, ProgressTracker, TerminalProgressBar
+
+
+# Exit codes of the `synthex` command. Errors are mapped to the code of the closest class in
+# their hierarchy. 2 is left to argparse, which uses it for usage errors.
+EXIT_OK = 0
+EXIT_CODES: dict[type[BaseException], int] = {
+    SynthexError: 1,
+    ConfigurationError: 3,
+    ValidationError: 4,
+    AuthenticationError: 5,
+    InsufficientCreditsError: 6,
+    RateLimitError: 7,
+    NotFoundError: 8,
+    ServerError: 9,
+    DeadlineExceededError: 10,
+    KeyboardInterrupt: 130,
+}
+
+
+def exit_code(error: BaseException) -> int:
+    """
+    Map an exception to the exit code of the `synthex` command.
+    Args:
+        error (BaseException): The exception that interrupted the command.
+    Returns:
+        int: The exit code of the closest class of the exception's hierarchy, or 1 if none of
+            them has one.
+    """
+
+    for cls in type(error).__mro__:
+        if cls in EXIT_CODES:
+            return EXIT_CODES[cls]
+    return 1
+
+
+class GenerationSpec(BaseModel):
+    """
+    The description of a data generation job, as read from a spec file.
+    Attributes:
+        schema_definition (JobOutputDomainType): The schema of the generated data.
+        examples (Union[List[dict[Any, Any]], str]): The examples, or the path of a CSV or JSON
+            Lines file holding them, relative to the spec file.
+        requirements (List[str]): The requirements of the job.
+        number_of_samples (Optional[int]): The total number of samples to generate.
+        output_type (JobOutputFormats): The format of the generated data.
+    """
+
+    schema_definition: JobOutputDomainType
+    examples: Union[List[dict[Any, Any]], str]
+    requirements: List[str] = []
+    number_of_samples: Optional[int] = None
+    output_type: JobOutputFormats = "csv"
+
+
+def load_spec(path: str) -> GenerationSpec:
+    """
+    Load a spec file, in YAML (".yaml" or ".yml", which requires the `cli` extra) or JSON format.
+    Args:
+        path (str): The path of the spec file.
+    Returns:
+        GenerationSpec: The validated spec, with its examples path made relative to the current
+            directory.
+    Raises:
+        ConfigurationError: If the file cannot be read, or YAML support is not installed.
+        ValidationError: If the spec cannot be parsed, or is malformed.
+    """
+
+    try:
+        with open(path, mode="r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError as e:
+        raise ConfigurationError(f"Cannot read spec file '{path}': {e}") from e
+
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ConfigurationError(
+                "YAML spec files require the 'cli' extra. Install it with "
+                "`pip install synthex[cli]`, or use a JSON spec file."
+            ) from e
+        try:
+            raw = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValidationError(f"Invalid YAML in spec file '{path}': {e}") from e
+    else:
+        try:
+            raw = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON in spec file '{path}': {e}") from e
+
+    try:
+        spec = GenerationSpec.model_validate(raw)
+    except pydantic.ValidationError as e:
+        raise ValidationError(f"Invalid spec file '{path}': {e}") from e
+    if isinstance(spec.examples, str):
+        spec.examples = os.path.join(os.path.dirname(path), spec.examples)
+    return spec
+
+
+def shard_sizes(total: int, shard_size: int) -> List[int]:
+    """
+    Split a number of samples into the sizes of the jobs that generate them.
+    Args:
+        total (int): The total number of samples.
+        shard_size (int): The maximum number of samples of each job.
+    Returns:
+        List[int]: The number of samples of each job.
+    """
+
+    full, rest = divmod(total, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+
+class _Throughput:
+    """
+    Aggregates the progress of concurrent jobs into a single `ProgressTracker`.
+    """
+
+    def __init__(self, rows_expected: int, show_progress: bool):
+        self.bar = TerminalProgressBar() if show_progress else None
+        self.tracker = ProgressTracker(rows_expected, self.bar)
+        self._lock = threading.Lock()
+        self._rows: dict[int, int] = {}
+        self._bytes: dict[int, int] = {}
+
+    def callback(self, shard: int) -> Any:
+        def on_progress(progress: GenerationProgress) -> None:
+            with self._lock:
+                rows = progress.rows_received - self._rows.get(shard, 0)
+                num_bytes = progress.bytes_received - self._bytes.get(shard, 0)
+                self._rows[shard] = progress.rows_received
+                self._bytes[shard] = progress.bytes_received
+                self.tracker.update(rows, num_bytes)
+        return on_progress
+
+    def close(self) -> None:
+        if self.bar is not None:
+            self.bar.close()
+
+
+def _copy_shard(path: str, output: BinaryIO, skip_header: bool) -> None:
+    with open(path, mode="rb") as f:
+        if skip_header:
+            f.readline()
+        shutil.copyfileobj(f, output)
+    output.flush()
+
+
+def generate(args: argparse.Namespace) -> int:
+    """
+    Run the `generate` command: split the requested samples into jobs of at most `--shard-size`
+    samples, run them on `--concurrency` threads, and write their output to one file per job in
+    the output directory, or to stdout as each job completes.
+    """
+
+    # Imported here, so that `--help` does not pay for the client's imports.
+    from . import Synthex
+
+    spec = load_spec(args.spec)
+    output_type: JobOutputFormats = args.format or spec.output_type
+    total = args.samples if args.samples is not None else spec.number_of_samples
+    if not total or total <= 0:
+        raise ValidationError("The number of samples must be given, with --samples or in the spec.")
+    if not 0 < args.shard_size <= CLI_DEFAULT_SHARD_SIZE:
+        raise ValidationError(f"--shard-size must be between 1 and {CLI_DEFAULT_SHARD_SIZE}.")
+    if isinstance(spec.examples, str) and args.concurrency > 1:
+        # Every job reads the examples file: read it once, up front.
+        from .request_body import iter_examples
+        spec.examples = list(iter_examples(spec.examples, spec.schema_definition))
+
+    synthex = Synthex(api_key=args.api_key, thread_safe=args.concurrency > 1)
+    sizes = shard_sizes(total, args.shard_size)
+    to_stdout = args.output == "-"
+    show_progress = not args.quiet and sys.stderr.isatty()
+    throughput = _Throughput(total, show_progress)
+    started_at = time.monotonic()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = scratch if to_stdout else args.output
+        os.makedirs(directory, exist_ok=True)
+        paths = [
+            os.path.join(directory, f"part-{shard:05d}.{output_type}") for shard in range(len(sizes))
+        ]
+        stdout_lock = threading.Lock()
+        header_written = False
+
+        def run(shard: int) -> None:
+            nonlocal header_written
+            synthex.jobs.generate_data(
+                schema_definition=spec.schema_definition,
+                examples=spec.examples,
+                requirements=spec.requirements,
+                output_path=paths[shard],
+                number_of_samples=sizes[shard],
+                output_type=output_type,
+                on_progress=throughput.callback(shard),
+                deadline=args.deadline,
+                idle_timeout=args.idle_timeout,
+                partial_output="delete" if to_stdout else "keep",
+            )
+            if to_stdout:
+                with stdout_lock:
+                    _copy_shard(
+                        paths[shard], sys.stdout.buffer, output_type == "csv" and header_written
+                    )
+                    header_written = True
+                os.remove(paths[shard])
+
+        executor = ThreadPoolExecutor(max_workers=args.concurrency)
+        try:
+            futures = [executor.submit(run, shard) for shard in range(len(sizes))]
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            for future in futures:
+                if future.done() and not future.cancelled() and future.exception() is not None:
+                    raise future.exception()  # type: ignore[misc]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            throughput.close()
+            synthex._client.close()
+
+    if not args.quiet:
+        elapsed = time.monotonic() - started_at
+        rows = throughput.tracker.rows_received
+        sys.stderr.write(
+            f"Generated {rows} rows in {len(sizes)} jobs in {elapsed:.1f}s "
+            f"({rows / elapsed if elapsed > 0 else 0.0:.1f} rows/s, "
+            f"{throughput.tracker.bytes_received / 1024:.1f} KiB)\n"
+        )
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser of the `synthex` command's arguments.
+    """
+
+    parser = argparse.ArgumentParser(prog="synthex", description="Generate synthetic datasets.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="Run a data generation spec, split into parallel jobs.",
+        epilog="Exit codes: " + ", ".join(
+            f"{code} {cls.__name__}" for cls, code in EXIT_CODES.items()
+        ) + ", 2 usage error."
+    )
+    generate_parser.add_argument(
+        "--spec", required=True,
+        help="A YAML or JSON file with the schema_definition, examples and requirements of the "
+        "job, and optionally its number_of_samples and output_type."
+    )
+    generate_parser.add_argument(
+        "--samples", type=int, help="The total number of samples. Overrides the spec."
+    )
+    generate_parser.add_argument(
+        "--format", choices=["csv", "jsonl"], help="The output format. Overrides the spec."
+    )
+    generate_parser.add_argument(
+        "-o", "--output", default="-",
+        help="The directory to write one file per job to, or '-' (the default) for stdout."
+    )
+    generate_parser.add_argument(
+        "--concurrency", type=int, default=1, help="The number of jobs to run in parallel."
+    )
+    generate_parser.add_argument(
+        "--shard-size", type=int, default=CLI_DEFAULT_SHARD_SIZE,
+        help=f"The maximum number of samples per job. Defaults to {CLI_DEFAULT_SHARD_SIZE}."
+    )
+    generate_parser.add_argument(
+        "--deadline", type=float, help="The maximum duration of each job, in seconds."
+    )
+    generate_parser.add_argument(
+        "--idle-timeout", type=float,
+        help="The maximum number of seconds to wait for each chunk of data from the server."
+    )
+    generate_parser.add_argument(
+        "--api-key", help="The API key. Defaults to the API_KEY environment variable."
+    )
+    generate_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not report progress and throughput."
+    )
+    generate_parser.set_defaults(handler=generate)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    The entry point of the `synthex` command.
+    Args:
+        argv (Optional[List[str]]): The command-line arguments. Defaults to `sys.argv[1:]`.
+    Returns:
+        int: The exit code. See `EXIT_CODES`.
+    """
+
+    args = build_parser().parse_args(argv)
+    if getattr(args, "concurrency", 1) < 1:
+        sys.stderr.write("synthex: error: --concurrency must be at least 1\n")
+        return 2
+    try:
+        return int(args.handler(args))
+    except (SynthexError, KeyboardInterrupt) as e:
+        sys.stderr.write(f"synthex: error: {type(e).__name__}: {e}\n")
+        return exit_code(e)
@@ -0,0 +1,278 @@
+import itertools
+import os
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Literal, Optional, TypeVar, Union
+from pydantic import BaseModel
+
+from .api_client import APIClient, response_data
+from .config import (
+    POOL_AUTH_FAILURE_COOLDOWN_SECONDS, POOL_CREDITS_REFRESH_SECONDS,
+    POOL_DISPATCH_CREDITS_ESTIMATE, POOL_RATE_LIMIT_COOLDOWN_SECONDS
+)
+from .endpoints import GET_PROMOTIONAL_CREDITS_ENDPOINT
+from .exceptions import AuthenticationError, ConfigurationError, RateLimitError, SynthexError
+from .models import CreditModel, SuccessResponse
+from .profiling import Profiler, get_profiler
+from .transports import Response, on_close
+
+
+T = TypeVar("T")
+
+PoolStrategy = Literal["round_robin", "least_in_flight", "most_credits"]
+
+
+class PoolMember:
+    """
+    An `APIClient` belonging to a `ClientPool`, together with the bookkeeping used to route
+    requests to it.
+    Attributes:
+        client (APIClient): The client bound to one API key.
+        in_flight (int): The number of requests (and open streams) currently using the client.
+        unavailable_until (float): Monotonic time until which the client is out of rotation.
+        credits (Optional[int]): The last known amount of credits of the API key.
+        credits_checked_at (float): Monotonic time of the last credits check.
+        estimated_spend (float): The credits the requests routed to the client since the last
+            credits check are assumed to have spent.
+    """
+
+    def __init__(self, client: APIClient):
+        self.client = client
+        self.in_flight = 0
+        self.unavailable_until = 0.0
+        self.credits: Optional[int] = None
+        self.credits_checked_at = float("-inf")
+        self.estimated_spend = 0.0
+
+
+class ClientPool:
+    """
+    A drop-in replacement for `APIClient` that spreads requests across several API keys, in order
+    to work around per-key rate limits.
+    Every request is routed to one of the pool's clients according to the configured strategy:
+    - "round_robin": clients are used in turn.
+    - "least_in_flight": the client with the fewest in-flight requests and open streams is used.
+    - "most_credits": the client whose API key has the most remaining promotional credits is used.
+        Balances are refreshed periodically rather than on every request; in between, every
+        request is charged `POOL_DISPATCH_CREDITS_ESTIMATE` credits, and ties go to the client
+        with the fewest requests in flight.
+    A client whose request fails with `RateLimitError` or `AuthenticationError` is taken out of
+    rotation for a while. If every client is out of rotation, requests fail with `RateLimitError`.
+    Pickling a pool, or using it in a forked child process, resets the routing bookkeeping.
+    Args:
+        api_keys (List[str]): The API keys to spread requests across.
+        strategy (PoolStrategy): The routing strategy. Defaults to "round_robin".
+        client_factory (Callable[[str], APIClient]): The function used to create the client of
+            each API key. Defaults to `APIClient`.
+        profile_dir (Optional[str]): The directory the profiling reports of the pool's calls are
+            written to, if they should be profiled. The pool's clients share its profiler, so
+            that a call is profiled once, whichever client serves it.
+    """
+
+    BASE_URL = APIClient.BASE_URL
+
+    def __init__(
+        self, api_keys: List[str], strategy: PoolStrategy = "round_robin",
+        client_factory: Callable[[str], APIClient] = APIClient, profile_dir: Optional[str] = None
+    ):
+        if not api_keys:
+            raise ConfigurationError("At least one API key is required to create a client pool.")
+        self.strategy = strategy
+        self.members = [PoolMember(client_factory(api_key)) for api_key in api_keys]
+        self.profiler = Profiler(profile_dir) if profile_dir else get_profiler()
+        for member in self.members:
+            member.client.profiler = self.profiler
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Recreate the routing state, keeping the pool's clients.
+        """
+
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._round_robin = itertools.cycle(range(len(self.members)))
+        for member in self.members:
+            member.in_flight = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "strategy": self.strategy, "clients": [member.client for member in self.members],
+            "profiler": self.profiler,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.strategy = state["strategy"]
+        self.members = [PoolMember(client) for client in state["clients"]]
+        self.profiler = state["profiler"]
+        self._reset()
+
+    def _refresh_credits(self, member: PoolMember) -> None:
+        """
+        Refresh the known credits balance of a member, if it is stale.
+        """
+
+        now = time.monotonic()
+        if now - member.credits_checked_at < POOL_CREDITS_REFRESH_SECONDS:
+            return
+        member.credits_checked_at = now
+        try:
+            response = member.client.get(GET_PROMOTIONAL_CREDITS_ENDPOINT, model=CreditModel)
+            member.credits = response_data(response, CreditModel).amount
+            member.estimated_spend = 0.0
+        except SynthexError as e:
+            self._on_error(member, e)
+
+    def _acquire(self) -> PoolMember:
+        """
+        Select the member that should serve the next request, and mark it as in flight.
+        Returns:
+            PoolMember: The selected member.
+        Raises:
+            RateLimitError: If every member is out of rotation.
+        """
+
+        if os.getpid() != self._pid:
+            # Forked: the lock may have been held by a thread that does not exist in the child.
+            self._reset()
+
+        if self.strategy == "most_credits":
+            for member in self.members:
+                self._refresh_credits(member)
+
+        with self._lock:
+            now = time.monotonic()
+            available = [m for m in self.members if m.unavailable_until <= now]
+            if not available:
+                raise RateLimitError("All API keys of the pool are temporarily out of rotation")
+
+            if self.strategy == "least_in_flight":
+                member = min(available, key=lambda m: m.in_flight)
+            elif self.strategy == "most_credits":
+                # Balances are only refreshed periodically: charge every request an estimated
+                # spend in the meantime, so that keys with similar balances take turns.
+                member = max(available, key=lambda m: (
+                    m.credits - m.estimated_spend if m.credits is not None else float("-inf"),
+                    -m.in_flight
+                ))
+                member.estimated_spend += POOL_DISPATCH_CREDITS_ESTIMATE
+            else:
+                member = next(
+                    self.members[i] for i in self._round_robin
+                    if self.members[i].unavailable_until <= now
+                )
+            member.in_flight += 1
+            return member
+
+    def _release(self, member: PoolMember) -> None:
+        with self._lock:
+            member.in_flight -= 1
+
+    def _on_error(self, member: PoolMember, error: SynthexError) -> None:
+        """
+        Take a member out of rotation if the error indicates that its API key cannot currently
+        be used.
+        """
+
+        cooldown = 0.0
+        if isinstance(error, RateLimitError):
+            cooldown = POOL_RATE_LIMIT_COOLDOWN_SECONDS
+        elif isinstance(error, AuthenticationError):
+            cooldown = POOL_AUTH_FAILURE_COOLDOWN_SECONDS
+        if cooldown:
+            with self._lock:
+                member.unavailable_until = max(
+                    member.unavailable_until, time.monotonic() + cooldown
+                )
+
+    def _call(self, method: Callable[[APIClient], T]) -> T:
+        member = self._acquire()
+        try:
+            return method(member.client)
+        except SynthexError as e:
+            self._on_error(member, e)
+            raise
+        finally:
+            self._release(member)
+
+    def get(
+        self, endpoint: str, params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None, model: Optional[type[BaseModel]] = None
+    ) -> SuccessResponse[Any]:
+        """
+        Sends a GET request through one of the pool's clients. See `APIClient.get`.
+        """
+
+        return self._call(lambda client: client.get(endpoint, params, timeout, model))
+
+    def post(
+        self, endpoint: str, data: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None, model: Optional[type[BaseModel]] = None
+    ) -> SuccessResponse[Any]:
+        """
+        Sends a POST request through one of the pool's clients. See `APIClient.post`.
+        """
+
+        return self._call(lambda client: client.post(endpoint, data, timeout, model))
+
+    def put(
+        self, endpoint: str, data: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None, model: Optional[type[BaseModel]] = None
+    ) -> SuccessResponse[Any]:
+        """
+        Sends a PUT request through one of the pool's clients. See `APIClient.put`.
+        """
+
+        return self._call(lambda client: client.put(endpoint, data, timeout, model))
+
+    def delete(
+        self, endpoint: str, timeout: Optional[float] = None,
+        model: Optional[type[BaseModel]] = None
+    ) -> SuccessResponse[Any]:
+        """
+        Sends a DELETE request through one of the pool's clients. See `APIClient.delete`.
+        """
+
+        return self._call(lambda client: client.delete(endpoint, timeout, model))
+
+    def post_stream(
+        self, endpoint: str, data: Optional[dict[str, Any]] = None,
+        content: Optional[Iterable[bytes]] = None, timeout: Optional[float] = None
+    ) -> Response:
+        """
+        Sends a streaming POST request through one of the pool's clients. The client remains in
+        flight until the returned response is closed. See `APIClient.post_stream`.
+        """
+
+        member = self._acquire()
+        try:
+            response = member.client.post_stream(endpoint, data, content, timeout)
+        except SynthexError as e:
+            self._on_error(member, e)
+            self._release(member)
+            raise
+        except BaseException:
+            self._release(member)
+            raise
+
+        return on_close(response, lambda: self._release(member))
+
+    def ping(self) -> bool:
+        """
+        Pings the API with each of the pool's clients.
+        Returns:
+            bool: True if the API is reachable by at least one client, False otherwise.
+        """
+
+        return any(member.client.ping() for member in self.members)
+
+    def close(self) -> None:
+        """
+        Closes the sessions of all the pool's clients.
+        """
+
+        for member in self.members:
+            member.client.close()
+
+
+Client = Union[APIClient, ClientPool]
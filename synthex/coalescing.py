@@ -0,0 +1,80 @@
+import os
+import threading
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An in-flight call, shared by the thread that runs it and the threads waiting on it."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent identical calls: while a call for a given key is in flight, any other
+    call for the same key waits for it and receives its result (or its exception) instead of
+    running again. Calls made after the in-flight one completes run normally.
+    Every caller receives the very same result object, so only immutable results, such as a raw
+    response body, should be shared this way.
+    Calls in flight in a parent process are forgotten in forked children, where they would never
+    complete.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._reset()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run `fn`, unless a call with the same key is already in flight, in which case wait for
+        it and return its result.
+        Args:
+            key (Hashable): The key identifying identical calls.
+            fn (Callable[[], T]): The function to run.
+        Returns:
+            T: The result of the call.
+        Raises:
+            BaseException: Whatever exception the call raised.
+        """
+
+        if os.getpid() != self._pid:
+            self._reset()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,154 @@
+import gzip
+import io
+import os
+from typing import Any, IO, Optional, Tuple
+
+from .config import OUTPUT_GZIP_DEFAULT_LEVEL, OUTPUT_WRITE_BUFFER_SIZE, OUTPUT_ZSTD_DEFAULT_LEVEL
+from .exceptions import ConfigurationError, ValidationError
+
+
+# The extensions of compressed output files, mapped to their default compression level.
+COMPRESSION_EXTENSIONS: dict[str, int] = {
+    ".gz": OUTPUT_GZIP_DEFAULT_LEVEL,
+    ".zst": OUTPUT_ZSTD_DEFAULT_LEVEL,
+}
+
+# The valid compression levels of each compressed output format.
+COMPRESSION_LEVELS: dict[str, range] = {
+    ".gz": range(1, 10),
+    ".zst": range(1, 23),
+}
+
+
+def split_compression(path: str) -> Tuple[str, str]:
+    """
+    Split the compression extension off a path, e.g. "out.csv.gz" into "out.csv" and ".gz".
+    Args:
+        path (str): The path to split.
+    Returns:
+        Tuple[str, str]: The path without its compression extension, and the extension, which is
+            empty if the path does not denote a compressed file.
+    """
+
+    base, ext = os.path.splitext(path)
+    if ext in COMPRESSION_EXTENSIONS:
+        return base, ext
+    return path, ""
+
+
+def _import_zstandard() -> Any:
+    """
+    Import `zstandard`, which is only installed with the `zstd` extra.
+    Returns:
+        Any: The `zstandard` module.
+    Raises:
+        ConfigurationError: If `zstandard` is not installed.
+    """
+
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ConfigurationError(
+            "zstd-compressed output requires the 'zstd' extra. Install it with "
+            "`pip install synthex[zstd]`, or use a '.gz' output path."
+        ) from e
+    return zstandard
+
+
+def check_compression_level(path: str, level: Optional[int]) -> None:
+    """
+    Check that a compression level is valid for the format of an output file, and that this
+    format is available, so that an output file that cannot be written is reported before any
+    request is sent.
+    Args:
+        path (str): The path of the output file.
+        level (Optional[int]): The compression level, or None for the default one.
+    Raises:
+        ValidationError: If a level is given for an uncompressed file, or is out of range.
+        ConfigurationError: If the file is zstd-compressed, and `zstandard` is not installed.
+    """
+
+    ext = split_compression(path)[1]
+    if level is not None:
+        if not ext:
+            raise ValidationError("A compression level requires a '.gz' or '.zst' output path.")
+        levels = COMPRESSION_LEVELS[ext]
+        if level not in levels:
+            raise ValidationError(
+                f"The compression level of '{ext}' files must be between {levels.start} and "
+                f"{levels.stop - 1}."
+            )
+    if ext == ".zst":
+        _import_zstandard()
+
+
+class _CountingSink(io.RawIOBase):
+    """
+    Forwards writes to a compressor, keeping track of the number of uncompressed bytes written,
+    so that the position of the streams stacked on top of it is the uncompressed size.
+    """
+
+    def __init__(self, target: Any):
+        self._target = target
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._target.write(data)
+        size = memoryview(data).nbytes
+        self._position += size
+        return size
+
+    def seekable(self) -> bool:
+        # Only so that `tell()` is available to the text streams stacked on top of the sink.
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if (offset, whence) not in ((0, io.SEEK_CUR), (self._position, io.SEEK_SET)):
+            raise io.UnsupportedOperation(
+                "Compressed output files can only be written sequentially."
+            )
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._target.close()
+            finally:
+                super().close()
+
+
+def open_output(path: str, level: Optional[int] = None) -> IO[bytes]:
+    """
+    Open an output file for writing, compressing its content on the fly if its extension is
+    ".gz" (gzip) or ".zst" (zstd, which requires the `zstd` extra). Writes are buffered before
+    they reach the compressor, and the position of the returned file (`tell()`) is the number
+    of uncompressed bytes written.
+    Args:
+        path (str): The path of the file.
+        level (Optional[int]): The compression level. Defaults to the balanced default level of
+            the format (see `COMPRESSION_EXTENSIONS`).
+            Ignored for uncompressed files.
+    Returns:
+        IO[bytes]: The file, open for writing in binary mode.
+    Raises:
+        ConfigurationError: If the file is zstd-compressed, and `zstandard` is not installed.
+    """
+
+    ext = split_compression(path)[1]
+    if not ext:
+        return open(path, mode="wb", buffering=OUTPUT_WRITE_BUFFER_SIZE)
+    if level is None:
+        level = COMPRESSION_EXTENSIONS[ext]
+
+    if ext == ".gz":
+        compressor: Any = gzip.open(path, mode="wb", compresslevel=level)
+    else:
+        zstandard = _import_zstandard()
+        compressor = zstandard.ZstdCompressor(level=level).stream_writer(open(path, mode="wb"))
+    return io.BufferedWriter(_CountingSink(compressor), OUTPUT_WRITE_BUFFER_SIZE)
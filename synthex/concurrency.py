@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from .config import (
+    LIMITER_BASELINE_WINDOW, LIMITER_DECREASE_COOLDOWN_SECONDS, LIMITER_DECREASE_FACTOR,
+    LIMITER_INITIAL_LIMIT, LIMITER_MAX_LIMIT, LIMITER_TTFB_TOLERANCE
+)
+from .forking import reset_after_fork
+
+
+class AdaptiveLimiter:
+    """
+    An AIMD (additive increase, multiplicative decrease) concurrency limiter. It caps the number
+    of requests in flight, and adapts the cap to what the server can sustain:
+    - every successful request with a healthy time-to-first-byte raises the limit by 1 / limit,
+        i.e. by roughly 1 for every `limit` requests;
+    - a 429 or 5xx response, a network error, or a time-to-first-byte greater than
+        `ttfb_tolerance` times the baseline of its endpoint, multiplies the limit by
+        `decrease_factor`. Decreases are spaced by at least `decrease_cooldown` seconds, so that a
+        burst of failures caused by a single congestion event only counts once.
+    The baseline of an endpoint is the lowest time-to-first-byte among its last `baseline_window`
+    requests: fast endpoints do not set the bar for slow ones, and a single lucky sample ages out.
+    Pass an instance to `Synthex` (or `APIClient`) through the `limiter` parameter, then run
+    requests from as many threads as you like: calls beyond the current limit wait for a slot.
+    A forked child process keeps the learned limit and baselines, but not the requests in flight.
+    Args:
+        initial_limit (float): The initial in-flight limit.
+        min_limit (float): The lowest the limit can go.
+        max_limit (float): The highest the limit can go.
+        decrease_factor (float): The factor the limit is multiplied by on congestion.
+        ttfb_tolerance (float): How many times slower than the best observed time-to-first-byte a
+            response can be before it counts as a congestion signal.
+        decrease_cooldown (float): The minimum number of seconds between two decreases.
+        baseline_window (int): The number of recent samples, per endpoint, over which the
+            time-to-first-byte baseline is taken.
+    """
+
+    def __init__(
+        self, initial_limit: float = LIMITER_INITIAL_LIMIT, min_limit: float = 1,
+        max_limit: float = LIMITER_MAX_LIMIT, decrease_factor: float = LIMITER_DECREASE_FACTOR,
+        ttfb_tolerance: float = LIMITER_TTFB_TOLERANCE,
+        decrease_cooldown: float = LIMITER_DECREASE_COOLDOWN_SECONDS,
+        baseline_window: int = LIMITER_BASELINE_WINDOW
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.ttfb_tolerance = ttfb_tolerance
+        self.decrease_cooldown = decrease_cooldown
+        self.baseline_window = baseline_window
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._samples: dict[Optional[str], deque[float]] = {}
+        self._baseline_ttfb: Optional[float] = None
+        self._last_ttfb: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._decreases = 0
+        self._reset()
+        reset_after_fork(self)
+
+    def _reset(self) -> None:
+        """
+        Forget the requests in flight, and recreate the synchronization primitives.
+        """
+
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        The current in-flight limit.
+        """
+
+        return max(int(self._limit), 1)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of requests currently in flight.
+        """
+
+        return self._in_flight
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        A snapshot of the limiter's state, for monitoring.
+        Returns:
+            dict[str, Any]: The current limit, the requests in flight, the baseline and the last
+                observed time-to-first-byte (of the endpoint of the last request), and the
+                number of decreases so far.
+        """
+
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "baseline_ttfb": self._baseline_ttfb,
+                "last_ttfb": self._last_ttfb,
+                "decreases": self._decreases,
+            }
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for an in-flight slot.
+        Args:
+            timeout (Optional[float]): The maximum number of seconds to wait. Waits indefinitely
+                if None.
+        Returns:
+            bool: True if a slot was acquired, False if the timeout expired.
+        """
+
+        with self._condition:
+            acquired = self._condition.wait_for(lambda: self._in_flight < self.limit, timeout)
+            if acquired:
+                self._in_flight += 1
+            return acquired
+
+    def release(
+        self, success: Optional[bool], ttfb: Optional[float] = None,
+        endpoint: Optional[str] = None
+    ) -> None:
+        """
+        Release an in-flight slot, and adapt the limit to the outcome of the request.
+        Args:
+            success (Optional[bool]): False if the request failed with a 429 or 5xx response, or a
+                network error. None if it failed for a reason that says nothing about congestion,
+                e.g. an invalid request body: the slot is released and the limit is kept.
+            ttfb (Optional[float]): The time-to-first-byte of the request, in seconds.
+            endpoint (Optional[str]): The endpoint of the request, e.g. "GET /credits", whose
+                baseline `ttfb` is compared with.
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+            if success is None:
+                self._condition.notify_all()
+                return
+            congested = not success
+            if ttfb is not None:
+                samples = self._samples.get(endpoint)
+                if samples is None:
+                    samples = self._samples[endpoint] = deque(maxlen=self.baseline_window)
+                baseline = min(samples) if samples else None
+                if baseline is not None and ttfb > baseline * self.ttfb_tolerance:
+                    congested = True
+                samples.append(ttfb)
+                self._last_ttfb = ttfb
+                self._baseline_ttfb = min(samples)
+
+            if congested:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self._last_decrease = now
+                    self._decreases += 1
+                    self._limit = max(self._limit * self.decrease_factor, self.min_limit)
+            else:
+                self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+            self._condition.notify_all()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_condition"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset()
+        reset_after_fork(self)
@@ -1,4 +1,88 @@
 from typing import Callable
 
 
-OUTPUT_FILE_DEFAULT_NAME: Callable[[str], str] = lambda desired_format: f"synthex_output.{desired_format}"
\ No newline at end of file
+OUTPUT_FILE_DEFAULT_NAME: Callable[[str], str] = lambda desired_format: f"synthex_output.{desired_format}"
+
+# Length, in seconds, of the window used to compute the rolling rows/sec rate of a data generation stream.
+PROGRESS_RATE_WINDOW_SECONDS: float = 10.0
+
+# Maximum number of SSE events buffered between the network reader and the file writer in pipelined mode.
+PIPELINE_QUEUE_SIZE: int = 64
+
+# Size, in bytes, of the write buffer of the files produced by `generate_data`.
+OUTPUT_WRITE_BUFFER_SIZE: int = 1024 * 1024
+
+# Name of the partition of the rows whose partition column is missing or null, in partitioned output.
+OUTPUT_NULL_PARTITION_NAME: str = "__null__"
+
+# Seconds during which an API key of a `ClientPool` is taken out of rotation after a rate limit error.
+POOL_RATE_LIMIT_COOLDOWN_SECONDS: float = 30.0
+
+# Seconds during which an API key of a `ClientPool` is taken out of rotation after an authentication error.
+POOL_AUTH_FAILURE_COOLDOWN_SECONDS: float = 300.0
+
+# Seconds after which the credits balance of the API keys of a `ClientPool` is refreshed.
+POOL_CREDITS_REFRESH_SECONDS: float = 60.0
+
+# Credits a `ClientPool` with the "most_credits" strategy assumes each request spends, until the balances are next refreshed.
+POOL_DISPATCH_CREDITS_ESTIMATE: float = 1.0
+
+# Seconds after which a `CreditScheduler` retrieves the credits balance again.
+SCHEDULER_BALANCE_REFRESH_SECONDS: float = 30.0
+
+# Initial in-flight limit of an `AdaptiveLimiter`.
+LIMITER_INITIAL_LIMIT: float = 4
+
+# Highest in-flight limit an `AdaptiveLimiter` can reach.
+LIMITER_MAX_LIMIT: float = 64
+
+# Factor by which an `AdaptiveLimiter` multiplies its limit when it detects congestion.
+LIMITER_DECREASE_FACTOR: float = 0.7
+
+# How many times slower than the best observed time-to-first-byte a response can be before an `AdaptiveLimiter` treats it as congestion.
+LIMITER_TTFB_TOLERANCE: float = 3.0
+
+# Minimum number of seconds between two decreases of the limit of an `AdaptiveLimiter`.
+LIMITER_DECREASE_COOLDOWN_SECONDS: float = 1.0
+
+# Number of recent time-to-first-byte samples, per endpoint, over which an `AdaptiveLimiter` takes its baseline (their minimum).
+LIMITER_BASELINE_WINDOW: int = 100
+
+# Size, in bytes, of the chunks in which the request body of `generate_data` is streamed.
+REQUEST_BODY_CHUNK_SIZE: int = 64 * 1024
+
+# Maximum number of samples of each of the jobs a `synthex generate` run is split into.
+CLI_DEFAULT_SHARD_SIZE: int = 1000
+
+# Number of jobs retrieved per page when `Jobs.wait()` and `Jobs.as_completed()` look up the status of jobs.
+JOBS_STATUS_PAGE_SIZE: int = 100
+
+# Seconds between the first two status lookups of `Jobs.wait()` and `Jobs.as_completed()`.
+JOBS_POLL_INITIAL_INTERVAL_SECONDS: float = 1.0
+
+# Longest interval, in seconds, between two status lookups of `Jobs.wait()` and `Jobs.as_completed()`.
+JOBS_POLL_MAX_INTERVAL_SECONDS: float = 30.0
+
+# Factor by which the interval between two status lookups grows while no job reaches a terminal state.
+JOBS_POLL_BACKOFF_FACTOR: float = 2.0
+
+# Default compression level of gzip-compressed output files, balancing speed and size. Levels range from 1 (fastest) to 9 (smallest).
+OUTPUT_GZIP_DEFAULT_LEVEL: int = 6
+
+# Default compression level of zstd-compressed output files, balancing speed and size. Levels range from 1 (fastest) to 22 (smallest).
+OUTPUT_ZSTD_DEFAULT_LEVEL: int = 3
+
+# Environment variable that enables profiling of the client's calls, holding the directory the reports are written to.
+PROFILE_DIR_ENV_VAR: str = "SYNTHEX_PROFILE_DIR"
+
+# Number of functions, and of allocation sites, listed in a profiling report.
+PROFILE_REPORT_TOP_ENTRIES: int = 25
+
+# Size, in bytes, above which the rows of an SSE event are decoded and written a batch at a time, rather than all at once.
+INCREMENTAL_PARSE_MIN_BYTES: int = 256 * 1024
+
+# Number of rows decoded before they are written, for events that are decoded a batch at a time.
+INCREMENTAL_PARSE_BATCH_ROWS: int = 256
+
+# Size, in bytes, of the slices of an event's payload that are decoded to text at a time, for events that are decoded a batch at a time.
+INCREMENTAL_PARSE_WINDOW_BYTES: int = 64 * 1024
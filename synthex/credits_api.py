@@ -1,4 +1,5 @@
-from .api_client import APIClient
+from .api_client import response_data
+from .client_pool import Client
 
 from .endpoints import GET_PROMOTIONAL_CREDITS_ENDPOINT
 from .models import CreditModel
@@ -6,7 +7,7 @@ from .models import CreditModel
 
 class CreditsAPI:
     
-    def __init__(self, client: APIClient):
+    def __init__(self, client: Client):
         self._client = client
         
         
@@ -17,5 +18,5 @@ class CreditsAPI:
             CreditModel: An instance of `CreditModel` containing the promotional credits data.
         """
         
-        response = self._client.get(GET_PROMOTIONAL_CREDITS_ENDPOINT)
-        return CreditModel.model_validate(response.data)
\ No newline at end of file
+        response = self._client.get(GET_PROMOTIONAL_CREDITS_ENDPOINT, model=CreditModel)
+        return response_data(response, CreditModel)
\ No newline at end of file
@@ -0,0 +1,257 @@
+import sys
+from array import array
+from typing import Any, Iterator, List, Optional, Union
+
+from .exceptions import ConfigurationError, ValidationError
+from .models import JobOutputDomainType
+
+
+# The typecodes of the arrays that hold integer and float columns.
+_ARRAY_TYPECODES = {"integer": "q", "float": "d"}
+
+Column = Union["array[Any]", List[Optional[str]]]
+
+
+class Dataset:
+    """
+    A compact, columnar, in-memory dataset, typically returned by `generate_data` when called with
+    `return_dataset=True`. Every column of the schema definition is stored in a typed container:
+    integer and float columns in `array("q")` and `array("d")` (8 bytes per value), and string
+    columns in lists of interned strings, so that repeated values are stored once. Missing
+    (null) integers and floats are stored as 0 and NaN respectively, and flagged in a mask.
+    Columns can be exported without copying to NumPy (`to_numpy`) and pandas (`to_pandas`), if
+    they are installed.
+    Args:
+        schema_definition (JobOutputDomainType): The columns of the dataset and their types.
+    """
+
+    def __init__(self, schema_definition: JobOutputDomainType):
+        self.schema_definition = schema_definition
+        self._columns: dict[str, Column] = {
+            name: array(_ARRAY_TYPECODES[field["type"]]) if field["type"] in _ARRAY_TYPECODES
+            else []
+            for name, field in schema_definition.items()
+        }
+        self._masks: dict[str, "array[int]"] = {}
+        self._length = 0
+
+    @property
+    def column_names(self) -> List[str]:
+        """
+        The names of the columns, in the order of the schema definition.
+        """
+
+        return list(self._columns)
+
+    def column(self, name: str) -> Column:
+        """
+        Get a column.
+        Args:
+            name (str): The name of the column.
+        Returns:
+            Column: The values of the column: an `array` for integer and float columns, a list
+                for string columns.
+        """
+
+        return self._columns[name]
+
+    def null_mask(self, name: str) -> Optional["array[int]"]:
+        """
+        Get the mask of the missing values of a column.
+        Args:
+            name (str): The name of the column.
+        Returns:
+            Optional[array[int]]: An `array("B")` holding 1 for every missing value of the
+                column, or None if it has none.
+        """
+
+        return self._masks.get(name)
+
+    def append_rows(self, rows: List[dict[str, Any]]) -> None:
+        """
+        Append rows to the dataset. Keys that are not in the schema definition are ignored.
+        Missing keys, nulls, and values that cannot be converted to the type of an integer or
+        float column are stored as missing values.
+        Args:
+            rows (List[dict[str, Any]]): The rows to append.
+        Raises:
+            ValidationError: If a value could only be stored with a loss of information: a float
+                with a fractional part in an integer column, or a number out of the range of
+                its column. No row of the batch is appended.
+        """
+
+        if not rows:
+            return
+        masked = set(self._masks)
+        try:
+            self._append_columns(rows)
+        except ValidationError:
+            for column in self._columns.values():
+                del column[self._length:]
+            for name in list(self._masks):
+                if name in masked:
+                    del self._masks[name][self._length:]
+                else:
+                    del self._masks[name]
+            raise
+        self._length += len(rows)
+
+    def _append_columns(self, rows: List[dict[str, Any]]) -> None:
+        for name, column in self._columns.items():
+            values = [row.get(name) for row in rows]
+            if isinstance(column, list):
+                intern = sys.intern
+                column.extend([
+                    intern(value) if isinstance(value, str) else
+                    None if value is None else intern(str(value))
+                    for value in values
+                ])
+                continue
+            start = len(column)
+            try:
+                # Fast path: the values are all of the column's type, or all ints for a float one.
+                column.extend(values)
+            except (TypeError, OverflowError):
+                # `array.extend` appends the values preceding the offending one.
+                del column[start:]
+                self._extend_slowly(name, column, values)
+            else:
+                mask = self._masks.get(name)
+                if mask is not None:
+                    mask.extend(bytes(len(values)))
+
+    def _extend_slowly(self, name: str, column: "array[Any]", values: List[Any]) -> None:
+        integer = column.typecode == "q"
+        convert = int if integer else float
+        missing = 0 if integer else float("nan")
+        mask = self._masks.get(name)
+        if mask is None:
+            mask = self._masks[name] = array("B", bytes(len(column)))
+        for value in values:
+            try:
+                converted = convert(value)
+                if integer and isinstance(value, float) and converted != value:
+                    raise OverflowError
+                column.append(converted)
+            except (TypeError, ValueError):
+                column.append(missing)
+                mask.append(1)
+            except OverflowError as e:
+                raise ValidationError(
+                    f"Value {value!r} of column '{name}' cannot be stored as "
+                    f"{'a 64-bit integer' if integer else 'a float'} without loss."
+                ) from e
+            else:
+                mask.append(0)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(self._length):
+            yield self.row(index)
+
+    def row(self, index: int) -> dict[str, Any]:
+        """
+        Get a row.
+        Args:
+            index (int): The index of the row.
+        Returns:
+            dict[str, Any]: The row, with None for missing values.
+        """
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Dataset row index out of range")
+        return {
+            name: None if name in self._masks and self._masks[name][index] else column[index]
+            for name, column in self._columns.items()
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The approximate memory used by the dataset, in bytes, counting every distinct string
+        once.
+        """
+
+        size = 0
+        strings: dict[int, int] = {}
+        for column in self._columns.values():
+            size += sys.getsizeof(column)
+            if isinstance(column, list):
+                for value in column:
+                    if value is not None:
+                        strings.setdefault(id(value), sys.getsizeof(value))
+        return size + sum(strings.values()) + sum(
+            sys.getsizeof(mask) for mask in self._masks.values()
+        )
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Export the columns to NumPy arrays. Integer and float columns are exported without
+        copying, as views of the dataset's arrays, and integer columns with missing values are
+        converted to float arrays holding NaN instead. String columns are copied into object
+        arrays. Requires NumPy.
+        Returns:
+            dict[str, Any]: A `numpy.ndarray` for every column.
+        Raises:
+            ConfigurationError: If NumPy is not installed.
+        """
+
+        np = _import("numpy", "numpy")
+        arrays: dict[str, Any] = {}
+        for name, column in self._columns.items():
+            if isinstance(column, list):
+                values = np.empty(len(column), dtype=object)
+                values[:] = column
+            else:
+                dtype = np.int64 if column.typecode == "q" else np.float64
+                values = np.frombuffer(column, dtype=dtype)
+                mask = self._masks.get(name)
+                if mask is not None and column.typecode == "q":
+                    values = values.astype(np.float64)
+                    values[np.frombuffer(mask, dtype=np.uint8).astype(bool)] = np.nan
+            arrays[name] = values
+        return arrays
+
+    def to_pandas(self) -> Any:
+        """
+        Export the dataset to a pandas DataFrame. Integer and float columns are backed by the
+        dataset's arrays without copying; integer columns with missing values use pandas'
+        nullable "Int64" type. Requires pandas.
+        Returns:
+            pandas.DataFrame: The dataset.
+        Raises:
+            ConfigurationError: If pandas is not installed.
+        """
+
+        pd = _import("pandas", "pandas")
+        np = _import("numpy", "pandas")
+        data: dict[str, Any] = {}
+        for name, column in self._columns.items():
+            mask = self._masks.get(name)
+            if isinstance(column, list) or column.typecode == "d" or mask is None:
+                continue
+            data[name] = pd.arrays.IntegerArray(
+                np.frombuffer(column, dtype=np.int64),
+                np.frombuffer(mask, dtype=np.uint8).astype(bool)
+            )
+        arrays = self.to_numpy()
+        return pd.DataFrame(
+            {name: data.get(name, arrays[name]) for name in self._columns}, copy=False
+        )
+
+    def __repr__(self) -> str:
+        return f"Dataset({self._length} rows, columns={self.column_names})"
+
+
+def _import(module: str, extra: str) -> Any:
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ConfigurationError(
+            f"Exporting a Dataset to {module} requires the '{extra}' extra. Install it with "
+            f"`pip install synthex[{extra}]`."
+        ) from e
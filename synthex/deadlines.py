@@ -0,0 +1,109 @@
+import time
+from typing import Iterable, Iterator, Optional
+
+from .exceptions import DeadlineExceededError
+from .transports import is_timeout_error
+
+
+class Deadline:
+    """
+    The time budget of a call: a total deadline, counted from the moment the `Deadline` is
+    created, and a maximum idle time between two events of a stream.
+    Args:
+        total (Optional[float]): The maximum duration of the call, in seconds. Unbounded if None.
+        idle (Optional[float]): The maximum number of seconds between two events. Unbounded if
+            None.
+    """
+
+    def __init__(self, total: Optional[float] = None, idle: Optional[float] = None):
+        self.total = total
+        self.idle = idle
+        self._started_at = time.monotonic()
+        self._last_event_at = self._started_at
+
+    @property
+    def socket_timeout(self) -> Optional[float]:
+        """
+        The timeout to apply to each socket operation of the call, so that the transport gives
+        up on its own once the budget is spent, even if nobody is waiting on it anymore. It never
+        exceeds the time left until the total deadline, so that neither connecting nor waiting
+        for the response headers can outlast it.
+        """
+
+        timeouts = [t for t in (self._total_remaining(), self.idle) if t is not None]
+        return min(timeouts) if timeouts else None
+
+    def _total_remaining(self) -> Optional[float]:
+        if self.total is None:
+            return None
+        return max(self.total - (time.monotonic() - self._started_at), 0.0)
+
+    def guard(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Stop a request body from being uploaded past the total deadline.
+        Args:
+            chunks (Iterable[bytes]): The chunks of the request body.
+        Returns:
+            Iterator[bytes]: The same chunks.
+        Raises:
+            DeadlineExceededError: If the total deadline expires before a chunk is sent.
+        """
+
+        for chunk in chunks:
+            if self._total_remaining() == 0.0:
+                raise DeadlineExceededError(
+                    f"Deadline of {self.total}s exceeded while sending the request"
+                )
+            yield chunk
+
+    def touch(self) -> None:
+        """
+        Record that an event was received, resetting the idle timer.
+        """
+
+        self._last_event_at = time.monotonic()
+
+    def remaining(self) -> Optional[float]:
+        """
+        The number of seconds until the total deadline or the idle timeout expires, whichever
+        comes first, or None if the call is unbounded.
+        """
+
+        now = time.monotonic()
+        remaining = [
+            limit - (now - since) for limit, since in
+            ((self.total, self._started_at), (self.idle, self._last_event_at)) if limit is not None
+        ]
+        return max(min(remaining), 0.0) if remaining else None
+
+    def check(self) -> None:
+        """
+        Raise if the budget is spent.
+        Raises:
+            DeadlineExceededError: If the total deadline or the idle timeout expired.
+        """
+
+        now = time.monotonic()
+        if self.total is not None and now - self._started_at >= self.total:
+            raise DeadlineExceededError(f"Deadline of {self.total}s exceeded")
+        if self.idle is not None and now - self._last_event_at >= self.idle:
+            raise DeadlineExceededError(f"No event received for {self.idle}s")
+
+    def translate(self, error: BaseException) -> BaseException:
+        """
+        Turn a timeout raised by a transport into a `DeadlineExceededError`.
+        Args:
+            error (BaseException): An error raised while waiting for the stream.
+        Returns:
+            BaseException: A `DeadlineExceededError` if `error` is a transport timeout, `error`
+                itself otherwise.
+        """
+
+        if isinstance(error, DeadlineExceededError) or not is_timeout_error(error):
+            return error
+        translated = DeadlineExceededError(
+            f"Stream timed out after {time.monotonic() - self._started_at:.1f}s",
+            details=str(error)
+        )
+        translated.__cause__ = error
+        return translated
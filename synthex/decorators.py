@@ -4,6 +4,7 @@ from pydantic import ValidationError
 import inspect
 
 from .exceptions import ValidationError as SynthexValidationError
+from .profiling import profiled
 
 
 T = TypeVar("T", bound=type)
@@ -40,6 +41,7 @@ def handle_validation_errors(cls: T) -> T:
                     return __attr(self, *args, **kwargs)
                 except ValidationError as e:
                     raise SynthexValidationError(f"Invalid input: {e}") from e
-            setattr(cls, attr_name, sync_wrapper)
+            # Profiled from the outside, so that reports include the validation of arguments.
+            setattr(cls, attr_name, profiled(sync_wrapper))
 
     return cls
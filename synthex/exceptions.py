@@ -49,3 +49,11 @@ class ValidationError(SynthexError):
 class ConfigurationError(SynthexError):
     """Raised when the configuration, or parts of it, is missing or malformed."""
     pass
+
+class InsufficientCreditsError(SynthexError):
+    """Raised when the available credits are not enough to run the requested jobs."""
+    pass
+
+class DeadlineExceededError(SynthexError):
+    """Raised when a call exceeds its deadline, or its stream stays idle for too long."""
+    pass
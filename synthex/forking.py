@@ -0,0 +1,35 @@
+import os
+import weakref
+from typing import Protocol
+
+
+class Resettable(Protocol):
+    def _reset(self) -> None:
+        ...
+
+
+# The objects whose `_reset` method is called in every forked child process.
+_instances: "weakref.WeakSet[Resettable]" = weakref.WeakSet()
+
+
+def _reset_instances() -> None:
+    for instance in list(_instances):
+        instance._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_instances)
+
+
+def reset_after_fork(instance: Resettable) -> None:
+    """
+    Have `instance._reset()` called in every child process forked from now on, right after the
+    fork. Only the forking thread survives in a child, so any lock that another thread held at
+    that moment would never be released there, and the counters guarded by that lock would
+    count work that the child will never complete: `_reset` recreates them. The instance is
+    only weakly referenced.
+    Args:
+        instance (Resettable): The object to reset.
+    """
+
+    _instances.add(instance)
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+from pydantic import BaseModel
+
+
+class CacheEntry(BaseModel):
+    """
+    A cached HTTP response body, together with the validators needed to revalidate it.
+    Attributes:
+        url (str): The URL the body was retrieved from.
+        etag (Optional[str]): The value of the `ETag` response header.
+        last_modified (Optional[str]): The value of the `Last-Modified` response header.
+        body (str): The response body.
+    """
+
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body: str
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        Build the headers that turn a request into a conditional request against this entry.
+        Returns:
+            dict[str, str]: The `If-None-Match` and/or `If-Modified-Since` headers.
+        """
+
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    An on-disk cache of HTTP response bodies and their validators (ETag / Last-Modified), used to
+    send conditional GET requests and serve 304 responses from disk.
+    Each entry is stored in its own file, named after a hash of the request. Entries are written to
+    a temporary file and atomically renamed into place, so that several processes can safely share
+    the same cache directory: readers always see either the previous or the new version of an
+    entry, never a partially written one.
+    Args:
+        directory (str): The directory in which cache entries are stored. It is created if it
+            does not exist.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: Optional[dict[str, Any]] = None, scope: str = "") -> str:
+        """
+        Compute the cache key of a request.
+        Args:
+            url (str): The request URL.
+            params (Optional[dict[str, Any]]): The query parameters of the request.
+            scope (str): An additional discriminator, such as the credentials the request is
+                sent with, so that different users sharing a cache never see each other's data.
+        Returns:
+            str: The cache key.
+        """
+
+        material = json.dumps([scope, url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Retrieve a cache entry.
+        Args:
+            key (str): The cache key, as returned by `HTTPCache.key`.
+        Returns:
+            Optional[CacheEntry]: The cache entry, or None if it is missing or unreadable.
+        """
+
+        try:
+            with open(self._path(key), mode="r", encoding="utf-8") as f:
+                return CacheEntry.model_validate_json(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Atomically store a cache entry.
+        Args:
+            key (str): The cache key, as returned by `HTTPCache.key`.
+            entry (CacheEntry): The entry to store.
+        """
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, mode="w", encoding="utf-8") as f:
+                f.write(entry.model_dump_json())
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
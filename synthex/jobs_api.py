@@ -1,21 +1,32 @@
-from .api_client import APIClient
-from typing import Any, List
+from .api_client import response_data
+from .client_pool import Client
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 import json
-import csv
+import random
+import time
 from pydantic import validate_call, Field
 import os
 
-from .models import ListJobsResponseModel, SuccessResponse, JobOutputDomainType, JobOutputFormats
+from .models import JobResponseModel, ListJobsResponseModel, SuccessResponse, JobOutputDomainType, JobOutputFormats, \
+    JobExamplesType, PartialOutputPolicy
 from .endpoints import LIST_JOBS_ENDPOINT, CREATE_JOB_WITH_SAMPLES_ENDPOINT
 from .decorators import handle_validation_errors
-from .exceptions import ValidationError
-from .config import OUTPUT_FILE_DEFAULT_NAME
+from .exceptions import DeadlineExceededError, NotFoundError, ValidationError
+from .config import OUTPUT_FILE_DEFAULT_NAME, JOBS_STATUS_PAGE_SIZE, \
+    JOBS_POLL_INITIAL_INTERVAL_SECONDS, JOBS_POLL_MAX_INTERVAL_SECONDS, JOBS_POLL_BACKOFF_FACTOR
+from .progress import GenerationProgress, ProgressCallback, ProgressTracker, TerminalProgressBar
+from .streaming import ThreadedReader, iter_row_batches, iter_sse_payloads
+from .writers import DatasetWriter, OutputWriter, make_writer
+from .request_body import encode_job_body, iter_examples
+from .deadlines import Deadline
+from .compression import check_compression_level, split_compression
+from .dataset import Dataset
 
 
 @handle_validation_errors
 class JobsAPI:
     
-    def __init__(self, client: APIClient):
+    def __init__(self, client: Client):
         self._client = client
         
     def list(self, limit: int = 10, offset: int = 0) -> ListJobsResponseModel:
@@ -28,14 +39,139 @@ class JobsAPI:
             ListJobsResponseModel: A model containing the list of jobs and related metadata.
         """
         
-        response = self._client.get(f"{LIST_JOBS_ENDPOINT}?limit={limit}&offset={offset}")
-        return ListJobsResponseModel.model_validate(response.data)
+        response = self._client.get(
+            f"{LIST_JOBS_ENDPOINT}?limit={limit}&offset={offset}", model=ListJobsResponseModel
+        )
+        return response_data(response, ListJobsResponseModel)
+    
+    def _scan(self, job_ids: set[str]) -> dict[str, JobResponseModel]:
+        """
+        Page through the list of jobs, only until all of the given jobs are found.
+        Args:
+            job_ids (set[str]): The IDs of the jobs to look for.
+        Returns:
+            dict[str, JobResponseModel]: The jobs that were found, by ID.
+        """
+        
+        found: dict[str, JobResponseModel] = {}
+        offset = 0
+        while len(found) < len(job_ids):
+            page = self.list(limit=JOBS_STATUS_PAGE_SIZE, offset=offset)
+            found.update((job.id, job) for job in page.jobs if job.id in job_ids)
+            offset += len(page.jobs)
+            if not page.jobs or offset >= page.total:
+                break
+        return found
+    
+    def _lookup(self, job_ids: set[str]) -> dict[str, JobResponseModel]:
+        """
+        Retrieve the current state of a set of jobs. Jobs deleted while paging through the list
+        of jobs shift the offsets of the following ones, which may then be skipped, so the jobs
+        that were not found are looked for once more before being reported as missing.
+        Args:
+            job_ids (set[str]): The IDs of the jobs to look up.
+        Returns:
+            dict[str, JobResponseModel]: The jobs that were found, by ID.
+        """
+        
+        found = self._scan(job_ids)
+        missing = job_ids - found.keys()
+        if missing:
+            found.update(self._scan(missing))
+        return found
+    
+    @validate_call
+    def as_completed(
+        self, job_ids: List[str], timeout: Optional[float] = Field(None, gt=0),
+        poll_interval: float = Field(JOBS_POLL_INITIAL_INTERVAL_SECONDS, gt=0),
+        max_poll_interval: float = Field(JOBS_POLL_MAX_INTERVAL_SECONDS, gt=0)
+    ) -> Iterator[JobResponseModel]:
+        """
+        Wait for jobs to complete or fail, yielding each of them as soon as it does. The status of
+        all pending jobs is retrieved at once, with as few pages of the list of jobs as possible.
+        The interval between two lookups starts at `poll_interval`, grows exponentially (up to
+        `max_poll_interval`) while no job reaches a terminal state, and is randomized so that
+        concurrent waiters do not poll in lockstep.
+        Args:
+            job_ids (List[str]): The IDs of the jobs to wait for.
+            timeout (Optional[float]): The maximum number of seconds to wait. Waits indefinitely
+                if None.
+            poll_interval (float): The initial number of seconds between two lookups.
+            max_poll_interval (float): The maximum number of seconds between two lookups.
+        Returns:
+            Iterator[JobResponseModel]: The jobs, in the order in which they reach a terminal
+                state.
+        Raises:
+            NotFoundError: If a job does not exist.
+            DeadlineExceededError: If some jobs are still pending after `timeout` seconds.
+        """
+        
+        started_at = time.monotonic()
+        pending = set(job_ids)
+        interval = poll_interval
+        while pending:
+            found = self._lookup(pending)
+            missing = pending - found.keys()
+            if missing:
+                raise NotFoundError(f"Jobs not found: {', '.join(sorted(missing))}")
+            done = [job for job in found.values() if job.status.is_terminal]
+            for job in done:
+                pending.discard(job.id)
+                yield job
+            if not pending:
+                return
+            
+            # Back off while nothing changes, and start over as soon as a job is done. The delay
+            # is drawn between half and all of the interval.
+            if done:
+                interval = poll_interval
+            delay = interval * random.uniform(0.5, 1.0)
+            interval = min(interval * JOBS_POLL_BACKOFF_FACTOR, max_poll_interval)
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    raise DeadlineExceededError(
+                        f"{len(pending)} jobs still pending after {timeout}s"
+                    )
+                delay = min(delay, remaining)
+            time.sleep(delay)
+    
+    @validate_call
+    def wait(
+        self, job_ids: List[str], timeout: Optional[float] = Field(None, gt=0),
+        poll_interval: float = Field(JOBS_POLL_INITIAL_INTERVAL_SECONDS, gt=0),
+        max_poll_interval: float = Field(JOBS_POLL_MAX_INTERVAL_SECONDS, gt=0)
+    ) -> List[JobResponseModel]:
+        """
+        Wait for all of the given jobs to complete or fail. See `as_completed`.
+        Args:
+            job_ids (List[str]): The IDs of the jobs to wait for.
+            timeout (Optional[float]): The maximum number of seconds to wait. Waits indefinitely
+                if None.
+            poll_interval (float): The initial number of seconds between two lookups.
+            max_poll_interval (float): The maximum number of seconds between two lookups.
+        Returns:
+            List[JobResponseModel]: The jobs, in the order of `job_ids`.
+        Raises:
+            NotFoundError: If a job does not exist.
+            DeadlineExceededError: If some jobs are still pending after `timeout` seconds.
+        """
+        
+        jobs = {
+            job.id: job for job in self.as_completed(
+                job_ids, timeout=timeout, poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval
+            )
+        }
+        return [jobs[job_id] for job_id in job_ids]
     
     
     @staticmethod
     def _sanitize_output_path(output_path: str, desired_format: JobOutputFormats) -> str:
         """
-        Ensure that the output path is valid, then add the file name to it.
+        Ensure that the output path is valid, then add the file name to it. A compression 
+        extension (".gz" or ".zst") is kept after the format's extension, e.g. "out.gz" becomes 
+        "out.csv.gz".
         Args:
             output_path (str): The output path to sanitize.
             format (JobOutputFormats): The desired output format.
@@ -51,9 +187,11 @@ class JobsAPI:
         
         # If a file name is provided, ensure its extension matches the desired format
         if file_name:
+            file_name, compression = split_compression(file_name)
             base_name, ext = os.path.splitext(file_name)
             if ext != correct_extension:
                 file_name = f"{base_name}{correct_extension}"
+            file_name += compression
         else:
             # If no file name is provided, use a default name with the correct extension
             file_name = OUTPUT_FILE_DEFAULT_NAME(desired_format)
@@ -68,68 +206,244 @@ class JobsAPI:
     def generate_data(
         self, 
         schema_definition: JobOutputDomainType,
-        examples: List[dict[Any, Any]], 
+        examples: JobExamplesType, 
         requirements: List[str],
-        output_path: str,
+        output_path: Optional[str],
         number_of_samples: int = Field(..., gt=0, le=1000), 
         output_type: JobOutputFormats = "csv",
-    ) -> SuccessResponse[None]:
+        on_progress: Optional[ProgressCallback] = None,
+        show_progress: bool = False,
+        pipelined: bool = False,
+        passthrough: bool = False,
+        deadline: Optional[float] = Field(None, gt=0),
+        idle_timeout: Optional[float] = Field(None, gt=0),
+        partial_output: PartialOutputPolicy = "keep",
+        row_filter: Optional[Callable[[dict[str, Any]], bool]] = None,
+        take: Optional[int] = Field(None, gt=0),
+        stop_when: Optional[Callable[[GenerationProgress], bool]] = None,
+        rotate_rows: Optional[int] = Field(None, gt=0),
+        rotate_bytes: Optional[int] = Field(None, gt=0),
+        partition_by: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        return_dataset: bool = False,
+    ) -> SuccessResponse[Any]:
         """
         Generates data based on the provided schema definition, examples, and requirements.
         Args:
             schema_definition (dict[Any, Any]): The schema definition that the generated data 
                 should conform to.
-            examples (List[dict[Any, Any]]): A list of example data points to guide the data 
-                generation process.
+            examples (JobExamplesType): The example data points to guide the data generation 
+                process: a list, the path of a CSV or JSON Lines file, or any iterable of 
+                dictionaries. The request body is streamed, and files and iterables are read as 
+                it is sent, so any number of examples can be used with bounded memory.
             requirements (List[str]): A list of specific requirements or constraints for the data 
                 generation.
             number_of_samples (int): The number of data samples to generate.
-            output_type (Literal["csv"]): The desired output format for the generated data. 
+            output_type (Literal["csv", "jsonl"]): The desired output format for the generated 
+                data. 
                 - "csv": Saves the data to a CSV file.
-            output_path (str): The file path where the generated data should be saved.
+                - "jsonl": Saves the data to a JSON Lines file.
+            output_path (Optional[str]): The file path where the generated data should be saved, 
+                or None if `return_dataset` is True. If it 
+                ends with ".gz" or ".zst" (which requires the `zstd` extra), the data is 
+                compressed as it is written.
+            on_progress (Optional[ProgressCallback]): A function called after every received 
+                event with a `GenerationProgress` snapshot (rows, bytes, elapsed time, rows/sec 
+                and ETA).
+            show_progress (bool): Whether to render a progress bar on the terminal.
+            pipelined (bool): Whether to read the network stream on a background thread, so that 
+                slow file writes do not stall socket reads. Events are handed over to the writing 
+                thread through a bounded queue.
+            passthrough (bool): Whether to write the rows of each server event to disk as sent 
+                by the server, without re-encoding them. Each line of the output file still 
+                holds one row. Only supported with `output_type="jsonl"`.
+            deadline (Optional[float]): The maximum duration of the whole call, in seconds, 
+                including the upload of the request and the download of the data.
+            idle_timeout (Optional[float]): The maximum number of seconds to wait for each 
+                event of the stream.
+                When either limit is set, the stream is read on a background thread (as with 
+                `pipelined=True`), so that the call gives up promptly even if the server stalls.
+            partial_output (Literal["keep", "delete"]): What to do with the output file if the 
+                call fails midway, e.g. because a limit was exceeded.
+                - "keep": Leave the rows received so far in the output file.
+                - "delete": Remove the output file.
+            row_filter (Optional[Callable[[dict[str, Any]], bool]]): A predicate that every 
+                received row must satisfy to be written to the output file.
+            take (Optional[int]): The number of rows (that pass `row_filter`, if provided) after 
+                which to stop. The stream is closed as soon as they are received, and any excess 
+                rows of the last event are dropped.
+            stop_when (Optional[Callable[[GenerationProgress], bool]]): A predicate called after 
+                every received event; the stream is closed as soon as it returns True.
+                When the stream is stopped early, the output file is flushed and closed as 
+                usual, and the connection is closed rather than drained.
+            rotate_rows (Optional[int]): The maximum number of rows per output file.
+            rotate_bytes (Optional[int]): The size, in bytes, after which an output file is 
+                completed and a new one is started.
+            partition_by (Optional[str]): A column of the schema definition; rows are written to 
+                a "<column>=<value>/" subdirectory of the output directory for each of its values.
+                If any of these three is set, rows are spread across numbered files derived from 
+                `output_path`, and a manifest listing them is written next to them. See 
+                `PartitionedWriter`.
+            compression_level (Optional[int]): The compression level of ".gz" (1 to 9) or 
+                ".zst" (1 to 22) output files. Defaults to a balanced level: 6 for ".gz", 3 for 
+                ".zst".
+            return_dataset (bool): Whether to collect the generated data into a compact, 
+                columnar, in-memory `Dataset`, returned as the `data` of the response, instead 
+                of writing it to a file. `output_path` must then be None.
         Returns:
-            SuccessResponse[None]: A response object indicating the success of the job execution.
+            SuccessResponse[Any]: A response object indicating the success of the job execution. 
+                Its `data` is the `Dataset` if `return_dataset` is True, None otherwise.
         Raises:
-            ValueError: If the schema_definition or examples are invalid or do not conform to the 
-            expected format.
+            DeadlineExceededError: If the deadline or the idle timeout is exceeded. The 
+            connection is closed before the error is raised.
+            ValidationError: If the schema_definition or examples are invalid or do not conform to 
+            the expected format. Examples given as a file or an iterable are only checked as the 
+            request body is sent.
         """
         
-        # Sanitize the output path
-        output_path = self._sanitize_output_path(output_path, output_type)
+        if passthrough and output_type != "jsonl":
+            raise ValidationError("Passthrough mode is only supported with output_type 'jsonl'.")
+        if passthrough and (
+            rotate_rows is not None or rotate_bytes is not None or partition_by is not None
+        ):
+            raise ValidationError("Passthrough mode does not support partitioned output.")
+        if partition_by is not None and partition_by not in schema_definition:
+            raise ValidationError(
+                f"Partition column '{partition_by}' is not in the schema definition."
+            )
+        
+        if return_dataset:
+            if output_path is not None or passthrough or compression_level is not None or (
+                rotate_rows is not None or rotate_bytes is not None or partition_by is not None
+            ):
+                raise ValidationError(
+                    "return_dataset cannot be combined with output_path, passthrough, "
+                    "partitioned output or compression."
+                )
+        elif output_path is None:
+            raise ValidationError("output_path can only be None if return_dataset is True.")
+        else:
+            # Sanitize the output path
+            output_path = self._sanitize_output_path(output_path, output_type)
+            check_compression_level(output_path, compression_level)
                 
-        # Validate that each example conforms to the schema definition
-        for example in examples:
-            if set(example.keys()) != set(schema_definition.keys()):
-                raise ValidationError("Example keys do not match schema definition keys.")
+        # Validate that each example conforms to the schema definition. Examples that are not 
+        # already in memory are validated lazily, while the request body is encoded.
+        if isinstance(examples, list):
+            for example in examples:
+                if set(example.keys()) != set(schema_definition.keys()):
+                    raise ValidationError("Example keys do not match schema definition keys.")
             
-        data: dict[str, Any] = {
-            "output_schema": schema_definition,
-            "examples": examples,
-            "requirements": requirements,
-            "datapoint_num": number_of_samples
-        }
+        body = encode_job_body(
+            schema_definition, iter_examples(examples, schema_definition), requirements,
+            number_of_samples
+        )
+        
+        clock = Deadline(deadline, idle_timeout) if deadline or idle_timeout else None
                 
-        response = self._client.post_stream(f"{CREATE_JOB_WITH_SAMPLES_ENDPOINT}", data=data)
-        
-        # Create the output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        for line in response.iter_lines(decode_unicode=True):
-            # Strip "data: " prefix automatically added by the SSE.
-            if line and line.startswith("data: "):
-                raw = line[6:].strip()
-                # Parse JSON.
-                parsed_data = json.loads(raw)
-                # Write it into a file. The type of file depends on the 'output_type' parameter.
-                if output_type == "csv":
-                    with open(output_path, mode="w", newline="", encoding="utf-8") as f:
-                        # Write column names.
-                        writer = csv.DictWriter(f, fieldnames=parsed_data[0].keys())
-                        writer.writeheader()
-                        # Write each dict as a row.
-                        writer.writerows(parsed_data)
+        # The upload, the connection and the wait for the response headers all count towards
+        # the deadline, not only the reading of the stream.
+        response = self._client.post_stream(
+            f"{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+            content=clock.guard(body) if clock is not None else body,
+            timeout=clock.socket_timeout if clock is not None else None
+        )
+        
+        # Write the data into a file. The type of file depends on the 'output_type' parameter.
+        # CSV columns follow the order of the schema definition. The response must be closed,
+        # releasing its connection and limiter slot, if the output cannot be opened.
+        dataset = Dataset(schema_definition) if return_dataset else None
+        writer: OutputWriter
+        try:
+            if dataset is not None:
+                writer = DatasetWriter(dataset)
+            else:
+                # Create the output directory if it doesn't exist
+                output_dir = os.path.dirname(output_path) if output_path is not None else None
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                writer = make_writer(
+                    output_type, output_path,  # type: ignore[arg-type]
+                    rotate_rows, rotate_bytes, partition_by, compression_level,
+                    fieldnames=list(schema_definition)
+                )
+        except BaseException:
+            response.close()
+            raise
+        
+        progress_bar = TerminalProgressBar() if show_progress else None
+        
+        def notify(progress: GenerationProgress) -> None:
+            if progress_bar is not None:
+                progress_bar(progress)
+            if on_progress is not None:
+                on_progress(progress)
+        
+        tracker = ProgressTracker(number_of_samples, notify)
+        
+        payloads: Iterable[bytes] = iter_sse_payloads(response.iter_lines())
+        if pipelined or clock is not None:
+            payloads = ThreadedReader(payloads, on_close=response.close, deadline=clock)
+        
+        # Rows only need to be decoded in passthrough mode if someone is tracking progress, or 
+        # they have to be selected.
+        count_rows = on_progress is not None or progress_bar is not None or stop_when is not None
+        select_rows = row_filter is not None or take is not None
+        written = 0
+        
+        try:
+            with writer:
+                for raw in payloads:
+                    if passthrough and not select_rows:
+                        writer.write_payload(raw)
+                        rows = sum(map(len, iter_row_batches(raw))) if count_rows else 0
+                    elif passthrough:
+                        # Parse JSON. The payload is written as-is, unless rows are dropped.
+                        parsed_data = json.loads(raw)
+                        rows = len(parsed_data)
+                        if row_filter is not None:
+                            parsed_data = [row for row in parsed_data if row_filter(row)]
+                        if take is not None:
+                            parsed_data = parsed_data[:take - written]
+                        if len(parsed_data) == rows:
+                            writer.write_payload(raw)
+                        else:
+                            writer.write_rows(parsed_data)
+                        written += len(parsed_data)
+                    else:
+                        # Parse JSON. Large events are parsed and written a batch at a time.
+                        rows = 0
+                        for parsed_data in iter_row_batches(raw):
+                            rows += len(parsed_data)
+                            if row_filter is not None:
+                                parsed_data = [row for row in parsed_data if row_filter(row)]
+                            if take is not None:
+                                parsed_data = parsed_data[:take - written]
+                            writer.write_rows(parsed_data)
+                            written += len(parsed_data)
+                            if take is not None and written >= take:
+                                break
+                    progress = tracker.update(rows, len(raw))
+                    if (take is not None and written >= take) or (
+                        stop_when is not None and stop_when(progress)
+                    ):
+                        # Release the connection before finalizing the output file.
+                        if isinstance(payloads, ThreadedReader):
+                            payloads.close()
+                        response.close()
+                        break
+        except BaseException:
+            if partial_output == "delete":
+                writer.discard()
+            raise
+        finally:
+            if isinstance(payloads, ThreadedReader):
+                payloads.close()
+            response.close()
+            if progress_bar is not None:
+                progress_bar.close()
 
-            
         return SuccessResponse(
             message="Job executed successfully",
+            data=dataset,
         )
\ No newline at end of file
@@ -1,7 +1,8 @@
 import enum
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, Strict
 from datetime import datetime
-from typing import Literal
+from pathlib import Path
+from typing import Annotated, Any, Iterable, List, Literal, Union
 
 
 class JobStatus(str, enum.Enum):
@@ -10,6 +11,14 @@ class JobStatus(str, enum.Enum):
     COMPLETED = "Completed"
     FAILED = "Failed"
 
+    @property
+    def is_terminal(self) -> bool:
+        """
+        Whether a job in this status is done, successfully or not.
+        """
+
+        return self in (JobStatus.COMPLETED, JobStatus.FAILED)
+
 
 class JobResponseModel(BaseModel):
     id: str
@@ -28,4 +37,15 @@ class ListJobsResponseModel(BaseModel):
     
 JobOutputDomainType = dict[str, dict[Literal["type"], Literal["string", "integer", "float"]]]
 
-JobOutputFormats = Literal["csv"]
\ No newline at end of file
+JobOutputFormats = Literal["csv", "jsonl"]
+
+# What to do with the output file of a data generation job that fails midway.
+PartialOutputPolicy = Literal["keep", "delete"]
+
+# Examples can be given as a list, as the path of a CSV or JSON Lines file, or as any iterable.
+# Lists are matched first, so that they are validated upfront; other iterables are validated
+# lazily, as they are consumed.
+JobExamplesType = Annotated[
+    Union[Annotated[List[dict[Any, Any]], Strict()], str, Path, Iterable[dict[Any, Any]]],
+    Field(union_mode="left_to_right")
+]
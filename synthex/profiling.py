@@ -0,0 +1,274 @@
+import cProfile
+import inspect
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, List, Optional, Tuple, TypeVar
+from pydantic import BaseModel
+
+from .config import PROFILE_DIR_ENV_VAR, PROFILE_REPORT_TOP_ENTRIES
+from .forking import reset_after_fork
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The categories that the time of a profiled call is split into, with the fragments of file
+# paths (or of the names of built-in functions) that identify the code of each of them. They are
+# matched in order, so e.g. JSON decoding done by pydantic counts as validation.
+PROFILE_CATEGORIES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("validation", (
+        "pydantic", "synthex/decorators.py", "synthex/models/",
+    )),
+    ("JSON decoding", (
+        "json/", "_json",
+    )),
+    ("SSE parsing", (
+        "synthex/streaming.py",
+    )),
+    ("file writes", (
+        "synthex/writers.py", "synthex/compression.py", "csv.py", "_csv", "gzip.py", "zlib",
+        "zstandard", "method 'write' of '_io.", "method 'flush' of '_io.",
+    )),
+    # Includes the time spent waiting for other threads, e.g. the background reader of a
+    # pipelined stream, or a slot of a concurrency limiter.
+    ("network wait", (
+        "socket", "ssl", "http/client.py", "urllib3", "requests/", "httpx", "httpcore", "h2/",
+        "selectors.py", "select", "synthex/transports.py", "synthex/api_client.py",
+        "_thread.lock", "threading.py", "queue.py",
+    )),
+]
+
+
+def categorize(function: Tuple[str, int, str]) -> str:
+    """
+    Find the category of a function of a profile.
+    Args:
+        function (Tuple[str, int, str]): The file name, line number and name of the function, as
+            keyed in `pstats.Stats`.
+    Returns:
+        str: The name of the category, or "other".
+    """
+
+    file_name, _, name = function
+    location = (name if file_name == "~" else file_name).replace(os.sep, "/")
+    for category, fragments in PROFILE_CATEGORIES:
+        if any(fragment in location for fragment in fragments):
+            return category
+    return "other"
+
+
+class ProfileReport(BaseModel):
+    """
+    The outcome of a profiled call.
+    Attributes:
+        name (str): The name of the profiled call.
+        wall_time (float): The duration of the call, in seconds.
+        categories (dict[str, float]): The time spent in each category of code, in seconds. See
+            `PROFILE_CATEGORIES`.
+        peak_memory (int): The peak size of the memory blocks traced during the call, in bytes.
+        report_path (str): The path of the human-readable report.
+        stats_path (str): The path of the raw profile, which can be loaded with `pstats` or
+            visualization tools such as snakeviz.
+    """
+
+    name: str
+    wall_time: float
+    categories: dict[str, float]
+    peak_memory: int
+    report_path: str
+    stats_path: str
+
+
+class Profiler:
+    """
+    Profiles calls with cProfile and tracemalloc, and writes a report for each of them to a
+    directory. The report splits the time of the call between network wait, SSE parsing, JSON
+    decoding, validation and file writes, and lists the functions that took the most time and
+    the lines that allocated the most memory.
+    Only one call is profiled at a time: calls made while another one is being profiled (by the
+    profiled call itself, or by other threads) run normally. cProfile only observes the thread
+    that makes the profiled call. Pickling a profiler only preserves its output directory, and a
+    forked child process does not inherit the call its parent was profiling.
+    Args:
+        output_dir (str): The directory the reports are written to.
+    Attributes:
+        last_report (Optional[ProfileReport]): The report of the last profiled call.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.last_report: Optional[ProfileReport] = None
+        self._reset()
+        reset_after_fork(self)
+
+    def _reset(self) -> None:
+        """
+        Forget the call being profiled, if any, and recreate the lock.
+        """
+
+        self._lock = threading.Lock()
+        self._busy = False
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """
+        Profile the code run within the context, unless another call is already being profiled.
+        Args:
+            name (str): The name of the call, used in the report and its file name.
+        """
+
+        with self._lock:
+            if self._busy:
+                owner = False
+            else:
+                owner = self._busy = True
+        if not owner:
+            yield
+            return
+
+        try:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler, outside of the client, is active.
+                yield
+                return
+            traced = tracemalloc.is_tracing()
+            if not traced:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            started_at = time.perf_counter()
+            try:
+                yield
+            finally:
+                profile.disable()
+                wall_time = time.perf_counter() - started_at
+                after = tracemalloc.take_snapshot()
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                if not traced:
+                    tracemalloc.stop()
+                self.last_report = self._write(
+                    name, profile, wall_time, before, after, peak_memory
+                )
+        finally:
+            with self._lock:
+                self._busy = False
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"output_dir": self.output_dir}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["output_dir"])  # type: ignore[misc]
+
+    def _write(
+        self, name: str, profile: cProfile.Profile, wall_time: float,
+        before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, peak_memory: int
+    ) -> ProfileReport:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir,
+            f"{name.replace('.', '-')}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        )
+        profile.dump_stats(f"{base}.prof")
+
+        listing = io.StringIO()
+        stats = pstats.Stats(profile, stream=listing)
+        categories = {category: 0.0 for category, _ in PROFILE_CATEGORIES}
+        categories["other"] = 0.0
+        for function, (_, _, self_time, _, _) in stats.stats.items():  # type: ignore[attr-defined]
+            categories[categorize(function)] += self_time
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_TOP_ENTRIES)
+
+        filters = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        allocations = after.filter_traces(filters).compare_to(
+            before.filter_traces(filters), "lineno"
+        )[:PROFILE_REPORT_TOP_ENTRIES]
+
+        profiled_time = sum(categories.values()) or 1.0
+        lines = [
+            f"Profile of {name}",
+            f"Wall time: {wall_time:.3f}s",
+            f"Peak traced memory: {peak_memory / 1024 ** 2:.1f} MiB",
+            "",
+            "Time by category (excluding time spent in called functions of other categories):",
+        ]
+        lines += [
+            f"  {category:<14} {seconds:9.3f}s {100 * seconds / profiled_time:6.1f}%"
+            for category, seconds in sorted(categories.items(), key=lambda item: -item[1])
+        ]
+        lines += ["", "Allocations (net size change, by line):"]
+        lines += [f"  {statistic}" for statistic in allocations]
+        lines += ["", "Functions by cumulative time:", listing.getvalue()]
+        with open(f"{base}.txt", mode="w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+        return ProfileReport(
+            name=name, wall_time=wall_time, categories=categories, peak_memory=peak_memory,
+            report_path=f"{base}.txt", stats_path=f"{base}.prof"
+        )
+
+
+_profiler: Optional[Profiler] = None
+_profiler_resolved = False
+
+
+def get_profiler() -> Optional[Profiler]:
+    """
+    Get the profiler configured through the environment: on first use, a profiler is created if
+    the `SYNTHEX_PROFILE_DIR` environment variable is set, with the directory it holds. Clients
+    created without a `profile_dir` use it.
+    Returns:
+        Optional[Profiler]: The profiler, or None if the variable is not set.
+    """
+
+    global _profiler, _profiler_resolved
+    if not _profiler_resolved:
+        _profiler_resolved = True
+        output_dir = os.environ.get(PROFILE_DIR_ENV_VAR)
+        if output_dir:
+            _profiler = Profiler(output_dir)
+    return _profiler
+
+
+def profiler_of(instance: Any) -> Optional[Profiler]:
+    """
+    Find the profiler of the object a method is called on: its own `profiler`, or that of its
+    `_client`, for the API classes.
+    Args:
+        instance (Any): The object.
+    Returns:
+        Optional[Profiler]: The profiler, or None if its calls are not profiled.
+    """
+
+    profiler = getattr(instance, "profiler", None)
+    if profiler is None:
+        profiler = getattr(getattr(instance, "_client", None), "profiler", None)
+    return profiler
+
+
+def profiled(method: F) -> F:
+    """
+    Decorate a method so that its calls are profiled by the profiler of the object it is called
+    on (see `profiler_of`). When that object has none, the overhead is a single function call.
+    Generator functions are returned undecorated: only the creation of the generator, not its
+    iteration, would be profiled.
+    """
+
+    if inspect.isgeneratorfunction(inspect.unwrap(method)):
+        return method
+
+    @wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        profiler = profiler_of(self)
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        with profiler.profile(method.__qualname__):
+            return method(self, *args, **kwargs)
+    return wrapper  # type: ignore[return-value]
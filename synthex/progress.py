@@ -0,0 +1,148 @@
+import sys
+import time
+from collections import deque
+from typing import Callable, Optional, TextIO
+from pydantic import BaseModel
+
+from .config import PROGRESS_RATE_WINDOW_SECONDS
+
+
+class GenerationProgress(BaseModel):
+    """
+    A snapshot of the state of a running `generate_data` stream.
+    Attributes:
+        rows_received (int): The number of rows received so far.
+        rows_expected (int): The number of rows requested through `number_of_samples`.
+        bytes_received (int): The number of payload bytes received so far.
+        events_received (int): The number of SSE events received so far.
+        elapsed (float): Seconds elapsed since the stream was opened.
+        rows_per_second (float): Throughput computed over a rolling time window.
+        eta (Optional[float]): Estimated seconds until completion, or None if it cannot be
+            estimated yet.
+    """
+
+    rows_received: int
+    rows_expected: int
+    bytes_received: int
+    events_received: int
+    elapsed: float
+    rows_per_second: float
+    eta: Optional[float] = None
+
+    @property
+    def fraction(self) -> float:
+        """
+        The fraction of the expected rows received so far, between 0 and 1.
+        """
+
+        if self.rows_expected <= 0:
+            return 1.0
+        return min(self.rows_received / self.rows_expected, 1.0)
+
+
+ProgressCallback = Callable[[GenerationProgress], None]
+
+
+class ProgressTracker:
+    """
+    Accumulates throughput statistics for a data generation stream and notifies a callback
+    after every SSE event.
+    Args:
+        rows_expected (int): The number of rows the stream is expected to produce.
+        callback (Optional[ProgressCallback]): The function to call with each new
+            `GenerationProgress` snapshot.
+        window (float): The length, in seconds, of the window used to compute the rolling
+            rows/sec rate.
+    """
+
+    def __init__(
+        self, rows_expected: int, callback: Optional[ProgressCallback] = None,
+        window: float = PROGRESS_RATE_WINDOW_SECONDS
+    ):
+        self.rows_expected = rows_expected
+        self.callback = callback
+        self.window = window
+        self.rows_received = 0
+        self.bytes_received = 0
+        self.events_received = 0
+        self._started_at = time.monotonic()
+        # (timestamp, cumulative rows) samples used for the rolling rate.
+        self._samples: deque[tuple[float, int]] = deque([(self._started_at, 0)])
+
+    def update(self, rows: int, num_bytes: int) -> GenerationProgress:
+        """
+        Record a newly received event and notify the callback.
+        Args:
+            rows (int): The number of rows contained in the event.
+            num_bytes (int): The size of the event payload, in bytes.
+        Returns:
+            GenerationProgress: The updated progress snapshot.
+        """
+
+        now = time.monotonic()
+        self.rows_received += rows
+        self.bytes_received += num_bytes
+        self.events_received += 1
+
+        self._samples.append((now, self.rows_received))
+        # Drop samples that fell out of the window, but always keep one as the rate baseline.
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+
+        oldest_time, oldest_rows = self._samples[0]
+        span = now - oldest_time
+        rate = (self.rows_received - oldest_rows) / span if span > 0 else 0.0
+
+        remaining = max(self.rows_expected - self.rows_received, 0)
+        eta: Optional[float] = None
+        if remaining == 0:
+            eta = 0.0
+        elif rate > 0:
+            eta = remaining / rate
+
+        progress = GenerationProgress(
+            rows_received=self.rows_received,
+            rows_expected=self.rows_expected,
+            bytes_received=self.bytes_received,
+            events_received=self.events_received,
+            elapsed=now - self._started_at,
+            rows_per_second=rate,
+            eta=eta
+        )
+        if self.callback is not None:
+            self.callback(progress)
+        return progress
+
+
+class TerminalProgressBar:
+    """
+    A minimal progress bar that renders `GenerationProgress` snapshots on a terminal. Instances
+    are callables, so they can be passed directly as the `on_progress` argument of
+    `generate_data`.
+    Args:
+        stream (TextIO): The stream to render the bar on. Defaults to `sys.stderr`.
+        width (int): The width of the bar, in characters.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, width: int = 30):
+        self.stream = stream if stream is not None else sys.stderr
+        self.width = width
+
+    def __call__(self, progress: GenerationProgress) -> None:
+        filled = int(self.width * progress.fraction)
+        bar = "#" * filled + "-" * (self.width - filled)
+        eta = f"{progress.eta:.0f}s" if progress.eta is not None else "?"
+        self.stream.write(
+            f"\r[{bar}] {progress.rows_received}/{progress.rows_expected} rows "
+            f"| {progress.bytes_received / 1024:.1f} KiB | {progress.rows_per_second:.1f} rows/s "
+            f"| elapsed {progress.elapsed:.0f}s | eta {eta}"
+        )
+        self.stream.flush()
+
+    def close(self) -> None:
+        """
+        Terminate the progress bar line.
+        """
+
+        self.stream.write("\n")
+        self.stream.flush()
@@ -0,0 +1,288 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Iterable, Iterator, List, Mapping, Optional
+from pydantic import BaseModel
+
+from .exceptions import ConfigurationError
+from .forking import reset_after_fork
+from .transports import Response, Transport
+
+
+class RecordedExchange(BaseModel):
+    """
+    A request/response pair captured by a `RecordingTransport`.
+    Attributes:
+        key (str): The key identifying the request. See `request_key`.
+        method (str): The HTTP method of the request.
+        url (str): The URL of the request.
+        status_code (int): The status code of the response.
+        headers (dict[str, str]): The headers of the response.
+        lines (List[str]): The lines of the response body, decoded as latin-1 so that any byte
+            sequence survives the round trip.
+        offsets (List[float]): For each line, the seconds elapsed between the request and the
+            moment the line was received.
+    """
+
+    key: str
+    method: str
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    lines: List[str]
+    offsets: List[float]
+
+
+def request_key(
+    method: str, url: str, params: Optional[dict[str, Any]] = None, json_body: Optional[Any] = None,
+    content_digest: Optional[str] = None
+) -> str:
+    """
+    Compute the key used to match a replayed request with a recorded one. Request bodies are
+    hashed, so that large bodies do not bloat the recording.
+    Args:
+        method (str): The HTTP method of the request.
+        url (str): The URL of the request.
+        params (Optional[dict[str, Any]]): The query parameters of the request.
+        json_body (Optional[Any]): The JSON body of the request.
+        content_digest (Optional[str]): The SHA-256 hex digest of a streamed request body. Takes
+            precedence over `json_body`.
+    Returns:
+        str: The request key.
+    """
+
+    if content_digest is None:
+        body = json.dumps(json_body, sort_keys=True, default=str).encode("utf-8")
+        content_digest = hashlib.sha256(body).hexdigest()
+    query = json.dumps(sorted((params or {}).items()), default=str)
+    return f"{method} {url} {query} {content_digest}"
+
+
+def _hashed(content: Iterable[bytes], digest: Any) -> Iterator[bytes]:
+    """
+    Pass the chunks of a streamed request body through, feeding them to a hash as they go.
+    """
+
+    for chunk in content:
+        digest.update(chunk)
+        yield chunk
+
+
+class _RecordingResponse:
+    """
+    Wraps a response, capturing its body and the timing of each line as it is consumed. The
+    exchange is saved once the body has been fully read, or the response is closed.
+    """
+
+    def __init__(
+        self, response: Response, transport: "RecordingTransport", key: str, method: str,
+        started_at: float
+    ):
+        self._response = response
+        self._transport = transport
+        self._key = key
+        self._method = method
+        self._started_at = started_at
+        self._lines: List[bytes] = []
+        self._offsets: List[float] = []
+        self._saved = False
+        self.status_code = response.status_code
+        self.url = response.url
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._response.headers
+
+    @property
+    def content(self) -> bytes:
+        content = self._response.content
+        if not self._lines:
+            self._lines = content.split(b"\n")
+            self._offsets = [time.monotonic() - self._started_at] * len(self._lines)
+        self._save()
+        return content
+
+    @property
+    def text(self) -> str:
+        self.content
+        return self._response.text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        for line in self._response.iter_lines():
+            self._lines.append(line)
+            self._offsets.append(time.monotonic() - self._started_at)
+            yield line
+        self._save()
+
+    def close(self) -> None:
+        self._save()
+        self._response.close()
+
+    def _save(self) -> None:
+        if self._saved:
+            return
+        self._saved = True
+        self._transport._write(RecordedExchange(
+            key=self._key, method=self._method, url=self.url, status_code=self.status_code,
+            headers=dict(self._response.headers),
+            lines=[line.decode("latin-1") for line in self._lines], offsets=self._offsets
+        ))
+
+
+class RecordingTransport(Transport):
+    """
+    Wraps another transport and records every request/response pair, including the timing of
+    each line of streamed responses, into a gzip-compressed JSON Lines file that a
+    `ReplayTransport` can serve later without any network access. Request headers, and therefore
+    API keys, are never recorded.
+    Args:
+        inner (Transport): The transport that actually sends the requests.
+        path (str): The path of the recording file. New exchanges are appended to it.
+    """
+
+    def __init__(self, inner: Transport, path: str):
+        self.inner = inner
+        self.path = path
+        self._reset()
+        reset_after_fork(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+
+    def _write(self, exchange: RecordedExchange) -> None:
+        line = exchange.model_dump_json().encode("utf-8") + b"\n"
+        with self._lock:
+            with gzip.open(self.path, mode="ab") as f:
+                f.write(line)
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        digest = None
+        if content is not None:
+            digest = hashlib.sha256()
+            content = _hashed(content, digest)
+        started_at = time.monotonic()
+        response = self.inner.request(
+            method, url, params=params, json=json, headers=headers, stream=stream,
+            content=content, timeout=timeout
+        )
+        if content is not None:
+            # The body is normally fully sent by now; hash whatever the inner transport left.
+            for _ in content:
+                pass
+        key = request_key(
+            method, url, params, json, digest.hexdigest() if digest is not None else None
+        )
+        recording = _RecordingResponse(response, self, key, method, started_at)
+        if not stream:
+            # Non-streamed bodies are read eagerly, so they are recorded right away.
+            recording.content
+        return recording
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"inner": self.inner, "path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["inner"], state["path"])  # type: ignore[misc]
+
+
+class _ReplayResponse:
+    """
+    Serves a recorded exchange as a response.
+    """
+
+    def __init__(self, exchange: RecordedExchange, realtime: bool, speed: float):
+        self._exchange = exchange
+        self._realtime = realtime
+        self._speed = speed
+        self.status_code = exchange.status_code
+        self.url = exchange.url
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._exchange.headers
+
+    @property
+    def content(self) -> bytes:
+        return b"\n".join(line.encode("latin-1") for line in self._exchange.lines)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        started_at = time.monotonic()
+        for line, offset in zip(self._exchange.lines, self._exchange.offsets):
+            if self._realtime:
+                delay = offset / self._speed - (time.monotonic() - started_at)
+                if delay > 0:
+                    time.sleep(delay)
+            yield line.encode("latin-1")
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayTransport(Transport):
+    """
+    Serves the exchanges captured by a `RecordingTransport`, without any network access.
+    Requests are matched with recorded exchanges by method, URL, query parameters and body;
+    identical requests are served the matching exchanges in the order they were recorded, and
+    the last one is repeated once they are exhausted.
+    Args:
+        path (str): The path of the recording file.
+        realtime (bool): Whether to reproduce the recorded timing of streamed lines. If False,
+            exchanges are served at full speed.
+        speed (float): When `realtime` is True, a factor by which the recorded timing is sped up.
+    """
+
+    def __init__(self, path: str, realtime: bool = False, speed: float = 1.0):
+        self.path = path
+        self.realtime = realtime
+        self.speed = speed
+        self._reset()
+        reset_after_fork(self)
+        self._exchanges: dict[str, deque[RecordedExchange]] = defaultdict(deque)
+        with gzip.open(path, mode="rb") as f:
+            for line in f:
+                exchange = RecordedExchange.model_validate_json(line)
+                self._exchanges[exchange.key].append(exchange)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        content_digest = None
+        if content is not None:
+            digest = hashlib.sha256()
+            for chunk in content:
+                digest.update(chunk)
+            content_digest = digest.hexdigest()
+        key = request_key(method, url, params, json, content_digest)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise ConfigurationError(f"No recorded exchange matches the request {method} {url}")
+            exchange = exchanges.popleft() if len(exchanges) > 1 else exchanges[0]
+        return _ReplayResponse(exchange, self.realtime, self.speed)
@@ -0,0 +1,130 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from .config import REQUEST_BODY_CHUNK_SIZE
+from .exceptions import ValidationError
+
+
+ExamplesSource = Union[str, Path, Iterable[dict[Any, Any]]]
+
+# The conversions applied to the values read from CSV files, by schema type. Values of other
+# types are kept as strings.
+_CSV_CONVERTERS: dict[str, Callable[[str], Any]] = {"integer": int, "float": float}
+
+
+def iter_examples(
+    source: ExamplesSource, schema_definition: Optional[dict[str, Any]] = None
+) -> Iterator[dict[Any, Any]]:
+    """
+    Iterate over the examples of a data generation job, without loading them all in memory.
+    Args:
+        source (ExamplesSource): Either an iterable of examples, or the path of a CSV file (with
+            a header row) or a JSON Lines file (".jsonl" or ".ndjson", one object per line).
+        schema_definition (Optional[dict[str, Any]]): The schema definition of the job. CSV
+            files only hold strings: the values of its "integer" and "float" columns are
+            converted to numbers, and empty ones to None, so that examples read from a file are
+            sent as they would be from a list.
+    Returns:
+        Iterator[dict[Any, Any]]: An iterator over the examples. Files are opened lazily, and
+            closed once the iterator is exhausted.
+    Raises:
+        ValidationError: If the path does not exist or has an unsupported extension, or if a
+            value of a CSV file is not a valid number for its column.
+    """
+
+    if not isinstance(source, (str, Path)):
+        return iter(source)
+
+    path = os.fspath(source)
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".csv", ".jsonl", ".ndjson"):
+        raise ValidationError(
+            f"Unsupported examples file '{path}': expected a .csv, .jsonl or .ndjson file."
+        )
+    if not os.path.isfile(path):
+        raise ValidationError(f"Examples file '{path}' does not exist.")
+    if extension == ".csv":
+        return _read_csv(path, schema_definition or {})
+    return _read_jsonl(path)
+
+
+def _read_csv(path: str, schema_definition: dict[str, Any]) -> Iterator[dict[Any, Any]]:
+    converters = {
+        name: (definition["type"], _CSV_CONVERTERS[definition["type"]])
+        for name, definition in schema_definition.items()
+        if isinstance(definition, dict) and definition.get("type") in _CSV_CONVERTERS
+    }
+    with open(path, mode="r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for example in reader:
+            for name, (type_name, convert) in converters.items():
+                value = example.get(name)
+                if not isinstance(value, str):
+                    # The column is missing, which the schema check of the caller reports.
+                    continue
+                try:
+                    example[name] = convert(value) if value else None
+                except ValueError:
+                    raise ValidationError(
+                        f"Line {reader.line_num} of '{path}': {value!r} is not a valid "
+                        f"{type_name} for column '{name}'."
+                    ) from None
+            yield example
+
+
+def _read_jsonl(path: str) -> Iterator[dict[Any, Any]]:
+    with open(path, mode="rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            example = json.loads(line)
+            if not isinstance(example, dict):
+                raise ValidationError(f"Line {line_number} of '{path}' is not a JSON object.")
+            yield example
+
+
+def encode_job_body(
+    schema_definition: dict[str, Any], examples: Iterable[dict[Any, Any]], requirements: List[str],
+    number_of_samples: int, chunk_size: int = REQUEST_BODY_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode the JSON body of a data generation request incrementally, so that it can be streamed
+    with chunked transfer encoding. Only one chunk is held in memory at a time, however many
+    examples there are. Each example is checked against the schema definition as it is encoded.
+    The encoded body is identical to `json.dumps` of the equivalent dictionary.
+    Args:
+        schema_definition (dict[str, Any]): The schema definition of the job.
+        examples (Iterable[dict[Any, Any]]): The examples of the job.
+        requirements (List[str]): The requirements of the job.
+        number_of_samples (int): The number of data samples to generate.
+        chunk_size (int): The approximate size, in bytes, of the yielded chunks.
+    Returns:
+        Iterator[bytes]: The chunks of the encoded body.
+    Raises:
+        ValidationError: If an example's keys do not match the schema definition's keys.
+    """
+
+    schema_keys = set(schema_definition.keys())
+    buffer = bytearray(b'{"output_schema": ')
+    buffer += json.dumps(schema_definition).encode("utf-8")
+    buffer += b', "examples": ['
+    for index, example in enumerate(examples):
+        if not isinstance(example, dict) or set(example.keys()) != schema_keys:
+            raise ValidationError(
+                f"Example {index} keys do not match schema definition keys."
+            )
+        if index:
+            buffer += b", "
+        buffer += json.dumps(example).encode("utf-8")
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b'], "requirements": '
+    buffer += json.dumps(requirements).encode("utf-8")
+    buffer += b', "datapoint_num": '
+    buffer += json.dumps(number_of_samples).encode("utf-8")
+    buffer += b"}"
+    yield bytes(buffer)
@@ -0,0 +1,139 @@
+import bisect
+import heapq
+import math
+import random
+from typing import Any, Hashable, List, Optional
+
+from .exceptions import ValidationError
+from .models import JobOutputDomainType
+from .request_body import ExamplesSource, iter_examples
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None
+
+
+def _quantile_cuts(values: List[float], bins: int) -> List[float]:
+    ordered = sorted(values)
+    return [ordered[len(ordered) * i // bins] for i in range(1, bins)]
+
+
+def _features(
+    examples: List[dict[Any, Any]], schema_definition: JobOutputDomainType, k: int
+) -> tuple[List[set[Hashable]], dict[Hashable, int]]:
+    """
+    Describe every example with the set of features it covers, and weigh the features so that
+    every column is worth the same, whatever its number of features: a rare category is then
+    worth as much as any other value of its column. The features are:
+    - for numeric ("integer" and "float") columns, which of k / 2 quantile bins its value falls
+        into, and whether it is the column's minimum or maximum, so that covering every feature
+        means covering the whole spread of the column, outliers included;
+    - for "string" columns, its value, unless the column has more than k distinct values (e.g.
+        free text), in which case the bin of the value's length is used instead.
+    """
+
+    features: List[set[Hashable]] = [set() for _ in examples]
+    columns: dict[str, set[Hashable]] = {}
+    for column, definition in schema_definition.items():
+        values = [example.get(column) for example in examples]
+        if definition["type"] == "string" and len(set(map(str, values))) <= k:
+            for example_features, value in zip(features, values):
+                example_features.add((column, str(value)))
+            continue
+
+        if definition["type"] == "string":
+            numbers: List[Optional[float]] = [float(len(str(value))) for value in values]
+        else:
+            numbers = [_to_float(value) for value in values]
+        present = [number for number in numbers if number is not None]
+        if not present:
+            continue
+        low, high = min(present), max(present)
+        cuts = _quantile_cuts(present, max(k // 2, 1))
+        for example_features, number in zip(features, numbers):
+            if number is None:
+                example_features.add((column, None))
+                continue
+            example_features.add((column, bisect.bisect_right(cuts, number)))
+            if number == low:
+                example_features.add((column, "min"))
+            if number == high:
+                example_features.add((column, "max"))
+
+    for example_features in features:
+        for feature in example_features:
+            columns.setdefault(feature[0], set()).add(feature)  # type: ignore[index]
+    # Integer weights keep the gains exact, so that stale gains compare reliably.
+    scale = math.lcm(*(len(column_features) for column_features in columns.values()))
+    weights = {
+        feature: scale // len(column_features)
+        for column_features in columns.values() for feature in column_features
+    }
+    return features, weights
+
+
+def select_examples(
+    examples: ExamplesSource, schema_definition: JobOutputDomainType, k: int, seed: int = 0
+) -> List[dict[Any, Any]]:
+    """
+    Pick a small, representative subset of a large set of examples, to be passed to
+    `Jobs.generate_data()` instead of the whole set. Examples are chosen greedily so as to cover
+    as many distinct values of the categorical columns, and as much of the spread of the numeric
+    columns (according to the types of `schema_definition`), as possible, every column being
+    worth the same. Lazy evaluation of the
+    greedy gains keeps the selection near-linear (O(n log n)) in the number of examples.
+    Ties are broken randomly, so different seeds give different, equally representative subsets,
+    while the same seed always gives the same subset.
+    Args:
+        examples (ExamplesSource): The examples to pick from: a list, the path of a CSV or JSON
+            Lines file, or any iterable of dictionaries.
+        schema_definition (JobOutputDomainType): The schema definition of the job.
+        k (int): The number of examples to pick.
+        seed (int): The seed of the random tie-breaking.
+    Returns:
+        List[dict[Any, Any]]: At most k examples, in their original order.
+    Raises:
+        ValidationError: If k is not positive.
+    """
+
+    if k <= 0:
+        raise ValidationError("The number of examples to pick must be positive.")
+    pool = list(iter_examples(examples, schema_definition))
+    if len(pool) <= k:
+        return pool
+
+    features, weights = _features(pool, schema_definition, k)
+
+    def gain_of(index: int) -> int:
+        return sum(weights[feature] for feature in features[index] - covered)
+
+    rng = random.Random(seed)
+    tiebreaks = list(range(len(pool)))
+    rng.shuffle(tiebreaks)
+
+    # Coverage is submodular: the gain of an example can only shrink as others are picked, so
+    # stale gains are upper bounds and only the top of the heap needs to be re-evaluated.
+    covered: set[Hashable] = set()
+    heap = [(-gain_of(i), tiebreaks[i], i) for i in range(len(pool))]
+    heapq.heapify(heap)
+    selected: List[int] = []
+    while heap and len(selected) < k:
+        negative_gain, tiebreak, index = heapq.heappop(heap)
+        gain = gain_of(index)
+        if gain < -negative_gain:
+            heapq.heappush(heap, (-gain, tiebreak, index))
+            continue
+        if gain == 0:
+            # Everything left is redundant: fill up the budget in random order.
+            remaining = [index] + [entry[2] for entry in heap]
+            remaining.sort(key=lambda i: tiebreaks[i])
+            selected.extend(remaining[:k - len(selected)])
+            break
+        selected.append(index)
+        covered |= features[index]
+
+    return [pool[i] for i in sorted(selected)]
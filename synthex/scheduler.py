@@ -0,0 +1,211 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional
+from pydantic import BaseModel
+
+from .config import SCHEDULER_BALANCE_REFRESH_SECONDS
+from .exceptions import InsufficientCreditsError, ValidationError
+
+if TYPE_CHECKING:
+    from . import Synthex
+
+
+class ScheduledJobResult(BaseModel):
+    """
+    The outcome of a job submitted through a `CreditScheduler`.
+    Attributes:
+        index (int): The position of the job in the submitted plan.
+        admitted (bool): Whether the job was admitted by the budget guard.
+        cost (float): The estimated cost of the job, in credits.
+        error (Optional[str]): The error raised by the job, if any.
+    """
+
+    index: int
+    admitted: bool
+    cost: float
+    error: Optional[str] = None
+
+
+class CreditScheduler:
+    """
+    Admits data generation jobs only while the credits balance can cover them, so that a large run
+    stops submitting new jobs before it runs out of credits halfway through.
+    The balance is retrieved from `CreditsAPI` and refreshed periodically, rather than before every
+    job. The cost of running jobs is always subtracted from it, as is the cost of the jobs that
+    completed since the last refresh.
+    Args:
+        synthex (Synthex): The client used to retrieve the balance and run the jobs.
+        cost_per_sample (float): The cost, in credits, of a single generated datapoint.
+        budget (Optional[float]): An optional cap on the credits the scheduler may spend, on top
+            of the balance of the account.
+        reserve (float): Credits that must remain untouched. Defaults to 0.
+        refresh_interval (float): Seconds after which the balance is retrieved again.
+    """
+
+    def __init__(
+        self, synthex: "Synthex", cost_per_sample: float, budget: Optional[float] = None,
+        reserve: float = 0.0, refresh_interval: float = SCHEDULER_BALANCE_REFRESH_SECONDS
+    ):
+        self._synthex = synthex
+        self.cost_per_sample = cost_per_sample
+        self.budget = budget
+        self.reserve = reserve
+        self.refresh_interval = refresh_interval
+        self.spent = 0.0
+        self._balance: Optional[float] = None
+        self._refreshed_at = float("-inf")
+        self._spent_since_refresh = 0.0
+        self._in_flight = 0.0
+        self._lock = threading.Lock()
+
+    def estimate_cost(self, jobs: Iterable[dict[str, Any]]) -> float:
+        """
+        Estimate the cost of a set of jobs.
+        Args:
+            jobs (Iterable[dict[str, Any]]): The keyword arguments of each `generate_data` call.
+        Returns:
+            float: The estimated cost, in credits.
+        Raises:
+            ValidationError: If a job has no `number_of_samples`, or one that is not a number.
+        """
+
+        cost = 0.0
+        for job in jobs:
+            number_of_samples: Any = job.get("number_of_samples")
+            try:
+                cost += self.cost_per_sample * float(number_of_samples)
+            except (TypeError, ValueError) as e:
+                raise ValidationError(
+                    f"The number_of_samples of a job must be a number, not {number_of_samples!r}"
+                ) from e
+        return cost
+
+    def available(self) -> float:
+        """
+        Compute the credits that can still be spent, refreshing the balance if it is stale.
+        Returns:
+            float: The credits available to new jobs.
+        """
+
+        with self._lock:
+            return self._available()
+
+    def _available(self) -> float:
+        now = time.monotonic()
+        if self._balance is None or now - self._refreshed_at >= self.refresh_interval:
+            self._balance = float(self._synthex.credits.promotional().amount)
+            self._refreshed_at = now
+            self._spent_since_refresh = 0.0
+
+        available = self._balance - self._spent_since_refresh - self._in_flight - self.reserve
+        if self.budget is not None:
+            available = min(available, self.budget - self.spent)
+        return available
+
+    def check(self, jobs: Iterable[dict[str, Any]]) -> float:
+        """
+        Check that the balance covers a planned set of jobs.
+        Args:
+            jobs (Iterable[dict[str, Any]]): The keyword arguments of each `generate_data` call.
+        Returns:
+            float: The estimated cost of the jobs, in credits.
+        Raises:
+            InsufficientCreditsError: If the estimated cost exceeds the available credits.
+            ValidationError: If the cost of a job cannot be estimated.
+        """
+
+        cost = self.estimate_cost(jobs)
+        available = self.available()
+        if cost > available:
+            raise InsufficientCreditsError(
+                f"The planned jobs need an estimated {cost:g} credits, but only {available:g} "
+                "are available"
+            )
+        return cost
+
+    def admit(self, cost: float) -> bool:
+        """
+        Admit a job if the available credits cover its cost, and charge it against them. Call
+        `complete` once the job is over.
+        Args:
+            cost (float): The estimated cost of the job, in credits.
+        Returns:
+            bool: True if the job was admitted, False otherwise.
+        """
+
+        with self._lock:
+            if cost > self._available():
+                return False
+            self.spent += cost
+            self._in_flight += cost
+            return True
+
+    def complete(self, cost: float) -> None:
+        """
+        Mark an admitted job as over.
+        Args:
+            cost (float): The estimated cost the job was admitted with, in credits.
+        """
+
+        with self._lock:
+            self._in_flight -= cost
+            self._spent_since_refresh += cost
+
+    def _collect(
+        self, running: dict["Future[Any]", tuple[ScheduledJobResult, float]],
+        done: Iterable["Future[Any]"]
+    ) -> None:
+        """
+        Mark finished jobs as complete, and record their errors.
+        """
+
+        for future in done:
+            result, cost = running.pop(future)
+            self.complete(cost)
+            error = future.exception()
+            if error is not None:
+                result.error = str(error)
+
+    def run(
+        self, jobs: Iterable[dict[str, Any]], max_workers: int = 1, strict: bool = False
+    ) -> List[ScheduledJobResult]:
+        """
+        Run a set of `generate_data` jobs, admitting each of them only while the budget holds.
+        Jobs are admitted one at a time, as workers free up, so that each admission is checked
+        against the balance as it stands then. Once a job is refused, no further jobs are
+        submitted.
+        Args:
+            jobs (Iterable[dict[str, Any]]): The keyword arguments of each `generate_data` call.
+            max_workers (int): The number of jobs to run concurrently. Defaults to 1.
+            strict (bool): Whether to check that the whole plan is affordable before submitting
+                any job. Defaults to False.
+        Returns:
+            List[ScheduledJobResult]: The outcome of each job, in the order of the plan.
+        Raises:
+            InsufficientCreditsError: If `strict` is True and the plan is not affordable.
+            ValidationError: If the cost of a job cannot be estimated, before any job is submitted.
+        """
+
+        jobs = list(jobs)
+        costs = [self.estimate_cost([job]) for job in jobs]
+        if strict:
+            self.check(jobs)
+
+        results: List[ScheduledJobResult] = []
+        running: dict[Future[Any], tuple[ScheduledJobResult, float]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            exhausted = False
+            for index, (job, cost) in enumerate(zip(jobs, costs)):
+                if not exhausted:
+                    if len(running) >= max_workers:
+                        self._collect(running, wait(running, return_when=FIRST_COMPLETED).done)
+                    exhausted = not self.admit(cost)
+                result = ScheduledJobResult(index=index, admitted=not exhausted, cost=cost)
+                results.append(result)
+                if result.admitted:
+                    future = executor.submit(self._synthex.jobs.generate_data, **job)
+                    running[future] = (result, cost)
+
+            self._collect(running, wait(running).done)
+        return results
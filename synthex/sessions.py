@@ -0,0 +1,136 @@
+import os
+import threading
+import weakref
+from typing import Any, Set
+import requests
+
+
+class _ThreadSession:
+    """
+    Holds the session of a thread, in thread-local storage: it is garbage collected once the
+    thread exits, which closes the session.
+    """
+
+    __slots__ = ("session", "__weakref__")
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+
+def _close_thread_session(
+    lock: threading.Lock, sessions: Set[requests.Session], session: requests.Session, pid: int
+) -> None:
+    """
+    Forget and close the session of a thread that exited. Sessions inherited by a forked child
+    are left open, since their connections are still used by the parent.
+    Args:
+        lock (threading.Lock): The lock guarding `sessions`.
+        sessions (Set[requests.Session]): The sessions of the manager that created `session`.
+        session (requests.Session): The session to close.
+        pid (int): The process that created `session`.
+    """
+
+    if os.getpid() != pid:
+        return
+    with lock:
+        sessions.discard(session)
+    session.close()
+
+
+class SessionManager:
+    """
+    Hands out the `requests.Session` used by an `APIClient`. `requests.Session` is not documented
+    as safe to share across threads, so in thread-safe mode every thread gets its own session
+    (and therefore its own connection pool), created on first use from the shared configuration.
+    Threads never contend for a session, so throughput scales with the number of threads. The
+    session of a thread is closed once the thread exits, so that short-lived threads do not leak
+    connections.
+    Sessions are never shared across processes: when the manager is used in a forked child, the
+    sessions inherited from the parent are dropped (without closing their sockets, which are still
+    used by the parent) and new ones are created. Pickling a manager only preserves its
+    configuration.
+    Args:
+        headers (dict[str, str]): The headers sent with every request.
+        per_thread (bool): Whether to give every thread its own session. If False, a single
+            session is shared by all threads.
+    """
+
+    def __init__(self, headers: dict[str, str], per_thread: bool = False):
+        self.headers = headers
+        self.per_thread = per_thread
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Forget every session, without closing them, and recreate the synchronization primitives.
+        """
+
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: Set[requests.Session] = set()
+        self._shared = self._create() if not self.per_thread else None
+
+    def _create(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(self.headers)
+        with self._lock:
+            self._sessions.add(session)
+        return session
+
+    def get(self) -> requests.Session:
+        """
+        Get the session to use in the calling thread.
+        Returns:
+            requests.Session: The session of the calling thread, or the shared session.
+        """
+
+        if os.getpid() != self._pid:
+            # Forked: the inherited connections belong to the parent process.
+            self._reset()
+
+        if self._shared is not None:
+            return self._shared
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _ThreadSession(self._create())
+            weakref.finalize(
+                holder, _close_thread_session, self._lock, self._sessions, holder.session,
+                self._pid
+            )
+        return holder.session
+
+    @property
+    def session_count(self) -> int:
+        """
+        The number of sessions currently open.
+        """
+
+        with self._lock:
+            return len(self._sessions)
+
+    def close(self) -> None:
+        """
+        Close every session created so far, releasing their connections.
+        """
+
+        if os.getpid() != self._pid:
+            # Forked: closing the inherited sessions would tear down the parent's connections.
+            self._reset()
+            return
+
+        with self._lock:
+            sessions, self._sessions = self._sessions, set()
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+        if self._shared is not None:
+            self._shared = self._create()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"headers": self.headers, "per_thread": self.per_thread}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.headers = state["headers"]
+        self.per_thread = state["per_thread"]
+        self._reset()
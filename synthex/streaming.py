@@ -0,0 +1,311 @@
+import codecs
+import json
+import queue
+import re
+import threading
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .config import (
+    INCREMENTAL_PARSE_BATCH_ROWS, INCREMENTAL_PARSE_MIN_BYTES, INCREMENTAL_PARSE_WINDOW_BYTES,
+    PIPELINE_QUEUE_SIZE
+)
+from .deadlines import Deadline
+
+
+T = TypeVar("T")
+
+SSE_DATA_PREFIX = b"data: "
+
+# The whitespace allowed between JSON tokens.
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_DECODER = json.JSONDecoder()
+# The characters that can follow a prefix of a JSON number within the number.
+_NUMBER_CONTINUATIONS = frozenset("0123456789.eE+-")
+
+
+def iter_sse_payloads(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Strip the SSE framing from a stream of lines and yield the payload of each `data:` event.
+    Args:
+        lines (Iterable[bytes]): The raw lines of an SSE stream, e.g. `response.iter_lines()`.
+    Returns:
+        Iterator[bytes]: The payload of every `data:` event, with surrounding whitespace removed.
+    """
+
+    for line in lines:
+        if line and line.startswith(SSE_DATA_PREFIX):
+            yield line[len(SSE_DATA_PREFIX):].strip()
+
+
+class _TextWindow:
+    """
+    A window of decoded text sliding over a UTF-8 payload: bytes are decoded a slice at a time,
+    and the text before the read position is dropped whenever more is decoded.
+    """
+
+    def __init__(self, payload: bytes, size: int):
+        self._payload = memoryview(payload)
+        self._size = size
+        self._position = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.index = 0
+
+    def fill(self) -> bool:
+        """
+        Decode the next slice of the payload into the window.
+        Returns:
+            bool: False if the payload was already fully decoded.
+        """
+
+        if self._position >= len(self._payload):
+            return False
+        chunk = self._payload[self._position:self._position + self._size]
+        self._position += len(chunk)
+        final = self._position >= len(self._payload)
+        self.text = self.text[self.index:] + self._decoder.decode(chunk, final=final)
+        self.index = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace, and return the next character, or "" at the end of the payload.
+        """
+
+        while True:
+            match = _JSON_WHITESPACE.match(self.text, self.index)
+            self.index = match.end()  # type: ignore[union-attr]
+            if self.index < len(self.text):
+                return self.text[self.index]
+            if not self.fill():
+                return ""
+
+    def decode(self) -> Tuple[Any, int]:
+        """
+        Decode the JSON value at the read position, decoding more of the payload as needed.
+        Returns:
+            Tuple[Any, int]: The value, and the offset in `text` at which its source starts. The
+                window may have been refilled, so the read position before the call is stale.
+        """
+
+        while True:
+            self.peek()
+            start = self.index
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.text, self.index)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut by the end of the window decodes as a shorter one: only trust values
+            # followed by a character that cannot continue them.
+            if end == len(self.text) or self.text[end] in _NUMBER_CONTINUATIONS:
+                if self.fill():
+                    continue
+            self.index = end
+            return value, start
+
+
+def iter_json_array(
+    payload: bytes, window_size: int = INCREMENTAL_PARSE_WINDOW_BYTES, raw: bool = False
+) -> Iterator[Any]:
+    """
+    Decode the elements of a JSON array one at a time. The payload is decoded to text a window
+    at a time, so that only the payload, one window of text and the element being decoded are
+    held in memory, rather than a decoded copy of the whole payload or array.
+    Args:
+        payload (bytes): The UTF-8 encoded JSON array.
+        window_size (int): The number of bytes decoded to text at a time.
+        raw (bool): Whether to yield the source text of each element, as found in the payload,
+            instead of its decoded value.
+    Returns:
+        Iterator[Any]: The elements of the array, or their source text.
+    Raises:
+        json.JSONDecodeError: If the payload is not a valid JSON array. Elements preceding the
+            error are yielded first.
+    """
+
+    window = _TextWindow(payload, window_size)
+    if window.peek() != "[":
+        raise json.JSONDecodeError("Expecting '['", window.text, window.index)
+    window.index += 1
+    if window.peek() == "]":
+        window.index += 1
+    else:
+        while True:
+            value, start = window.decode()
+            yield window.text[start:window.index] if raw else value
+            char = window.peek()
+            if char == "]":
+                window.index += 1
+                break
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", window.text, window.index)
+            window.index += 1
+    if window.peek() != "":
+        raise json.JSONDecodeError("Extra data", window.text, window.index)
+
+
+def iter_row_batches(
+    payload: bytes, batch_size: int = INCREMENTAL_PARSE_BATCH_ROWS,
+    min_incremental_size: int = INCREMENTAL_PARSE_MIN_BYTES
+) -> Iterator[List[Any]]:
+    """
+    Decode the JSON array of rows carried by an SSE event. Small payloads are decoded at once;
+    larger ones are decoded incrementally (see `iter_json_array`), so that, on top of the
+    payload itself, only a batch of rows is held in memory rather than a decoded copy of the
+    whole event, and the first rows can be written before the last ones are decoded.
+    Args:
+        payload (bytes): The payload of the event.
+        batch_size (int): The number of rows of each batch, for incrementally decoded payloads.
+        min_incremental_size (int): The size, in bytes, from which payloads are decoded
+            incrementally.
+    Returns:
+        Iterator[List[Any]]: The rows, in batches.
+    """
+
+    if len(payload) < min_incremental_size:
+        yield json.loads(payload)
+        return
+    batch: List[Any] = []
+    for row in iter_json_array(payload):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _Failure:
+    """Wraps an exception raised by the reader thread, so it can travel through the queue."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+class ThreadedReader(Generic[T]):
+    """
+    Drains an iterable on a background thread into a bounded queue, so that a slow consumer does
+    not stall the producer (e.g. slow disk writes stalling socket reads). The bounded queue
+    provides backpressure: once it is full, the reader thread blocks until the consumer catches up.
+    Exceptions raised by the reader are re-raised in the consuming thread. If the consumer stops
+    early, or fails, the reader thread is stopped and `on_close` is invoked to release the source.
+    If a `deadline` is given, the consumer gives up waiting as soon as it expires, even if the
+    reader thread is blocked on the network, and `DeadlineExceededError` is raised; the reader
+    thread is then abandoned, and exits once its own read fails or times out.
+    Args:
+        source (Iterable[T]): The iterable to drain.
+        maxsize (int): The maximum number of items buffered between the two threads.
+        on_close (Optional[Callable[[], None]]): A function called once the pipeline is closed,
+            typically to close the underlying HTTP response.
+        deadline (Optional[Deadline]): The time budget of the consumer. Every item received
+            resets its idle timer.
+    """
+
+    # How often, in seconds, a blocked reader checks whether the consumer has gone away.
+    _POLL_INTERVAL = 0.1
+    # How long, in seconds, to wait for the reader thread to exit when the pipeline is closed.
+    _JOIN_TIMEOUT = 5.0
+
+    def __init__(
+        self, source: Iterable[T], maxsize: int = PIPELINE_QUEUE_SIZE,
+        on_close: Optional[Callable[[], None]] = None, deadline: Optional[Deadline] = None
+    ):
+        self._source = source
+        self._deadline = deadline
+        self._abandoned = False
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._on_close = on_close
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="synthex-reader", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: object) -> bool:
+        """
+        Put an item into the queue, giving up if the consumer has stopped.
+        Returns:
+            bool: True if the item was queued, False if the pipeline was stopped.
+        """
+
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=self._POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            for item in self._source:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            # Errors raised after the consumer went away are irrelevant.
+            if not self._stop.is_set():
+                self._put(_Failure(e))
+            return
+        self._put(_DONE)
+
+    def _get(self) -> object:
+        """
+        Wait for the next item, within the deadline if there is one.
+        Raises:
+            DeadlineExceededError: If the deadline expires first.
+        """
+
+        deadline = self._deadline
+        if deadline is None:
+            return self._queue.get()
+        while True:
+            deadline.check()
+            try:
+                item = self._queue.get(timeout=deadline.remaining())
+            except queue.Empty:
+                continue
+            deadline.touch()
+            return item
+
+    def __iter__(self) -> Iterator[T]:
+        try:
+            while True:
+                try:
+                    item = self._get()
+                except BaseException:
+                    self._abandoned = True
+                    raise
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    if self._deadline is not None:
+                        raise self._deadline.translate(item.error)
+                    raise item.error
+                yield item  # type: ignore[misc]
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Stop the reader thread and release the source. Safe to call more than once.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._on_close is not None:
+            # Closing the source unblocks a reader waiting on the network.
+            self._on_close()
+        if not self._abandoned:
+            self._thread.join(timeout=self._JOIN_TIMEOUT)
+
+    def __enter__(self) -> "ThreadedReader[T]":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,287 @@
+import os
+import sys
+import threading
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Protocol
+import requests
+import urllib3
+
+from .exceptions import ConfigurationError
+from .forking import reset_after_fork
+from .sessions import SessionManager
+
+
+class Response(Protocol):
+    """
+    The subset of `requests.Response` that `APIClient` and its callers rely on. Every transport
+    returns objects that provide it.
+    """
+
+    status_code: int
+    url: str
+
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+    @property
+    def content(self) -> bytes: ...
+
+    @property
+    def text(self) -> str: ...
+
+    def json(self) -> Any: ...
+
+    def iter_lines(self) -> Iterator[bytes]: ...
+
+    def close(self) -> None: ...
+
+
+def on_close(response: Response, callback: Callable[[], None]) -> Response:
+    """
+    Arrange for a function to be called once a response is closed, e.g. to release resources that
+    a streamed response holds for as long as it is being consumed.
+    Args:
+        response (Response): The response to watch.
+        callback (Callable[[], None]): The function to call, at most once, after the response
+            is closed.
+    Returns:
+        Response: The same response.
+    """
+
+    close = response.close
+    called = False
+
+    def close_and_notify() -> None:
+        nonlocal called
+        try:
+            close()
+        finally:
+            if not called:
+                called = True
+                callback()
+
+    response.close = close_and_notify  # type: ignore[method-assign]
+    return response
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """
+    Tell whether an error raised by a transport, while sending a request or reading a response,
+    is a timeout.
+    Args:
+        error (BaseException): The error to inspect.
+    Returns:
+        bool: True if the error is a timeout.
+    """
+
+    if isinstance(error, (TimeoutError, requests.exceptions.Timeout)):
+        return True
+    # `requests` reports read timeouts of streamed bodies as connection errors.
+    return isinstance(error, requests.exceptions.ConnectionError) and any(
+        isinstance(arg, urllib3.exceptions.ReadTimeoutError) for arg in error.args
+    )
+
+
+def is_network_error(error: BaseException) -> bool:
+    """
+    Tell whether an error raised by a transport is a network error (including timeouts), as
+    opposed to e.g. an error raised on the client side while producing the request body.
+    Args:
+        error (BaseException): The error to inspect.
+    Returns:
+        bool: True if the error is a network error.
+    """
+
+    if is_timeout_error(error) or isinstance(
+        error, (ConnectionError, requests.exceptions.ConnectionError)
+    ):
+        return True
+    # Only the HTTP/2 transport imports `httpx`, so its errors cannot be raised without it.
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(error, httpx.TransportError)
+
+
+class Transport:
+    """
+    Base class of the transports that send the HTTP requests of an `APIClient`.
+    Methods:
+        request(method: str, url: str, params: Optional[dict[str, Any]] = None,
+                json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+                stream: bool = False, content: Optional[Iterable[bytes]] = None,
+                timeout: Optional[float] = None) -> Response:
+            Sends an HTTP request. If `stream` is True, the body is not read before returning.
+            If `content` is provided, it is sent as the request body, instead of `json`, with
+            chunked transfer encoding. If `timeout` is provided, connecting, and every read
+            from the connection (including reads of a streamed body), fail with a timeout
+            error after that many seconds without progress.
+        close() -> None:
+            Releases the transport's connections.
+    """
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    The default transport, backed by `requests`. Each connection carries one request at a time,
+    so every concurrent stream needs its own connection.
+    Args:
+        per_thread (bool): Whether every thread should use its own session. See `SessionManager`.
+    """
+
+    def __init__(self, per_thread: bool = False):
+        self.sessions = SessionManager({}, per_thread=per_thread)
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The session to use in the calling thread.
+        """
+
+        return self.sessions.get()
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        return self.session.request(
+            method, url, params=params, json=json, data=content, headers=headers, stream=stream,
+            timeout=timeout
+        )
+
+    def close(self) -> None:
+        self.sessions.close()
+
+
+class _HTTPXResponse:
+    """
+    Adapts an `httpx.Response` to the `Response` interface.
+    """
+
+    def __init__(self, response: Any, timeout_error: type[Exception]):
+        self._response = response
+        self._timeout_error = timeout_error
+        self.status_code: int = response.status_code
+        self.url = str(response.url)
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._response.headers  # type: ignore[no-any-return]
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()  # type: ignore[no-any-return]
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text  # type: ignore[no-any-return]
+
+    def json(self) -> Any:
+        self._response.read()
+        return self._response.json()
+
+    def iter_lines(self) -> Iterator[bytes]:
+        try:
+            for line in self._response.iter_lines():
+                yield line.encode("utf-8")
+        except self._timeout_error as e:
+            raise TimeoutError(str(e)) from e
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    A transport backed by `httpx` with HTTP/2 enabled. Concurrent requests and streams to the
+    same host are multiplexed over a single connection, saving a TCP and TLS handshake for each
+    of them. The client is rebuilt when used in a forked child process.
+    Known limitation: with httpx 0.28 and h2 4.4, many threads sharing the connection can race
+    in the stream bookkeeping of `h2`, which fails a request with `httpx.WriteError` (about 1 run
+    in 20 of `benchmarks/transport_benchmark.py`, with 32 threads). Failed requests are not
+    retried, since data generation requests are not idempotent; prefer the default transport
+    for heavily multi-threaded use.
+    Requires the `http2` extra: `pip install synthex[http2]`.
+    Args:
+        max_connections (Optional[int]): The maximum number of connections to keep open.
+    Raises:
+        ConfigurationError: If `httpx` or `h2` is not installed.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None):
+        try:
+            import httpx
+            import h2  # noqa: F401
+        except ImportError as e:
+            raise ConfigurationError(
+                "The HTTP/2 transport requires the 'http2' extra. Install it with "
+                "`pip install synthex[http2]`."
+            ) from e
+        self.max_connections = max_connections
+        self._httpx = httpx
+        self._reset()
+        reset_after_fork(self)
+
+    def _reset(self) -> None:
+        """
+        Forget the client, without closing it, and recreate the lock.
+        """
+
+        self._lock = threading.Lock()
+        self._client: Any = None
+        self._pid = os.getpid()
+
+    @property
+    def client(self) -> Any:
+        """
+        The `httpx.Client` of the current process, created on first use.
+        """
+
+        with self._lock:
+            if self._client is None or os.getpid() != self._pid:
+                self._pid = os.getpid()
+                self._client = self._httpx.Client(
+                    http2=True, timeout=None,
+                    limits=self._httpx.Limits(max_connections=self.max_connections)
+                )
+            return self._client
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        client = self.client
+        request = client.build_request(
+            method, url, params=params, json=json, content=content, headers=headers,
+            timeout=timeout
+        )
+        try:
+            response = client.send(request, stream=stream)
+        except self._httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        return _HTTPXResponse(response, self._httpx.TimeoutException)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None and os.getpid() == self._pid:
+                self._client.close()
+            self._client = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"max_connections": self.max_connections}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["max_connections"])  # type: ignore[misc]
@@ -1,4 +1,5 @@
-from .api_client import APIClient
+from .api_client import response_data
+from .client_pool import Client
 
 from .endpoints import GET_CURRENT_USER_ENDPOINT
 from .models import UserResponseModel
@@ -6,7 +7,7 @@ from .models import UserResponseModel
 
 class UsersAPI:
     
-    def __init__(self, client: APIClient):
+    def __init__(self, client: Client):
         self._client = client
         
         
@@ -18,5 +19,5 @@ class UsersAPI:
             UserResponseModel: A model containing the current user's information.
         """
         
-        response = self._client.get(GET_CURRENT_USER_ENDPOINT)
-        return UserResponseModel.model_validate(response.data)
\ No newline at end of file
+        response = self._client.get(GET_CURRENT_USER_ENDPOINT, model=UserResponseModel)
+        return response_data(response, UserResponseModel)
\ No newline at end of file
@@ -0,0 +1,388 @@
+import csv
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from operator import itemgetter
+from typing import Any, Callable, IO, List, Optional
+from urllib.parse import quote
+from pydantic import BaseModel
+
+from .compression import open_output, split_compression
+from .config import OUTPUT_NULL_PARTITION_NAME
+from .dataset import Dataset
+from .models import JobOutputFormats
+from .streaming import iter_json_array
+
+
+class OutputWriter(ABC):
+    """
+    Base class for the writers that persist the rows streamed by `generate_data`.
+    Attributes:
+        path (str): The path of the output file.
+        rows_written (int): The number of rows written so far, when known.
+        bytes_written (int): The number of bytes written so far, before compression.
+    Methods:
+        write_rows(rows: List[dict[str, Any]]) -> None:
+            Writes a batch of parsed rows.
+        write_payload(payload: bytes) -> None:
+            Writes the rows of the raw JSON payload of an SSE event, without re-encoding them.
+            Only supported by some writers.
+        close() -> None:
+            Flushes and closes the output file.
+        discard() -> None:
+            Deletes the output files written so far. Called after `close`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows_written = 0
+
+    @abstractmethod
+    def write_rows(self, rows: List[dict[str, Any]]) -> None:
+        ...
+
+    def write_payload(self, payload: bytes) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support passthrough writes.")
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+    @property
+    @abstractmethod
+    def bytes_written(self) -> int:
+        ...
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class CsvWriter(OutputWriter):
+    """
+    Writes rows to a CSV file. The header is written before the first batch of rows, using the
+    keys of its first row.
+    Files whose path ends with ".gz" or ".zst" are compressed on the fly, at `compression_level`
+    (see `open_output`).
+    """
+
+    def __init__(self, path: str, compression_level: Optional[int] = None):
+        super().__init__(path)
+        self._file: IO[str] = io.TextIOWrapper(
+            open_output(path, compression_level), encoding="utf-8", newline=""
+        )
+        self._writer: Optional[csv.DictWriter[str]] = None
+
+    def write_rows(self, rows: List[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._writer is None:
+            # Write column names.
+            self._writer = csv.DictWriter(self._file, fieldnames=rows[0].keys())
+            self._writer.writeheader()
+        # Write each dict as a row.
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+
+    @property
+    def bytes_written(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SchemaCsvWriter(CsvWriter):
+    """
+    Writes rows to a CSV file, with columns in a fixed order (typically that of the schema
+    definition) rather than in the order of the keys of the first row. Rows are converted to
+    tuples in bulk with `operator.itemgetter` and written with `csv.writer`, which avoids the
+    per-field lookups of `csv.DictWriter`. Keys that are not in `fieldnames` are ignored, and
+    missing ones are written as empty fields.
+    Args:
+        path (str): The path of the output file.
+        fieldnames (List[str]): The columns, in order.
+        compression_level (Optional[int]): See `CsvWriter`.
+    """
+
+    def __init__(
+        self, path: str, fieldnames: List[str], compression_level: Optional[int] = None
+    ):
+        super().__init__(path, compression_level)
+        self.fieldnames = list(fieldnames)
+        fields = self.fieldnames
+        self._to_tuple: Callable[[dict[str, Any]], tuple[Any, ...]]
+        if len(fields) > 1:
+            self._to_tuple = itemgetter(*fields)
+        else:
+            # `itemgetter` needs at least one key, and returns a bare value, rather than a
+            # 1-tuple, for a single one.
+            self._to_tuple = lambda row: tuple(row[name] for name in fields)
+        self._tuple_writer = csv.writer(self._file)
+
+    def write_rows(self, rows: List[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self.rows_written == 0:
+            self._tuple_writer.writerow(self.fieldnames)
+        try:
+            values = list(map(self._to_tuple, rows))
+        except KeyError:
+            values = [tuple(row.get(name, "") for name in self.fieldnames) for row in rows]
+        self._tuple_writer.writerows(values)
+        self.rows_written += len(rows)
+
+
+class JsonlWriter(OutputWriter):
+    """
+    Writes rows to a JSON Lines file, one row per line. In passthrough mode, the payload of each
+    SSE event (a JSON array of rows) is split into its rows, whose source text is written
+    verbatim, one per line, without being re-encoded. An event fits on a single SSE line, so its
+    rows cannot contain line breaks. Each row is decoded to text and encoded back one at a time
+    (see `iter_json_array`), so a payload is never copied as a whole.
+    The file is opened in binary mode with a large buffer.
+    Files whose path ends with ".gz" or ".zst" are compressed on the fly, at `compression_level`
+    (see `open_output`).
+    """
+
+    def __init__(self, path: str, compression_level: Optional[int] = None):
+        super().__init__(path)
+        self._file: IO[bytes] = open_output(path, compression_level)
+
+    def write_rows(self, rows: List[dict[str, Any]]) -> None:
+        self._file.write(
+            b"".join(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n" for row in rows)
+        )
+        self.rows_written += len(rows)
+
+    def write_payload(self, payload: bytes) -> None:
+        for row in iter_json_array(payload, raw=True):
+            self._file.write(row.encode("utf-8") + b"\n")
+            self.rows_written += 1
+
+    @property
+    def bytes_written(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class DatasetWriter(OutputWriter):
+    """
+    Appends rows to an in-memory `Dataset`, instead of writing them to a file.
+    Args:
+        dataset (Dataset): The dataset to append rows to.
+    """
+
+    def __init__(self, dataset: Dataset):
+        super().__init__("")
+        self.dataset = dataset
+
+    def write_rows(self, rows: List[dict[str, Any]]) -> None:
+        self.dataset.append_rows(rows)
+        self.rows_written += len(rows)
+
+    @property
+    def bytes_written(self) -> int:
+        return self.dataset.nbytes
+
+    def close(self) -> None:
+        pass
+
+    def discard(self) -> None:
+        pass
+
+
+class OutputFile(BaseModel):
+    """
+    A file written by a `PartitionedWriter`.
+    Attributes:
+        path (str): The path of the file, relative to the manifest.
+        rows (int): The number of rows in the file.
+        bytes (int): The size of the file.
+        partition (Optional[dict[str, str]]): The partition column and the value shared by all
+            rows of the file, if the output is partitioned.
+    """
+
+    path: str
+    rows: int
+    bytes: int
+    partition: Optional[dict[str, str]] = None
+
+
+class OutputManifest(BaseModel):
+    """
+    The list of the files written by a `PartitionedWriter`, saved next to them once it is closed.
+    Attributes:
+        files (List[OutputFile]): The files, in the order in which they were completed.
+        rows (int): The total number of rows.
+    """
+
+    files: List[OutputFile]
+    rows: int
+
+
+class PartitionedWriter(OutputWriter):
+    """
+    Spreads rows across several files, so that downstream loaders can process them in parallel.
+    For an output path such as "out/data.csv", rows are written to "out/data-00000.csv",
+    "out/data-00001.csv" and so on, and, if `partition_by` is set, to one such sequence of files
+    per value of that column, in "out/<column>=<value>/" subdirectories (rows whose value is
+    missing or null go to the `OUTPUT_NULL_PARTITION_NAME` partition). Each file is completed
+    once it holds `rotate_rows` rows, or once it reaches `rotate_bytes` bytes (checked after every
+    batch of rows and before compression, so files can slightly exceed it). A manifest listing
+    the files, their row counts and their sizes is written to "out/data.manifest.json" when the
+    writer is closed.
+    Args:
+        output_type (JobOutputFormats): The format of the files.
+        path (str): The path the names of the files are derived from.
+        rotate_rows (Optional[int]): The maximum number of rows per file.
+        rotate_bytes (Optional[int]): The size after which a file is completed.
+        partition_by (Optional[str]): The column whose values the rows are partitioned by.
+        compression_level (Optional[int]): The compression level of the files, if `path` ends
+            with ".gz" or ".zst".
+        fieldnames (Optional[List[str]]): The columns of CSV files, in order. See
+            `SchemaCsvWriter`.
+    """
+
+    def __init__(
+        self, output_type: JobOutputFormats, path: str, rotate_rows: Optional[int] = None,
+        rotate_bytes: Optional[int] = None, partition_by: Optional[str] = None,
+        compression_level: Optional[int] = None, fieldnames: Optional[List[str]] = None
+    ):
+        super().__init__(path)
+        self.output_type = output_type
+        self.rotate_rows = rotate_rows
+        self.rotate_bytes = rotate_bytes
+        self.partition_by = partition_by
+        self.compression_level = compression_level
+        self.fieldnames = fieldnames
+        self.directory, file_name = os.path.split(path)
+        file_name, compression = split_compression(file_name)
+        self._stem, self._extension = os.path.splitext(file_name)
+        self._extension += compression
+        self.manifest_path = os.path.join(self.directory, f"{self._stem}.manifest.json")
+        self.files: List[OutputFile] = []
+        self._writers: dict[Optional[str], OutputWriter] = {}
+        self._file_counts: defaultdict[Optional[str], int] = defaultdict(int)
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(file.bytes for file in self.files) + sum(
+            writer.bytes_written for writer in self._writers.values()
+        )
+
+    def _writer(self, partition: Optional[str]) -> OutputWriter:
+        writer = self._writers.get(partition)
+        if writer is None:
+            directory = self.directory
+            if partition is not None:
+                directory = os.path.join(
+                    directory, f"{self.partition_by}={quote(partition, safe='')}"
+                )
+                os.makedirs(directory, exist_ok=True)
+            index = self._file_counts[partition]
+            self._file_counts[partition] += 1
+            writer = self._writers[partition] = make_writer(
+                self.output_type,
+                os.path.join(directory, f"{self._stem}-{index:05d}{self._extension}"),
+                compression_level=self.compression_level, fieldnames=self.fieldnames
+            )
+        return writer
+
+    def _complete(self, partition: Optional[str]) -> None:
+        writer = self._writers.pop(partition)
+        writer.close()
+        self.files.append(OutputFile(
+            path=os.path.relpath(writer.path, self.directory or os.curdir),
+            rows=writer.rows_written, bytes=os.path.getsize(writer.path),
+            partition=(
+                {self.partition_by: partition}
+                if self.partition_by is not None and partition is not None else None
+            )
+        ))
+
+    def write_rows(self, rows: List[dict[str, Any]]) -> None:
+        batches: dict[Optional[str], List[dict[str, Any]]] = {}
+        for row in rows:
+            key = None
+            if self.partition_by is not None:
+                value = row.get(self.partition_by)
+                key = OUTPUT_NULL_PARTITION_NAME if value is None else str(value)
+            batches.setdefault(key, []).append(row)
+
+        for partition, batch in batches.items():
+            while batch:
+                writer = self._writer(partition)
+                if self.rotate_rows is not None:
+                    room = self.rotate_rows - writer.rows_written
+                    writer.write_rows(batch[:room])
+                    batch = batch[room:]
+                else:
+                    writer.write_rows(batch)
+                    batch = []
+                if (self.rotate_rows is not None and writer.rows_written >= self.rotate_rows) or (
+                    self.rotate_bytes is not None and writer.bytes_written >= self.rotate_bytes
+                ):
+                    self._complete(partition)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        for partition in list(self._writers):
+            self._complete(partition)
+        manifest = OutputManifest(files=self.files, rows=sum(file.rows for file in self.files))
+        with open(self.manifest_path, mode="w", encoding="utf-8") as f:
+            f.write(manifest.model_dump_json(indent=2))
+
+    def discard(self) -> None:
+        for file in self.files:
+            path = os.path.join(self.directory, file.path)
+            if os.path.exists(path):
+                os.remove(path)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+
+
+def make_writer(
+    output_type: JobOutputFormats, path: str, rotate_rows: Optional[int] = None,
+    rotate_bytes: Optional[int] = None, partition_by: Optional[str] = None,
+    compression_level: Optional[int] = None, fieldnames: Optional[List[str]] = None
+) -> OutputWriter:
+    """
+    Create the writer for the desired output format.
+    Args:
+        output_type (JobOutputFormats): The desired output format.
+        path (str): The path of the output file.
+        rotate_rows (Optional[int]): If set, the maximum number of rows per file. See
+            `PartitionedWriter`.
+        rotate_bytes (Optional[int]): If set, the size after which a file is completed. See
+            `PartitionedWriter`.
+        partition_by (Optional[str]): If set, the column whose values the rows are partitioned
+            by. See `PartitionedWriter`.
+        compression_level (Optional[int]): The compression level, if `path` ends with ".gz" or
+            ".zst". See `open_output`.
+        fieldnames (Optional[List[str]]): If set, the columns of CSV files, in order. See
+            `SchemaCsvWriter`.
+    Returns:
+        OutputWriter: A writer for the desired output format.
+    """
+
+    if rotate_rows is not None or rotate_bytes is not None or partition_by is not None:
+        return PartitionedWriter(
+            output_type, path, rotate_rows, rotate_bytes, partition_by, compression_level,
+            fieldnames
+        )
+    if output_type == "jsonl":
+        return JsonlWriter(path, compression_level)
+    if fieldnames is not None:
+        return SchemaCsvWriter(path, fieldnames, compression_level)
+    return CsvWriter(path, compression_level)
@@ -1,7 +1,10 @@
 import pytest
 import os
+import json
+import threading
 from dotenv import load_dotenv
-from typing import Any
+from typing import Any, Iterator, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from synthex import Synthex
 
@@ -66,4 +69,78 @@ def generate_data_params() -> dict[Any, Any]:
         "number_of_samples": 20,
         "output_type": "csv",
         "output_path": f"test_data/output.csv"
-    }
\ No newline at end of file
+    }
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the local stand-in server. Every GET request receives a successful 
+    promotional credits response, and every POST request receives a data generation stream that
+    echoes the examples of the request body back as generated rows.
+    """
+    
+    protocol_version = "HTTP/1.1"
+    body = json.dumps({
+        "status_code": 200,
+        "status": "success",
+        "message": "Credits retrieved successfully",
+        "data": {"amount": 100, "currency": "USD"}
+    }).encode("utf-8")
+    
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+        
+    def _read_body(self) -> Optional[bytes]:
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b""
+        while True:
+            line = self.rfile.readline().strip()
+            if not line:
+                # The client aborted the upload.
+                return None
+            size = int(line, 16)
+            if size == 0:
+                self.rfile.readline()
+                return body
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        
+    def do_POST(self) -> None:
+        request_body = self._read_body()
+        if request_body is None:
+            self.close_connection = True
+            return
+        examples = json.loads(request_body)["examples"]
+        body = b"data: " + json.dumps(examples).encode("utf-8") + b"\n\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def local_server() -> Iterator[str]:
+    """
+    Fixture that runs a local stand-in for the Synthex API on a background thread.
+    Returns:
+        str: The base URL of the local server.
+    """
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
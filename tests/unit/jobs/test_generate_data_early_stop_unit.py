@@ -0,0 +1,133 @@
+import responses
+from typing import Any
+import csv
+import json
+import os
+import pytest
+
+from synthex import Synthex
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.progress import GenerationProgress
+
+
+def _row(index: int) -> dict[str, str]:
+    return {
+        "question": f"Question {index}", "option-a": "a", "option-b": "b", "option-c": "c",
+        "option-d": "d", "answer": "option-a" if index % 2 == 0 else "option-b"
+    }
+
+
+# Three SSE events, carrying two rows each.
+multi_event_body = "".join(
+    f"data: {json.dumps([_row(2 * i), _row(2 * i + 1)])}\n\n" for i in range(3)
+)
+
+
+def _add_response() -> None:
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body=multi_event_body,
+        content_type="text/event-stream",
+        status=200
+    )
+
+
+def _generate(synthex: Synthex, generate_data_params: dict[Any, Any], **kwargs: Any) -> None:
+    synthex.jobs.generate_data(
+        schema_definition=generate_data_params["schema_definition"],
+        examples=generate_data_params["examples"],
+        requirements=generate_data_params["requirements"],
+        number_of_samples=6,
+        **{
+            "output_type": generate_data_params["output_type"],
+            "output_path": generate_data_params["output_path"],
+            **kwargs
+        }
+    )
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_take(synthex: Synthex, generate_data_params: dict[Any, Any]):
+    """
+    Test that `take` stops the stream once enough rows are received, and drops the excess rows of
+    the last event.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    _add_response()
+    snapshots: list[GenerationProgress] = []
+    output_path = generate_data_params["output_path"]
+
+    _generate(synthex, generate_data_params, take=3, on_progress=snapshots.append)
+
+    try:
+        with open(output_path, mode="r") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["question"] for row in rows] == ["Question 0", "Question 1", "Question 2"], \
+            "The output file does not hold the first 3 rows."
+        assert len(snapshots) == 2, "The stream was not stopped after the second event."
+    finally:
+        os.remove(output_path)
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_row_filter_passthrough(
+    synthex: Synthex, generate_data_params: dict[Any, Any]
+):
+    """
+    Test that `row_filter` and `take` are applied in passthrough mode, where the events that lose
+    rows are re-encoded.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    _add_response()
+    output_path = generate_data_params["output_path"].replace(".csv", ".jsonl")
+
+    _generate(
+        synthex, generate_data_params, output_type="jsonl", output_path=output_path,
+        passthrough=True, row_filter=lambda row: row["answer"] == "option-a", take=2
+    )
+
+    try:
+        with open(output_path, mode="r") as file:
+            lines = [json.loads(line) for line in file]
+        assert lines == [_row(0), _row(2)], "The rows were not filtered."
+    finally:
+        os.remove(output_path)
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_stop_when(synthex: Synthex, generate_data_params: dict[Any, Any]):
+    """
+    Test that `stop_when` stops the stream as soon as it returns True, and that the rows received
+    until then are written to a well-formed output file.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    _add_response()
+    output_path = generate_data_params["output_path"]
+
+    _generate(
+        synthex, generate_data_params, pipelined=True,
+        stop_when=lambda progress: progress.events_received == 2
+    )
+
+    try:
+        with open(output_path, mode="r") as file:
+            rows = list(csv.reader(file))
+        assert len(rows) == 5, f"Expected a header and 4 rows, found {len(rows)} lines."
+    finally:
+        os.remove(output_path)
@@ -0,0 +1,182 @@
+import csv
+import json
+import pytest
+from pathlib import Path
+from typing import Any, Iterator
+
+from synthex import Synthex
+from synthex.exceptions import ValidationError
+from synthex.request_body import encode_job_body, iter_examples
+
+
+def _examples(generate_data_params: dict[Any, Any], count: int) -> list[dict[str, str]]:
+    """
+    Build `count` distinct examples conforming to the schema definition of the test parameters.
+    """
+
+    example = generate_data_params["examples"][0]
+    return [{**example, "question": f"Question {i}"} for i in range(count)]
+
+
+@pytest.mark.unit
+def test_encode_job_body_matches_json_dumps(generate_data_params: dict[Any, Any]):
+    """
+    Test that the streamed request body is split into several chunks, and that their
+    concatenation is identical to the JSON encoding of the whole body.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    examples = _examples(generate_data_params, 50)
+    chunks = list(encode_job_body(
+        generate_data_params["schema_definition"], examples, generate_data_params["requirements"],
+        20, chunk_size=1024
+    ))
+
+    expected = json.dumps({
+        "output_schema": generate_data_params["schema_definition"],
+        "examples": examples,
+        "requirements": generate_data_params["requirements"],
+        "datapoint_num": 20
+    }).encode("utf-8")
+    assert len(chunks) > 1, "The body was not split into chunks."
+    assert b"".join(chunks) == expected, "The encoded body is not valid."
+
+
+@pytest.mark.unit
+def test_encode_job_body_validates_lazily(generate_data_params: dict[Any, Any]):
+    """
+    Test that examples are pulled from their source only as the body is encoded, and that an
+    example that does not match the schema definition fails once it is reached.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    pulled = 0
+
+    def source() -> Iterator[dict[str, str]]:
+        nonlocal pulled
+        for example in _examples(generate_data_params, 1000):
+            pulled += 1
+            yield example
+        yield {"question": "Missing fields"}
+
+    body = encode_job_body(
+        generate_data_params["schema_definition"], source(), generate_data_params["requirements"],
+        20, chunk_size=1024
+    )
+    next(body)
+    assert pulled < 50, "The examples were consumed eagerly."
+
+    with pytest.raises(ValidationError):
+        list(body)
+
+
+@pytest.mark.unit
+def test_iter_examples_reads_files(generate_data_params: dict[Any, Any], tmp_path: Path):
+    """
+    Test that examples can be read from CSV and JSON Lines files, and that other files are
+    rejected.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the example files.
+    """
+
+    examples = _examples(generate_data_params, 3)
+    jsonl_path = tmp_path / "examples.jsonl"
+    jsonl_path.write_text("".join(json.dumps(example) + "\n" for example in examples))
+    csv_path = tmp_path / "examples.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(examples[0].keys()))
+        writer.writeheader()
+        writer.writerows(examples)
+
+    assert list(iter_examples(jsonl_path)) == examples, "The JSON Lines file was not read."
+    assert list(iter_examples(str(csv_path))) == examples, "The CSV file was not read."
+    with pytest.raises(ValidationError):
+        iter_examples(tmp_path / "examples.xlsx")
+
+
+@pytest.mark.unit
+def test_csv_examples_are_typed_by_schema(tmp_path: Path):
+    """
+    Test that the numeric values of a CSV examples file are encoded as numbers, as the same
+    examples given as a list would be, and that invalid numbers are rejected.
+    Args:
+        tmp_path (Path): A temporary directory for the example files.
+    """
+
+    schema = {"name": {"type": "string"}, "age": {"type": "integer"}, "score": {"type": "float"}}
+    examples = [
+        {"name": "007", "age": 42, "score": 0.5},
+        {"name": "Ann", "age": None, "score": 1e-3},
+    ]
+    csv_path = tmp_path / "examples.csv"
+    csv_path.write_text("name,age,score\n007,42,0.5\nAnn,,1e-3\n")
+
+    encoded = b"".join(encode_job_body(schema, iter_examples(csv_path, schema), [], 10))
+
+    expected = b"".join(encode_job_body(schema, examples, [], 10))
+    assert encoded == expected, "The CSV examples were not encoded like the list of examples."
+    assert json.loads(encoded)["examples"][0] == {"name": "007", "age": 42, "score": 0.5}
+
+    csv_path.write_text("name,age,score\nBob,forty,1\n")
+    with pytest.raises(ValidationError):
+        list(iter_examples(csv_path, schema))
+
+@pytest.mark.unit
+def test_generate_data_streams_examples_file(
+    generate_data_params: dict[Any, Any], local_server: str, tmp_path: Path
+):
+    """
+    Test that `generate_data` uploads examples read from a file with a streamed, chunked request
+    body, against a local stand-in server that echoes the examples back as generated rows.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        local_server (str): The base URL of the local stand-in server.
+        tmp_path (Path): A temporary directory for the example and output files.
+    """
+
+    examples = _examples(generate_data_params, 2000)
+    examples_path = tmp_path / "examples.jsonl"
+    examples_path.write_text("".join(json.dumps(example) + "\n" for example in examples))
+    output_path = tmp_path / "output.jsonl"
+
+    synthex = Synthex(api_key="test_api_key")
+    synthex._client.BASE_URL = local_server
+    synthex.jobs.generate_data(**{
+        **generate_data_params, "examples": str(examples_path), "output_type": "jsonl",
+        "output_path": str(output_path)
+    })
+
+    rows = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert rows == examples, "The examples were not uploaded as expected."
+
+
+@pytest.mark.unit
+def test_generate_data_invalid_streamed_example(
+    generate_data_params: dict[Any, Any], local_server: str, tmp_path: Path
+):
+    """
+    Test that an example given through an iterator that does not match the schema definition
+    interrupts the upload with a `ValidationError`.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        local_server (str): The base URL of the local stand-in server.
+        tmp_path (Path): A temporary directory for the output file.
+    """
+
+    examples = iter(_examples(generate_data_params, 100) + [{"question": "Missing fields"}])
+
+    synthex = Synthex(api_key="test_api_key")
+    synthex._client.BASE_URL = local_server
+    with pytest.raises(ValidationError):
+        synthex.jobs.generate_data(**{
+            **generate_data_params, "examples": examples,
+            "output_path": str(tmp_path / "output.csv")
+        })
@@ -0,0 +1,196 @@
+import responses
+from pathlib import Path
+from typing import Any
+import csv
+import os
+import json
+import pytest
+
+from synthex import Synthex
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.exceptions import ValidationError
+from synthex.writers import SchemaCsvWriter
+
+
+# The rows, as sent by the server. Their unusual spacing is preserved by passthrough writes.
+payload_rows = [
+    b'{"question": "Q1", "option-a": "a", "option-b": "b", "option-c": "c", '
+    b'"option-d": "d", "answer": "option-a"}',
+    b'{"question":"Q2","option-a":"a","option-b":"b","option-c":"c",'
+    b'"option-d":"d" , "answer":"option-b"}',
+]
+payload = b"[" + b", ".join(payload_rows) + b" ]"
+
+
+def _mock_stream() -> None:
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        # Mock SSE data.
+        body=b"data: " + payload + b"\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_jsonl_success(synthex: Synthex, generate_data_params: dict[Any, Any]):
+    """
+    Test that, with `output_type="jsonl"`, the `generate_data` method writes one JSON object per
+    row to a file with the `.jsonl` extension.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    _mock_stream()
+    output_path = "test_data/output.jsonl"
+
+    synthex.jobs.generate_data(
+        schema_definition=generate_data_params["schema_definition"],
+        examples=generate_data_params["examples"],
+        requirements=generate_data_params["requirements"],
+        number_of_samples=generate_data_params["number_of_samples"],
+        output_type="jsonl",
+        output_path=output_path
+    )
+
+    try:
+        with open(output_path, mode="r", encoding="utf-8") as file:
+            rows = [json.loads(line) for line in file]
+        assert [row["question"] for row in rows] == ["Q1", "Q2"], "JSONL rows do not match."
+    finally:
+        os.remove(output_path)
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_passthrough_writes_payload_verbatim(
+    synthex: Synthex, generate_data_params: dict[Any, Any]
+):
+    """
+    Test that, in passthrough mode, the `generate_data` method writes each row of each event
+    byte for byte, one per line, so that the output can be read back as JSON Lines.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    _mock_stream()
+    output_path = "test_data/output.jsonl"
+
+    synthex.jobs.generate_data(
+        schema_definition=generate_data_params["schema_definition"],
+        examples=generate_data_params["examples"],
+        requirements=generate_data_params["requirements"],
+        number_of_samples=generate_data_params["number_of_samples"],
+        output_type="jsonl",
+        output_path=output_path,
+        passthrough=True
+    )
+
+    try:
+        with open(output_path, mode="rb") as file:
+            content = file.read()
+        assert content == b"".join(row + b"\n" for row in payload_rows), \
+            "Rows were not written verbatim, one per line."
+        with open(output_path, mode="r", encoding="utf-8") as file:
+            assert [json.loads(line) for line in file] == json.loads(payload), \
+                "The output cannot be read back line by line."
+    finally:
+        os.remove(output_path)
+
+
+@pytest.mark.unit
+def test_generate_data_passthrough_csv_failure(
+    synthex: Synthex, generate_data_params: dict[Any, Any]
+):
+    """
+    Test that passthrough mode is rejected with a `ValidationError` when the output format
+    requires the rows to be converted.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    try:
+        with pytest.raises(ValidationError):
+            synthex.jobs.generate_data(
+                schema_definition=generate_data_params["schema_definition"],
+                examples=generate_data_params["examples"],
+                requirements=generate_data_params["requirements"],
+                number_of_samples=generate_data_params["number_of_samples"],
+                output_type="csv",
+                output_path=generate_data_params["output_path"],
+                passthrough=True
+            )
+    except AssertionError:
+        pytest.fail("Expected ValidationError when passthrough is used with a CSV output")
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_csv_columns_follow_schema(
+    synthex: Synthex, generate_data_params: dict[Any, Any]
+):
+    """
+    Test that the columns of CSV output follow the order of the schema definition, rather than
+    the order of the keys sent by the server.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    _mock_stream()
+    output_path = generate_data_params["output_path"]
+    schema_definition = dict(reversed(generate_data_params["schema_definition"].items()))
+
+    synthex.jobs.generate_data(
+        schema_definition=schema_definition,
+        examples=generate_data_params["examples"],
+        requirements=generate_data_params["requirements"],
+        number_of_samples=generate_data_params["number_of_samples"],
+        output_type="csv",
+        output_path=output_path
+    )
+
+    try:
+        with open(output_path, mode="r", newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == list(schema_definition), "Columns are not in the schema's order."
+        assert rows[1] == ["option-a", "d", "c", "b", "a", "Q1"], "Values are misaligned."
+    finally:
+        os.remove(output_path)
+
+
+@pytest.mark.unit
+def test_schema_csv_writer_missing_and_extra_keys(tmp_path: Path):
+    """
+    Test that `SchemaCsvWriter` writes missing keys as empty fields, ignores extra keys, and
+    supports a single column and an empty schema.
+    Args:
+        tmp_path (Path): A temporary directory.
+    """
+
+    path = str(tmp_path / "out.csv")
+    with SchemaCsvWriter(path, ["b", "a"]) as writer:
+        writer.write_rows([{"a": 1, "b": 2, "c": 3}, {"a": 4}])
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        assert list(csv.reader(file)) == [["b", "a"], ["2", "1"], ["", "4"]], "Rows are wrong."
+
+    with SchemaCsvWriter(path, ["a"]) as writer:
+        writer.write_rows([{"a": "hello, world"}, {"b": 2}, {"a": 3}])
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        assert list(csv.reader(file)) == [["a"], ["hello, world"], [""], ["3"]], \
+            "Single-column rows are wrong."
+
+    with SchemaCsvWriter(path, []) as writer:
+        writer.write_rows([{"a": 1}, {}])
+    assert writer.rows_written == 2, "Rows of an empty schema were not counted."
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        assert list(csv.reader(file)) == [[], [], []], "Empty-schema rows are wrong."
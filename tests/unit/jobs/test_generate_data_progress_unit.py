@@ -0,0 +1,111 @@
+import responses
+from typing import Any
+import io
+import os
+import csv
+import pytest
+
+from synthex import Synthex
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.progress import GenerationProgress, ProgressTracker, TerminalProgressBar
+
+
+def _row(index: int) -> str:
+    return (
+        f"{{\"question\": \"Question {index}\", \"option-a\": \"a\", \"option-b\": \"b\", "
+        f"\"option-c\": \"c\", \"option-d\": \"d\", \"answer\": \"option-a\"}}"
+    )
+
+
+# Two SSE events, carrying two rows and one row respectively.
+multi_event_body = f"data: [{_row(0)}, {_row(1)}]\n\ndata: [{_row(2)}]\n\n"
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_on_progress_called_per_event(
+    synthex: Synthex, generate_data_params: dict[Any, Any]
+):
+    """
+    Test that the `on_progress` callback of the `generate_data` method is invoked once per SSE
+    event, with cumulative row, byte and event counts, and that rows from every event are
+    written to the output file.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body=multi_event_body,
+        content_type="text/event-stream",
+        status=200
+    )
+
+    snapshots: list[GenerationProgress] = []
+    output_path = generate_data_params["output_path"]
+
+    synthex.jobs.generate_data(
+        schema_definition=generate_data_params["schema_definition"],
+        examples=generate_data_params["examples"],
+        requirements=generate_data_params["requirements"],
+        number_of_samples=3,
+        output_type=generate_data_params["output_type"],
+        output_path=output_path,
+        on_progress=snapshots.append
+    )
+
+    try:
+        assert [s.rows_received for s in snapshots] == [2, 3], "Cumulative row counts are wrong."
+        assert [s.events_received for s in snapshots] == [1, 2], "Event counts are wrong."
+        assert snapshots[0].bytes_received < snapshots[1].bytes_received, \
+            "Byte count did not increase."
+        assert all(s.rows_expected == 3 for s in snapshots), "Expected rows do not match."
+        assert snapshots[-1].eta == 0.0, "ETA should be zero once all rows are received."
+        assert snapshots[-1].fraction == 1.0, "Fraction should be 1 once all rows are received."
+
+        # Rows of both events must end up in the output file, below a single header.
+        with open(output_path, mode="r") as file:
+            rows = list(csv.reader(file))
+        assert len(rows) == 4, f"Expected a header and 3 rows, found {len(rows)} lines."
+    finally:
+        os.remove(output_path)
+
+
+@pytest.mark.unit
+def test_progress_tracker_rate_and_eta():
+    """
+    Test that `ProgressTracker` computes a positive rolling rate and a finite ETA while rows are
+    still missing.
+    """
+
+    tracker = ProgressTracker(rows_expected=100)
+    tracker._started_at -= 2.0
+    tracker._samples[0] = (tracker._started_at, 0)
+
+    progress = tracker.update(rows=10, num_bytes=512)
+
+    assert progress.rows_per_second > 0, "Rolling rate should be positive."
+    assert progress.eta is not None and progress.eta > 0, "ETA should be positive."
+    assert progress.elapsed >= 2.0, "Elapsed time is wrong."
+
+
+@pytest.mark.unit
+def test_terminal_progress_bar_renders():
+    """
+    Test that `TerminalProgressBar` renders the row counts of a progress snapshot.
+    """
+
+    stream = io.StringIO()
+    bar = TerminalProgressBar(stream=stream, width=10)
+    bar(GenerationProgress(
+        rows_received=5, rows_expected=10, bytes_received=2048, events_received=1,
+        elapsed=1.0, rows_per_second=5.0, eta=1.0
+    ))
+    bar.close()
+
+    output = stream.getvalue()
+    assert "[#####-----]" in output, "Progress bar is not rendered correctly."
+    assert "5/10 rows" in output, "Row counts are not rendered."
@@ -477,3 +477,47 @@ def test_generate_data_output_path_wrong_type(
             )
     except AssertionError:
         pytest.fail("Expected ValidationError when an incorrect output_path argument is provided")
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_pipelined_success(synthex: Synthex, generate_data_params: dict[Any, Any]):
+    """
+    Test that the `generate_data` method of the `Synthex` class produces the same output when the 
+    network stream is read on a background thread (`pipelined=True`).
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the 
+            `generate_data` method
+    """
+      
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        # Mock SSE data.
+        body=json_body,
+        content_type="text/event-stream",
+        status=200
+    )
+    
+    output_path = generate_data_params["output_path"]
+    
+    synthex.jobs.generate_data(
+        schema_definition=generate_data_params["schema_definition"],
+        examples=generate_data_params["examples"],
+        requirements=generate_data_params["requirements"],
+        number_of_samples=generate_data_params["number_of_samples"],
+        output_type=generate_data_params["output_type"],
+        output_path=output_path,
+        pipelined=True
+    )
+    
+    try:
+        with open(output_path, mode="r") as file:
+            rows = list(csv.reader(file))
+        expected_header = ["question", "option-a", "option-b", "option-c", "option-d", "answer"]
+        assert rows[0] == expected_header, \
+            f"CSV header does not match. Expected: {expected_header}, Found: {rows[0]}"
+        assert len(rows) == 2, f"Expected a header and 1 row, found {len(rows)} lines."
+    finally:   
+        os.remove(output_path)
@@ -0,0 +1,173 @@
+import responses
+import json
+import pytest
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from synthex import Synthex
+from synthex.endpoints import API_BASE_URL, LIST_JOBS_ENDPOINT
+from synthex.exceptions import DeadlineExceededError, NotFoundError
+from synthex.models import JobStatus
+from synthex import jobs_api
+
+
+def _job(job_id: str, status: str) -> dict[str, Any]:
+    return {
+        "id": job_id,
+        "name": "Test name",
+        "description": "Test description",
+        "datapoint_num": 10,
+        "output_domain": "Test domain",
+        "status": status,
+        "created_at": datetime(2025, 3, 30, 16, 43, 37, tzinfo=timezone.utc).isoformat()
+    }
+
+
+class _JobsServer:
+    """
+    Serves the list of jobs one page at a time. The status of each job is taken from a script,
+    which gives the status of every job for each successive lookup.
+    """
+
+    def __init__(self, job_ids: list[str], script: dict[str, list[str]]):
+        self.job_ids = job_ids
+        self.script = script
+        self.lookups = -1
+        self.pages: list[int] = []
+
+    def __call__(self, request: Any) -> tuple[int, dict[str, str], str]:
+        query = parse_qs(urlparse(request.url).query)
+        limit, offset = int(query["limit"][0]), int(query["offset"][0])
+        if offset == 0:
+            self.lookups += 1
+        self.pages.append(offset)
+        jobs = [
+            _job(job_id, self.script[job_id][min(self.lookups, len(self.script[job_id]) - 1)])
+            for job_id in self.job_ids[offset:offset + limit]
+        ]
+        body = {
+            "status_code": 200, "status": "success", "message": "Jobs retrieved successfully",
+            "data": {"total": len(self.job_ids), "jobs": jobs}
+        }
+        return 200, {}, json.dumps(body)
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """
+    Record the delays `as_completed` sleeps for, without actually sleeping.
+    """
+
+    delays: list[float] = []
+    monkeypatch.setattr(jobs_api.time, "sleep", delays.append)
+    return delays
+
+
+@pytest.mark.unit
+@responses.activate
+def test_as_completed_yields_jobs_as_they_finish(synthex: Synthex, sleeps: list[float]):
+    """
+    Test that `as_completed` yields each job as soon as it reaches a terminal state, and backs
+    off exponentially while nothing changes.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        sleeps (list[float]): The delays slept for.
+    """
+
+    server = _JobsServer(["a", "b"], {
+        "a": ["In Progress", "Completed"],
+        "b": ["On Hold", "In Progress", "In Progress", "In Progress", "Failed"],
+    })
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/{LIST_JOBS_ENDPOINT}", callback=server)
+
+    jobs = list(synthex.jobs.as_completed(["b", "a"], poll_interval=1, max_poll_interval=3))
+
+    assert [(job.id, job.status) for job in jobs] == [
+        ("a", JobStatus.COMPLETED), ("b", JobStatus.FAILED)
+    ], "Jobs were not yielded in completion order."
+    assert len(sleeps) == 4, f"Expected 4 sleeps, found {len(sleeps)}."
+    # The interval starts over after "a" completes, then doubles up to the maximum.
+    for delay, interval in zip(sleeps, [1, 1, 2, 3]):
+        assert interval / 2 <= delay <= interval, f"Delay {delay} is outside of the interval."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_wait_stops_paging_once_jobs_are_found(
+    synthex: Synthex, sleeps: list[float], monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that `wait` retrieves only the pages of the list of jobs it needs, and returns the jobs
+    in the order of the given IDs.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        sleeps (list[float]): The delays slept for.
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+    """
+
+    monkeypatch.setattr(jobs_api, "JOBS_STATUS_PAGE_SIZE", 2)
+    job_ids = ["a", "b", "c", "d", "e"]
+    server = _JobsServer(job_ids, {job_id: ["Completed"] for job_id in job_ids})
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/{LIST_JOBS_ENDPOINT}", callback=server)
+
+    jobs = synthex.jobs.wait(["c", "a"])
+
+    assert [job.id for job in jobs] == ["c", "a"], "Jobs are not in the order of their IDs."
+    assert server.pages == [0, 2], "Pages after the last needed one were retrieved."
+    assert sleeps == [], "Completed jobs should not be waited for."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_wait_errors(synthex: Synthex):
+    """
+    Test that `wait` raises `NotFoundError` for unknown jobs, and `DeadlineExceededError` once the
+    timeout expires.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+    """
+
+    server = _JobsServer(["a"], {"a": ["In Progress"]})
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/{LIST_JOBS_ENDPOINT}", callback=server)
+
+    with pytest.raises(NotFoundError):
+        synthex.jobs.wait(["a", "missing"])
+
+    with pytest.raises(DeadlineExceededError):
+        synthex.jobs.wait(["a"], timeout=0.05, poll_interval=0.01)
+
+
+@pytest.mark.unit
+@responses.activate
+def test_wait_rescans_when_offsets_drift(
+    synthex: Synthex, sleeps: list[float], monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that a job skipped because another one was deleted while paging through the list of
+    jobs, which shifts the offsets of the following ones, is found by looking for it once more
+    instead of being reported as missing.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        sleeps (list[float]): The delays slept for.
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+    """
+
+    monkeypatch.setattr(jobs_api, "JOBS_STATUS_PAGE_SIZE", 2)
+    server = _JobsServer(["a", "b", "c", "d"], {job_id: ["Completed"] for job_id in "abcd"})
+
+    def delete_after_first_page(request: Any) -> tuple[int, dict[str, str], str]:
+        response = server(request)
+        if server.job_ids[0] == "a":
+            # "a" is deleted: "c" moves to the first page, which was already retrieved.
+            server.job_ids.remove("a")
+        return response
+
+    responses.add_callback(
+        responses.GET, f"{API_BASE_URL}/{LIST_JOBS_ENDPOINT}", callback=delete_after_first_page
+    )
+
+    jobs = synthex.jobs.wait(["c"])
+
+    assert [job.id for job in jobs] == ["c"], "The skipped job was not found."
+    assert server.pages == [0, 2, 0], "The list of jobs was not scanned once more."
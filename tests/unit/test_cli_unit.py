@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+import responses
+import pytest
+from pathlib import Path
+from typing import Any
+
+from synthex.api_client import APIClient
+from synthex.cli import exit_code, main, shard_sizes
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.exceptions import InsufficientCreditsError, RateLimitError, SynthexError
+
+
+def _write_spec(tmp_path: Path, generate_data_params: dict[Any, Any]) -> Path:
+    """
+    Write a JSON spec file built from the `generate_data` test parameters.
+    """
+
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps({
+        "schema_definition": generate_data_params["schema_definition"],
+        "examples": generate_data_params["examples"],
+        "requirements": generate_data_params["requirements"],
+    }))
+    return spec_path
+
+
+@pytest.mark.unit
+def test_exit_codes_follow_exception_hierarchy():
+    """
+    Test that errors are mapped to the exit code of the closest class of their hierarchy.
+    """
+
+    class CustomError(SynthexError):
+        pass
+
+    assert exit_code(InsufficientCreditsError("no credits")) == 6
+    assert exit_code(RateLimitError("slow down")) == 7
+    assert exit_code(CustomError("custom")) == 1
+    assert shard_sizes(2500, 1000) == [1000, 1000, 500], "The samples were not split correctly."
+
+
+@pytest.mark.unit
+def test_generate_writes_one_file_per_job(
+    generate_data_params: dict[Any, Any], local_server: str, tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that `synthex generate` splits the requested samples into parallel jobs against a local
+    stand-in server, and writes the output of each of them to its own file.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        local_server (str): The base URL of the local stand-in server.
+        tmp_path (Path): A temporary directory for the spec and output files.
+        monkeypatch (pytest.MonkeyPatch): Used to point the client to the local server.
+    """
+
+    monkeypatch.setattr(APIClient, "BASE_URL", local_server)
+    spec_path = _write_spec(tmp_path, generate_data_params)
+    output_dir = tmp_path / "out"
+
+    code = main([
+        "generate", "--spec", str(spec_path), "--samples", "2500", "--concurrency", "3",
+        "--format", "jsonl", "-o", str(output_dir), "--api-key", "test_api_key", "--quiet"
+    ])
+
+    assert code == 0, "The command failed."
+    parts = sorted(path.name for path in output_dir.iterdir())
+    assert parts == ["part-00000.jsonl", "part-00001.jsonl", "part-00002.jsonl"], \
+        "The work was not split into the expected jobs."
+    for part in output_dir.iterdir():
+        rows = [json.loads(line) for line in part.read_text().splitlines()]
+        assert rows == generate_data_params["examples"], "A job's output is not valid."
+
+
+@pytest.mark.unit
+def test_generate_streams_csv_to_stdout(
+    generate_data_params: dict[Any, Any], local_server: str, tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch, capsysbinary: pytest.CaptureFixture[bytes]
+):
+    """
+    Test that `synthex generate` writes the output of all jobs to stdout, with a single CSV
+    header, and reports its throughput on stderr.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        local_server (str): The base URL of the local stand-in server.
+        tmp_path (Path): A temporary directory for the spec file.
+        monkeypatch (pytest.MonkeyPatch): Used to point the client to the local server.
+        capsysbinary (pytest.CaptureFixture[bytes]): Captures stdout and stderr.
+    """
+
+    monkeypatch.setattr(APIClient, "BASE_URL", local_server)
+    spec_path = _write_spec(tmp_path, generate_data_params)
+
+    code = main([
+        "generate", "--spec", str(spec_path), "--samples", "30", "--shard-size", "10",
+        "--concurrency", "2", "--api-key", "test_api_key"
+    ])
+
+    captured = capsysbinary.readouterr()
+    assert code == 0, "The command failed."
+    rows = list(csv.reader(io.StringIO(captured.out.decode("utf-8"))))
+    header = list(generate_data_params["schema_definition"].keys())
+    assert rows[0] == header and header not in rows[1:], "The CSV header is not unique."
+    assert len(rows) == 4, "Some jobs are missing from the output."
+    assert b"rows/s" in captured.err, "The throughput was not reported."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_exit_code_on_api_error(
+    generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that `synthex generate` exits with the code of the error returned by the API, and that
+    a malformed spec file is reported as a validation error.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the spec and output files.
+    """
+
+    responses.add(
+        responses.POST, f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        json={"error": "unauthorized"}, status=401
+    )
+    spec_path = _write_spec(tmp_path, generate_data_params)
+    bad_spec_path = tmp_path / "bad_spec.json"
+    bad_spec_path.write_text(json.dumps({"examples": []}))
+    arguments = ["--samples", "10", "-o", str(tmp_path / "out"), "--api-key", "test_api_key", "-q"]
+
+    assert main(["generate", "--spec", str(spec_path), *arguments]) == 5, \
+        "An authentication error was not mapped to its exit code."
+    assert main(["generate", "--spec", str(bad_spec_path), *arguments]) == 4, \
+        "A malformed spec was not mapped to the validation error exit code."
+
+
+@pytest.mark.unit
+def test_generate_exit_code_on_unparsable_spec(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    Test that a spec file that is not valid JSON is reported as a validation error, naming the
+    file, instead of escaping `main` as a traceback.
+    Args:
+        tmp_path (Path): A temporary directory for the spec file.
+        capsys (pytest.CaptureFixture[str]): Captures the error message.
+    """
+
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text('{"schema_definition": {')
+
+    assert main(["generate", "--spec", str(spec_path), "--samples", "10", "-q"]) == 4, \
+        "An unparsable spec was not mapped to the validation error exit code."
+    assert str(spec_path) in capsys.readouterr().err, "The error does not name the spec file."
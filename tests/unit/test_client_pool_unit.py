@@ -0,0 +1,165 @@
+import responses
+import pytest
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from synthex import Synthex
+from synthex.client_pool import ClientPool
+from synthex.endpoints import (
+    API_BASE_URL, GET_PROMOTIONAL_CREDITS_ENDPOINT, GET_CURRENT_USER_ENDPOINT, 
+    CREATE_JOB_WITH_SAMPLES_ENDPOINT
+)
+from synthex.exceptions import RateLimitError, ConfigurationError
+
+
+def _credits_body(amount: int) -> dict[str, object]:
+    return {
+        "status_code": 200,
+        "status": "success",
+        "message": "Credits retrieved successfully",
+        "data": {"amount": amount, "currency": "USD"}
+    }
+
+
+def _used_keys() -> list[str]:
+    return [call.request.headers["X-API-Key"] for call in responses.calls]
+
+
+@pytest.mark.unit
+@responses.activate
+def test_pool_round_robin_spreads_requests():
+    """
+    Test that a `Synthex` instance created with several API keys uses them in turn.
+    """
+
+    responses.add(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", 
+        json=_credits_body(100), status=200
+    )
+
+    synthex = Synthex(api_keys=["key-a", "key-b", "key-c"])
+    for _ in range(6):
+        synthex.credits.promotional()
+
+    assert _used_keys() == ["key-a", "key-b", "key-c"] * 2, "Requests were not spread evenly."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_pool_rate_limited_key_taken_out_of_rotation():
+    """
+    Test that an API key whose request fails with a 429 error is not used again while it is
+    cooling down, and that a `RateLimitError` is raised once every key is out of rotation.
+    """
+
+    url = f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}"
+    responses.add(responses.GET, url, json={"error": "rate limited"}, status=429)
+    responses.add(responses.GET, url, json=_credits_body(100), status=200)
+
+    synthex = Synthex(api_keys=["key-a", "key-b"])
+    with pytest.raises(RateLimitError):
+        synthex.credits.promotional()
+    for _ in range(3):
+        synthex.credits.promotional()
+
+    assert _used_keys() == ["key-a", "key-b", "key-b", "key-b"], \
+        "The rate limited key was not taken out of rotation."
+    
+    synthex._client.members[1].unavailable_until = float("inf")  # type: ignore[union-attr]
+    with pytest.raises(RateLimitError):
+        synthex.credits.promotional()
+
+
+@pytest.mark.unit
+@responses.activate
+def test_pool_least_in_flight_accounts_for_open_streams():
+    """
+    Test that, with the "least_in_flight" strategy, an API key serving an open stream is not
+    selected until the stream is closed.
+    """
+
+    responses.add(
+        responses.POST, f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body="data: []\n\n", content_type="text/event-stream", status=200
+    )
+    responses.add(
+        responses.GET, f"{API_BASE_URL}/{GET_CURRENT_USER_ENDPOINT}", 
+        json={"message": "ok"}, status=200
+    )
+
+    pool = ClientPool(["key-a", "key-b"], strategy="least_in_flight")
+    stream = pool.post_stream(CREATE_JOB_WITH_SAMPLES_ENDPOINT)
+    pool.get(GET_CURRENT_USER_ENDPOINT)
+    stream.close()
+    stream.close()
+    
+    assert _used_keys() == ["key-a", "key-b"], "The key serving a stream was selected."
+    assert [m.in_flight for m in pool.members] == [0, 0], "In-flight counters were not released."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_pool_most_credits_selects_richest_key():
+    """
+    Test that, with the "most_credits" strategy, requests go to the API key with the highest
+    credits balance, and that balances are not refreshed on every request.
+    """
+
+    url = f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}"
+    responses.add(responses.GET, url, json=_credits_body(10), status=200)
+    responses.add(responses.GET, url, json=_credits_body(500), status=200)
+    responses.add(
+        responses.GET, f"{API_BASE_URL}/{GET_CURRENT_USER_ENDPOINT}", 
+        json={"message": "ok"}, status=200
+    )
+
+    pool = ClientPool(["key-a", "key-b"], strategy="most_credits")
+    pool.get(GET_CURRENT_USER_ENDPOINT)
+    pool.get(GET_CURRENT_USER_ENDPOINT)
+
+    assert _used_keys() == ["key-a", "key-b", "key-b", "key-b"], \
+        "Requests were not routed to the key with the most credits."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_pool_most_credits_spreads_concurrent_requests():
+    """
+    Test that, with the "most_credits" strategy, concurrent requests are spread across keys with
+    similar balances between two refreshes, instead of all going to the same key.
+    """
+
+    def user(_: Any) -> tuple[int, dict[str, str], str]:
+        time.sleep(0.02)
+        return 200, {}, '{"message": "ok"}'
+
+    responses.add(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}",
+        json=_credits_body(100), status=200
+    )
+    responses.add_callback(
+        responses.GET, f"{API_BASE_URL}/{GET_CURRENT_USER_ENDPOINT}", callback=user
+    )
+
+    pool = ClientPool(["key-a", "key-b"], strategy="most_credits")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Distinct parameters, so that the requests are not coalesced.
+        list(executor.map(lambda i: pool.get(GET_CURRENT_USER_ENDPOINT, {"i": i}), range(8)))
+
+    calls = [
+        call.request.headers["X-API-Key"] for call in responses.calls
+        if GET_CURRENT_USER_ENDPOINT in call.request.url
+    ]
+    assert Counter(calls) == {"key-a": 4, "key-b": 4}, "Requests were not spread across keys."
+
+
+@pytest.mark.unit
+def test_pool_requires_api_keys():
+    """
+    Test that a `ClientPool` cannot be created without API keys.
+    """
+
+    with pytest.raises(ConfigurationError):
+        ClientPool([])
@@ -0,0 +1,137 @@
+import responses
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from synthex import Synthex
+from synthex.api_client import APIClient
+from synthex.coalescing import SingleFlight
+from synthex.endpoints import API_BASE_URL, GET_PROMOTIONAL_CREDITS_ENDPOINT
+
+
+def _slow_credits_callback(request: Any) -> tuple[int, dict[str, str], str]:
+    # Keep the request in flight long enough for the other threads to join it.
+    time.sleep(0.2)
+    return (
+        200, {}, 
+        '{"status_code": 200, "status": "success", "message": "ok", '
+        '"data": {"amount": 100, "currency": "USD"}}'
+    )
+
+
+@pytest.mark.unit
+@responses.activate
+def test_concurrent_identical_gets_share_one_call():
+    """
+    Test that concurrent identical GET requests made through the same client result in a single
+    HTTP call, and that every caller receives the parsed response.
+    """
+
+    responses.add_callback(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", 
+        callback=_slow_credits_callback
+    )
+    synthex = Synthex(api_key="test_api_key")
+    barrier = threading.Barrier(16)
+
+    def call(_: int) -> int:
+        barrier.wait()
+        return synthex.credits.promotional().amount
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        amounts = list(executor.map(call, range(16)))
+
+    assert amounts == [100] * 16, "Not every caller received the response."
+    assert len(responses.calls) == 1, f"Expected 1 HTTP call, found {len(responses.calls)}."
+    
+    # Once the call completed, a new one is made.
+    synthex.credits.promotional()
+    assert len(responses.calls) == 2, "A completed call was reused."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_coalesced_callers_receive_their_own_response():
+    """
+    Test that callers whose GET requests were coalesced each receive a response of their own, so
+    that one of them modifying it does not affect the others.
+    """
+
+    responses.add_callback(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", 
+        callback=_slow_credits_callback
+    )
+    synthex = Synthex(api_key="test_api_key")
+    barrier = threading.Barrier(8)
+
+    def call(_: int) -> Any:
+        barrier.wait()
+        return synthex.credits.promotional()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        credits = list(executor.map(call, range(8)))
+    credits[0].amount = 0
+
+    assert len(responses.calls) == 1, f"Expected 1 HTTP call, found {len(responses.calls)}."
+    assert len({id(credit) for credit in credits}) == 8, "Callers share a response."
+    assert [credit.amount for credit in credits[1:]] == [100] * 7, \
+        "Modifying a response affected the other callers."
+
+@pytest.mark.unit
+@responses.activate
+def test_coalescing_can_be_disabled():
+    """
+    Test that, with coalescing disabled, concurrent identical GET requests are all sent.
+    """
+
+    responses.add_callback(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", 
+        callback=_slow_credits_callback
+    )
+    client = APIClient("test_api_key", coalesce_requests=False)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: client.get(GET_PROMOTIONAL_CREDITS_ENDPOINT), range(4)))
+
+    assert len(responses.calls) == 4, "Requests were coalesced although coalescing is disabled."
+
+
+@pytest.mark.unit
+def test_single_flight_propagates_errors_to_waiters():
+    """
+    Test that the exception raised by a coalesced call is raised in every waiting thread.
+    """
+
+    single_flight: SingleFlight[int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing() -> int:
+        started.set()
+        release.wait()
+        raise ConnectionError("connection reset")
+
+    errors: list[BaseException] = []
+
+    def call() -> None:
+        try:
+            single_flight.do("key", failing)
+        except BaseException as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    waiters = [threading.Thread(target=call) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join()
+
+    assert len(errors) == 4, "Not every caller received the error."
+    assert all(isinstance(e, ConnectionError) for e in errors), "The wrong error was raised."
+    assert single_flight._calls == {}, "The in-flight call was not cleared."
@@ -0,0 +1,187 @@
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import types
+import responses
+import pytest
+from pathlib import Path
+from typing import Any
+
+from synthex import Synthex
+from synthex.concurrency import AdaptiveLimiter
+from synthex.compression import (
+    COMPRESSION_EXTENSIONS, check_compression_level, open_output, split_compression
+)
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.exceptions import ConfigurationError, ValidationError
+from synthex.jobs_api import JobsAPI
+from synthex.writers import CsvWriter
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("output_path, output_type, expected", [
+    ("out.gz", "csv", "out.csv.gz"),
+    (os.path.join("data", "out.txt.gz"), "csv", os.path.join("data", "out.csv.gz")),
+    ("out.csv.zst", "jsonl", "out.jsonl.zst"),
+    ("out.txt", "jsonl", "out.jsonl"),
+])
+def test_sanitize_output_path_compound_extensions(
+    output_path: str, output_type: str, expected: str
+):
+    """
+    Test that the sanitized output path keeps the compression extension after the format's
+    extension.
+    Args:
+        output_path (str): The output path to sanitize.
+        output_type (str): The desired output format.
+        expected (str): The expected sanitized path.
+    """
+
+    assert JobsAPI._sanitize_output_path(output_path, output_type) == expected, \
+        "The compression extension was not preserved."
+
+
+@pytest.mark.unit
+def test_csv_writer_gzip(tmp_path: Path):
+    """
+    Test that a CSV writer with a ".gz" path writes a valid gzip file, and reports the number of
+    uncompressed bytes written.
+    Args:
+        tmp_path (Path): A temporary directory.
+    """
+
+    path = tmp_path / "out.csv.gz"
+    rows = [{"id": i, "text": "the same text over and over"} for i in range(1000)]
+    with CsvWriter(str(path), compression_level=1) as writer:
+        writer.write_rows(rows)
+        writer._file.flush()
+        bytes_written = writer.bytes_written
+
+    with gzip.open(path, mode="rb") as f:
+        content = f.read()
+    assert bytes_written == len(content), "The uncompressed size is wrong."
+    assert len(list(csv.DictReader(io.StringIO(content.decode("utf-8"))))) == 1000, \
+        "Rows are missing."
+    assert os.path.getsize(path) < len(content) / 5, "The output was not compressed."
+
+
+@pytest.mark.unit
+def test_open_output_zstd_requires_extra(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that zstd output fails with a `ConfigurationError` when `zstandard` is not installed.
+    Args:
+        tmp_path (Path): A temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+    """
+
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    with pytest.raises(ConfigurationError):
+        open_output(str(tmp_path / "out.jsonl.zst"))
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_compressed_output(
+    synthex: Synthex, generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that `generate_data` compresses its output on the fly when the output path ends with
+    ".gz", and rejects out-of-range compression levels before sending the request.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory.
+    """
+
+    rows = generate_data_params["examples"] * 2
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body=f"data: {json.dumps(rows)}\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+    params = {
+        **generate_data_params, "output_path": str(tmp_path / "out.gz"), "output_type": "jsonl"
+    }
+
+    synthex.jobs.generate_data(**params, passthrough=True)
+
+    with gzip.open(tmp_path / "out.jsonl.gz", mode="rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == rows, "The output is not valid."
+
+    with pytest.raises(ValidationError):
+        synthex.jobs.generate_data(**params, compression_level=10)
+    assert len(responses.calls) == 1, "A request was sent with an invalid compression level."
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("path, valid, invalid", [
+    ("out.csv.gz", [1, 9], [0, 10]),
+    ("out.csv.zst", [1, 22], [0, 23]),
+])
+def test_compression_level_ranges(
+    path: str, valid: list[int], invalid: list[int], monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that the accepted compression levels are the documented ones, and include the defaults.
+    Args:
+        path (str): A compressed output path.
+        valid (list[int]): The lowest and highest accepted levels.
+        invalid (list[int]): Levels just out of range.
+        monkeypatch (pytest.MonkeyPatch): Used to make `zstandard` importable.
+    """
+
+    monkeypatch.setitem(sys.modules, "zstandard", types.ModuleType("zstandard"))
+
+    ext = split_compression(path)[1]
+    for level in valid + [COMPRESSION_EXTENSIONS[ext]]:
+        check_compression_level(path, level)
+    for level in invalid:
+        with pytest.raises(ValidationError):
+            check_compression_level(path, level)
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_checks_output_before_request(
+    generate_data_params: dict[Any, Any], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that a zstd output path without `zstandard` installed is rejected before the request is
+    sent, and that a response is closed, releasing its limiter slot, if the output file cannot be
+    opened once it is received.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to hide `zstandard`.
+    """
+
+    responses.add(
+        responses.POST, f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body="data: []\n\n", content_type="text/event-stream", status=200
+    )
+    limiter = AdaptiveLimiter()
+    synthex = Synthex(api_key="test_api_key", limiter=limiter)
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    with pytest.raises(ConfigurationError):
+        synthex.jobs.generate_data(**{
+            **generate_data_params, "output_path": str(tmp_path / "out.csv.zst")
+        })
+    assert len(responses.calls) == 0, "The request was sent although the output is unwritable."
+
+    # The parent of the output file is a file, so the output directory cannot be created.
+    (tmp_path / "file").write_text("")
+    with pytest.raises(OSError):
+        synthex.jobs.generate_data(**{
+            **generate_data_params, "output_path": str(tmp_path / "file" / "out.csv")
+        })
+    assert len(responses.calls) == 1
+    assert limiter.in_flight == 0, "The response was not closed."
@@ -0,0 +1,216 @@
+import requests
+import responses
+import pytest
+import threading
+from typing import Any
+
+from synthex import Synthex
+from synthex.api_client import APIClient
+from synthex.concurrency import AdaptiveLimiter
+from synthex.endpoints import (
+    API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT, GET_PROMOTIONAL_CREDITS_ENDPOINT
+)
+from synthex.exceptions import AuthenticationError, RateLimitError, ValidationError
+from synthex.transports import Transport
+
+
+@pytest.mark.unit
+def test_limiter_additive_increase():
+    """
+    Test that healthy requests raise the limit by roughly one for every `limit` requests.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=10)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(success=True, ttfb=0.1)
+
+    assert limiter.limit == 4 and limiter._limit > 4.5, "The limit did not increase additively."
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(success=True, ttfb=0.1)
+    assert limiter.limit == 10, "The limit exceeded its maximum."
+
+
+@pytest.mark.unit
+def test_limiter_multiplicative_decrease_with_cooldown():
+    """
+    Test that failures cut the limit multiplicatively, only once per cooldown period, and never
+    below the minimum.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=20, decrease_factor=0.5, decrease_cooldown=60)
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(success=False)
+
+    assert limiter.limit == 10, "A burst of failures was counted more than once."
+    assert limiter.metrics()["decreases"] == 1, "The decreases metric is wrong."
+
+    limiter.decrease_cooldown = 0
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(success=False)
+    assert limiter.limit == 1, "The limit went below its minimum."
+
+
+@pytest.mark.unit
+def test_limiter_rising_ttfb_counts_as_congestion():
+    """
+    Test that a time-to-first-byte well above the best observed one cuts the limit.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=10, decrease_factor=0.5, ttfb_tolerance=3)
+    limiter.acquire()
+    limiter.release(success=True, ttfb=0.1)
+    limiter.acquire()
+    limiter.release(success=True, ttfb=0.5)
+
+    assert limiter.limit == 5, "A rising time-to-first-byte did not cut the limit."
+    assert limiter.metrics()["baseline_ttfb"] == 0.1, "The baseline is wrong."
+
+
+@pytest.mark.unit
+def test_limiter_keeps_one_baseline_per_endpoint():
+    """
+    Test that mixing a fast endpoint with a slow one does not count as congestion, so that the
+    limit keeps growing, while a slowdown of the fast endpoint still cuts it.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=4, decrease_factor=0.5, ttfb_tolerance=3)
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(success=True, ttfb=0.01, endpoint="GET /credits")
+        limiter.acquire()
+        limiter.release(success=True, ttfb=1.0, endpoint="POST /jobs")
+
+    assert limiter.limit > 4 and limiter.metrics()["decreases"] == 0, \
+        "Slow requests were compared with the baseline of a fast endpoint."
+    limit = limiter.limit
+    limiter.acquire()
+    limiter.release(success=True, ttfb=0.1, endpoint="GET /credits")
+    assert limiter.limit < limit, "A slowdown of the fast endpoint did not cut the limit."
+
+
+@pytest.mark.unit
+def test_limiter_baseline_forgets_old_samples():
+    """
+    Test that a single unusually fast sample stops setting the baseline once it falls out of the
+    window, so that it cannot keep the limit down forever.
+    """
+
+    limiter = AdaptiveLimiter(
+        initial_limit=10, decrease_factor=0.5, ttfb_tolerance=3, decrease_cooldown=0,
+        baseline_window=5
+    )
+    limiter.acquire()
+    limiter.release(success=True, ttfb=0.001)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(success=True, ttfb=0.1)
+    decreases = limiter.metrics()["decreases"]
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(success=True, ttfb=0.1)
+    assert limiter.metrics()["decreases"] == decreases, "The old sample is still the baseline."
+    assert limiter.metrics()["baseline_ttfb"] == 0.1, "The baseline did not move up."
+
+
+@pytest.mark.unit
+def test_limiter_caps_in_flight_requests():
+    """
+    Test that `acquire` blocks once the limit is reached, and resumes once a slot is released.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=2)
+    assert limiter.acquire(timeout=0) and limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0.05), "A slot beyond the limit was acquired."
+
+    threading.Timer(0.05, lambda: limiter.release(success=True)).start()
+    assert limiter.acquire(timeout=1), "The released slot could not be acquired."
+    assert limiter.in_flight == 2, "The in-flight count is wrong."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_client_limiter_reacts_to_rate_limit():
+    """
+    Test that a `Synthex` instance with a limiter releases its slots and cuts the limit when the
+    API responds with a 429 error.
+    """
+
+    responses.add(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}",
+        json={"error": "rate limited"}, status=429
+    )
+    limiter = AdaptiveLimiter(initial_limit=8, decrease_factor=0.5)
+    synthex = Synthex(api_key="test_api_key", limiter=limiter)
+
+    with pytest.raises(RateLimitError):
+        synthex.credits.promotional()
+
+    assert limiter.limit == 4, "The limit was not cut after a 429 response."
+    assert limiter.in_flight == 0, "The slot was not released."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_client_limiter_releases_slots_of_streamed_errors():
+    """
+    Test that streamed error responses release their slot right away, so that they cannot
+    exhaust the limiter and block the calls that follow them.
+    """
+
+    url = f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}"
+    responses.add(responses.POST, url, json={"error": "unauthorized"}, status=401)
+    responses.add(responses.POST, url, json={"error": "unauthorized"}, status=401)
+    responses.add(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}",
+        json={"message": "ok", "data": {"amount": 7, "currency": "USD"}}, status=200
+    )
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    synthex = Synthex(api_key="test_api_key", limiter=limiter)
+
+    for _ in range(2):
+        with pytest.raises(AuthenticationError):
+            synthex._client.post_stream(CREATE_JOB_WITH_SAMPLES_ENDPOINT, {})
+
+    assert limiter.in_flight == 0, "The slots of the streamed errors were not released."
+    assert limiter.acquire(timeout=0), "The limiter is exhausted."
+    limiter.release(success=True)
+    assert synthex.credits.promotional().amount == 7, "The next call did not go through."
+
+
+class _FailingTransport(Transport):
+    """A transport whose requests all fail with the given error."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        raise self.error
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("error, expected_limit", [
+    (requests.exceptions.ConnectionError("connection reset"), 4),
+    (ValidationError("invalid example"), 8),
+])
+def test_client_limiter_only_counts_network_errors(error: Exception, expected_limit: int):
+    """
+    Test that requests failing with a network error cut the limit, while requests failing on
+    the client side, e.g. while producing their body, release their slot and keep the limit.
+    Args:
+        error (Exception): The error raised by the transport.
+        expected_limit (int): The limit expected after the failed request.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=8, decrease_factor=0.5)
+    client = APIClient("test_api_key", transport=_FailingTransport(error), limiter=limiter)
+
+    with pytest.raises(type(error)):
+        client.post_stream(CREATE_JOB_WITH_SAMPLES_ENDPOINT, {})
+
+    assert limiter.limit == expected_limit, "The limit did not match the kind of error."
+    assert limiter.in_flight == 0, "The slot was not released."
@@ -4,7 +4,7 @@ import pytest
 from synthex import Synthex
 from synthex.endpoints import API_BASE_URL, GET_PROMOTIONAL_CREDITS_ENDPOINT
 from synthex.models import CreditModel
-from synthex.exceptions import NotFoundError, AuthenticationError
+from synthex.exceptions import NotFoundError, AuthenticationError, ServerError
 
 
 @pytest.mark.unit
@@ -99,4 +99,25 @@ def test_promotional_404_failure(synthex: Synthex):
         with pytest.raises(NotFoundError):
             synthex.credits.promotional()
     except AssertionError:
-        pytest.fail("Expected NotFoundError to be raised, but it wasn't.")
\ No newline at end of file
+        pytest.fail("Expected NotFoundError to be raised, but it wasn't.")
+
+
+@pytest.mark.unit
+@responses.activate
+def test_promotional_without_data(synthex: Synthex):
+    """
+    Test that a successful response that carries no data raises a `ServerError`, both directly
+    and when a `ClientPool` refreshes the credits of its members, instead of leaking `None`.
+    Args:
+        synthex (Synthex): An instance of the Synthex class to test.
+    """
+
+    body = {"status_code": 200, "status": "success", "message": "No data", "data": None}
+    responses.add(responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", json=body)
+
+    with pytest.raises(ServerError):
+        synthex.credits.promotional()
+
+    pool = Synthex(api_keys=["key-a", "key-b"], pool_strategy="most_credits")
+    with pytest.raises(ServerError):
+        pool.credits.promotional()
@@ -0,0 +1,196 @@
+import json
+import math
+import sys
+import types
+import responses
+import pytest
+from typing import Any
+
+from synthex import Synthex
+from synthex.dataset import Dataset
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.exceptions import ConfigurationError, ValidationError
+
+
+schema_definition = {
+    "name": {"type": "string"},
+    "age": {"type": "integer"},
+    "score": {"type": "float"},
+}
+
+
+@pytest.mark.unit
+def test_dataset_typed_columns():
+    """
+    Test that `Dataset` stores integer and float columns in typed arrays and string columns as
+    interned strings, and rebuilds rows from them, with None for missing values.
+    """
+
+    dataset = Dataset(schema_definition)
+    dataset.append_rows([
+        {"name": "Ada", "age": 36, "score": 1},
+        {"name": "".join(["A", "da"]), "age": 41, "score": 2.5},
+    ])
+    dataset.append_rows([{"name": "Bob", "age": None, "score": "n/a", "extra": True}])
+
+    assert len(dataset) == 3, "Rows are missing."
+    assert dataset.column("age").typecode == "q", "Integers are not in an int64 array."
+    assert dataset.column("score").typecode == "d", "Floats are not in a float64 array."
+    assert dataset.column("name")[0] is dataset.column("name")[1], "Strings are not interned."
+    assert list(dataset.null_mask("age")) == [0, 0, 1], "Missing integers are not masked."
+    assert math.isnan(dataset.column("score")[2]), "Unconvertible floats are not NaN."
+    assert dataset.null_mask("name") is None, "String columns should not have a mask."
+    assert list(dataset) == [
+        {"name": "Ada", "age": 36, "score": 1.0},
+        {"name": "Ada", "age": 41, "score": 2.5},
+        {"name": "Bob", "age": None, "score": None},
+    ], "Rows were not rebuilt from the columns."
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("row", [
+    {"name": "a", "age": 2 ** 63, "score": 1.0},
+    {"name": "a", "age": 3.7, "score": 1.0},
+    {"name": "a", "age": 1, "score": 10 ** 400},
+])
+def test_dataset_rejects_lossy_values(row: dict[str, Any]):
+    """
+    Test that values that could only be stored with a loss of information (integers out of the
+    int64 range, floats with a fractional part in integer columns, integers beyond the float
+    range) raise a `ValidationError`, and leave the dataset unchanged.
+    Args:
+        row (dict[str, Any]): A row holding a lossy value.
+    """
+
+    dataset = Dataset(schema_definition)
+    dataset.append_rows([{"name": "a", "age": 1, "score": 1.0}])
+
+    with pytest.raises(ValidationError):
+        dataset.append_rows([{"name": "b", "age": 2, "score": 2.0}, row])
+
+    assert list(dataset) == [{"name": "a", "age": 1, "score": 1.0}], "The batch was appended."
+    assert all(len(dataset.column(name)) == 1 for name in schema_definition), \
+        "Columns were left with different lengths."
+    assert dataset.null_mask("age") is None, "A mask was left behind."
+    dataset.append_rows([{"name": "c", "age": 3.0, "score": 3}])
+    assert dataset.row(-1) == {"name": "c", "age": 3, "score": 3.0}, \
+        "Integral floats were not stored as integers."
+
+
+@pytest.mark.unit
+def test_dataset_is_smaller_than_rows():
+    """
+    Test that a `Dataset` takes several times less memory than the equivalent list of dicts.
+    """
+
+    rows = [
+        {"name": ["red", "green", "blue"][i % 3] + "", "age": i, "score": i / 3}
+        for i in range(10_000)
+    ]
+    dataset = Dataset(schema_definition)
+    dataset.append_rows(json.loads(json.dumps(rows)))
+
+    rows_size = sys.getsizeof(rows) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in rows
+    )
+    assert dataset.nbytes * 4 < rows_size, "The dataset is not compact."
+
+
+@pytest.mark.unit
+def test_dataset_export_requires_extras(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that exporting a `Dataset` to NumPy or pandas fails with a `ConfigurationError` when
+    they are not installed.
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+    """
+
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    dataset = Dataset(schema_definition)
+
+    with pytest.raises(ConfigurationError):
+        dataset.to_numpy()
+    with pytest.raises(ConfigurationError):
+        dataset.to_pandas()
+
+
+@pytest.mark.unit
+def test_dataset_to_numpy_shares_buffers(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that `to_numpy` hands the dataset's own arrays to `numpy.frombuffer`, so that numeric
+    columns are exported without copying, using a stand-in for NumPy that exposes the buffers
+    it receives as memoryviews.
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+    """
+
+    fake_numpy = types.SimpleNamespace(
+        int64="int64", float64="float64", frombuffer=lambda buffer, dtype: memoryview(buffer)
+    )
+    monkeypatch.setitem(sys.modules, "numpy", fake_numpy)
+    dataset = Dataset({"age": {"type": "integer"}, "score": {"type": "float"}})
+    dataset.append_rows([{"age": 1, "score": 0.5}, {"age": 2, "score": 1.5}])
+
+    arrays = dataset.to_numpy()
+
+    for name in ("age", "score"):
+        assert arrays[name].obj is dataset.column(name), f"Column '{name}' was copied."
+    arrays["age"][0] = 42
+    assert dataset.column("age")[0] == 42, "The export does not share the column's memory."
+
+
+@pytest.mark.unit
+def test_dataset_to_numpy_and_pandas():
+    """
+    Test that numeric columns are exported to NumPy without copying, and to pandas with
+    nullable integers.
+    """
+
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    dataset = Dataset(schema_definition)
+    dataset.append_rows([{"name": "a", "age": 1, "score": 0.5}, {"name": "b", "age": None}])
+
+    arrays = dataset.to_numpy()
+    assert np.shares_memory(arrays["score"], np.frombuffer(dataset.column("score"))), \
+        "Float columns were copied."
+    assert np.isnan(arrays["age"][1]), "Missing integers are not NaN."
+
+    frame = dataset.to_pandas()
+    assert str(frame["age"].dtype) == "Int64", "Integers are not nullable."
+    assert frame["age"].isna().tolist() == [False, True], "Missing integers are not NA."
+    assert frame["name"].tolist() == ["a", "b"], "Strings are wrong."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_return_dataset(synthex: Synthex, generate_data_params: dict[Any, Any]):
+    """
+    Test that, with `return_dataset=True`, `generate_data` returns the rows of every event in a
+    `Dataset`, and requires `output_path` to be None.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+    """
+
+    rows = generate_data_params["examples"]
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body=f"data: {json.dumps(rows)}\n\ndata: {json.dumps(rows)}\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+    params = {**generate_data_params, "output_path": None}
+
+    response = synthex.jobs.generate_data(**params, return_dataset=True)
+
+    assert isinstance(response.data, Dataset), "No dataset was returned."
+    assert list(response.data) == rows * 2, "The dataset does not hold every row."
+
+    with pytest.raises(ValidationError):
+        synthex.jobs.generate_data(**params)
+    with pytest.raises(ValidationError):
+        synthex.jobs.generate_data(**generate_data_params, return_dataset=True)
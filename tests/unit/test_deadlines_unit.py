@@ -0,0 +1,245 @@
+import json
+import os
+import socket
+import threading
+import time
+import pytest
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from synthex import Synthex
+from synthex.api_client import APIClient
+from synthex.endpoints import GET_PROMOTIONAL_CREDITS_ENDPOINT
+from synthex import deadlines
+from synthex.deadlines import Deadline
+from synthex.exceptions import DeadlineExceededError
+
+
+row = {"question": "Q1", "option-a": "a", "option-b": "b", "option-c": "c", "option-d": "d",
+       "answer": "option-a"}
+
+
+@pytest.fixture
+def stalling_server() -> Iterator[tuple[str, threading.Event]]:
+    """
+    Fixture that runs a server which reads a request, sends the headers of an SSE response and
+    a single event, then stalls until the test ends. Requests to paths containing "silent" get
+    no response at all.
+    Returns:
+        tuple[str, threading.Event]: The base URL of the server, and an event set once the
+            client has closed the connection.
+    """
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    stop = threading.Event()
+    disconnected = threading.Event()
+
+    def serve() -> None:
+        connection, _ = listener.accept()
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += connection.recv(65536)
+        if b"silent" not in request.split(b"\r\n", 1)[0]:
+            while b"POST" in request[:4] and not request.endswith(b"0\r\n\r\n"):
+                chunk = connection.recv(65536)
+                if not chunk:
+                    # The client gave up on the upload.
+                    disconnected.set()
+                    connection.close()
+                    return
+                request += chunk
+            event = b"data: " + json.dumps([row]).encode("utf-8") + b"\n\n"
+            connection.sendall(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n" + f"{len(event):x}\r\n".encode() + event
+                + b"\r\n"
+            )
+        connection.settimeout(0.05)
+        while not stop.is_set():
+            try:
+                if connection.recv(1) == b"":
+                    disconnected.set()
+                    break
+            except socket.timeout:
+                continue
+            except OSError:
+                disconnected.set()
+                break
+        connection.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{listener.getsockname()[1]}", disconnected
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+        listener.close()
+
+
+class _StalledResponse:
+    """A streamed response that sends an event every 0.1s, forever."""
+
+    status_code = 200
+    url = "stalled"
+    headers: dict[str, str] = {}
+
+    def __init__(self) -> None:
+        self.closed = threading.Event()
+
+    def iter_lines(self) -> Iterator[bytes]:
+        while not self.closed.is_set():
+            yield b"data: " + json.dumps([row]).encode("utf-8")
+            time.sleep(0.1)
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+@pytest.mark.unit
+def test_idle_timeout_closes_stalled_stream(
+    generate_data_params: dict[Any, Any], stalling_server: tuple[str, threading.Event],
+    tmp_path: Path
+):
+    """
+    Test that `generate_data` gives up on a stream that stops sending events once the idle
+    timeout expires, closes the connection, and keeps the rows received so far.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        stalling_server (tuple[str, threading.Event]): The stalling server fixture.
+        tmp_path (Path): A temporary directory for the output file.
+    """
+
+    base_url, disconnected = stalling_server
+    synthex = Synthex(api_key="test_api_key")
+    synthex._client.BASE_URL = base_url
+    output_path = tmp_path / "output.jsonl"
+
+    started_at = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        synthex.jobs.generate_data(**{
+            **generate_data_params, "output_type": "jsonl", "output_path": str(output_path),
+            "idle_timeout": 0.5
+        })
+
+    assert time.monotonic() - started_at < 3, "The idle timeout was not enforced promptly."
+    assert disconnected.wait(timeout=5), "The connection was not closed."
+    assert [json.loads(line) for line in output_path.read_text().splitlines()] == [row], \
+        "The partial output was not kept."
+
+
+@pytest.mark.unit
+def test_deadline_deletes_partial_output(
+    generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that the total deadline is enforced on a stream that keeps sending events, and that the
+    partial output is removed with the "delete" policy.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the output file.
+    """
+
+    response = _StalledResponse()
+    synthex = Synthex(api_key="test_api_key")
+    client = synthex._client
+    assert isinstance(client, APIClient)
+
+    def post_stream(
+        endpoint: str, data: Any = None, content: Any = None, timeout: Optional[float] = None
+    ) -> _StalledResponse:
+        return response
+
+    client.post_stream = post_stream  # type: ignore[method-assign, assignment]
+    output_path = tmp_path / "output.csv"
+
+    started_at = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        synthex.jobs.generate_data(**{
+            **generate_data_params, "output_path": str(output_path), "deadline": 0.5,
+            "idle_timeout": 5, "partial_output": "delete"
+        })
+
+    assert time.monotonic() - started_at < 2, "The deadline was not enforced promptly."
+    assert response.closed.is_set(), "The response was not closed."
+    assert not os.path.exists(output_path), "The partial output was not deleted."
+
+
+@pytest.mark.unit
+def test_request_timeout_raises_deadline_exceeded(stalling_server: tuple[str, threading.Event]):
+    """
+    Test that a request to a server that never responds fails with a `DeadlineExceededError`
+    once the per-call timeout expires.
+    Args:
+        stalling_server (tuple[str, threading.Event]): The stalling server fixture.
+    """
+
+    base_url, _ = stalling_server
+    client = APIClient("test_api_key", timeout=5)
+    client.BASE_URL = base_url
+
+    started_at = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        client.get(f"silent/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", timeout=0.3)
+
+    assert time.monotonic() - started_at < 3, "The per-call timeout was not used."
+    client.close()
+
+
+@pytest.mark.unit
+def test_socket_timeout_shrinks_with_total_deadline(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the socket timeout of a call never exceeds the time left until its total deadline.
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to control the clock.
+    """
+
+    now = [100.0]
+    monkeypatch.setattr(deadlines.time, "monotonic", lambda: now[0])
+    clock = Deadline(total=10, idle=4)
+
+    assert clock.socket_timeout == 4, "The idle timeout was not applied."
+    now[0] += 7
+    assert clock.socket_timeout == 3, "The time already spent was not deducted."
+    now[0] += 5
+    assert clock.socket_timeout == 0, "The timeout outlasts the deadline."
+
+
+@pytest.mark.unit
+def test_deadline_bounds_request_upload(
+    generate_data_params: dict[Any, Any], stalling_server: tuple[str, threading.Event],
+    tmp_path: Path
+):
+    """
+    Test that the total deadline is enforced while the request body is uploaded, and not only
+    while the stream is read.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        stalling_server (tuple[str, threading.Event]): The stalling server fixture.
+        tmp_path (Path): A temporary directory for the output file.
+    """
+
+    def slow_examples() -> Iterator[dict[str, str]]:
+        # Each example fills a chunk of the request body, and takes 0.1s to produce.
+        for _ in range(40):
+            time.sleep(0.1)
+            yield {**row, "question": "Q" * 70_000}
+
+    base_url, disconnected = stalling_server
+    synthex = Synthex(api_key="test_api_key")
+    synthex._client.BASE_URL = base_url
+
+    started_at = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        synthex.jobs.generate_data(**{
+            **generate_data_params, "examples": slow_examples(),
+            "output_path": str(tmp_path / "output.csv"), "deadline": 0.5
+        })
+
+    assert time.monotonic() - started_at < 2, "The deadline was not enforced during the upload."
+    assert disconnected.wait(timeout=5), "The upload was not aborted."
@@ -0,0 +1,87 @@
+import responses
+import pytest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from synthex import Synthex
+from synthex.endpoints import API_BASE_URL, GET_PROMOTIONAL_CREDITS_ENDPOINT
+from synthex.http_cache import CacheEntry, HTTPCache
+
+
+credits_body = {
+    "status_code": 200,
+    "status": "success",
+    "message": "Credits retrieved successfully",
+    "data": {"amount": 100, "currency": "USD"}
+}
+
+
+@pytest.mark.unit
+@responses.activate
+def test_conditional_get_served_from_cache(tmp_path: Path):
+    """
+    Test that, when the HTTP cache is enabled, a GET response carrying an ETag is stored, the
+    following request for the same resource carries an `If-None-Match` header, and a 304 response
+    is served from the cache.
+    Args:
+        tmp_path (Path): A temporary directory used as cache directory.
+    """
+
+    url = f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}"
+    responses.add(responses.GET, url, json=credits_body, headers={"ETag": '"v1"'}, status=200)
+    responses.add(responses.GET, url, status=304)
+
+    synthex = Synthex(api_key="test_api_key", cache_dir=str(tmp_path))
+    first = synthex.credits.promotional()
+    second = synthex.credits.promotional()
+
+    assert responses.calls[0].request.headers.get("If-None-Match") is None, \
+        "The first request should not be conditional."
+    assert responses.calls[1].request.headers.get("If-None-Match") == '"v1"', \
+        "The second request should carry the cached ETag."
+    assert second == first, "The 304 response was not served from the cache."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_cache_is_scoped_to_api_key(tmp_path: Path):
+    """
+    Test that clients with different API keys sharing a cache directory do not revalidate
+    against each other's cache entries.
+    Args:
+        tmp_path (Path): A temporary directory used as cache directory.
+    """
+
+    url = f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}"
+    responses.add(responses.GET, url, json=credits_body, headers={"ETag": '"v1"'}, status=200)
+
+    Synthex(api_key="first_api_key", cache_dir=str(tmp_path)).credits.promotional()
+    Synthex(api_key="second_api_key", cache_dir=str(tmp_path)).credits.promotional()
+
+    assert responses.calls[1].request.headers.get("If-None-Match") is None, \
+        "A cache entry was shared between different API keys."
+
+
+@pytest.mark.unit
+def test_cache_concurrent_writes_are_atomic(tmp_path: Path):
+    """
+    Test that concurrent writers to the same cache entry never leave a partially written entry
+    behind, nor temporary files.
+    Args:
+        tmp_path (Path): A temporary directory used as cache directory.
+    """
+
+    cache = HTTPCache(str(tmp_path))
+    key = cache.key("https://example.com/resource")
+
+    def write(i: int) -> None:
+        cache.set(key, CacheEntry(url="https://example.com/resource", etag=f'"{i}"', body="x" * i))
+        assert cache.get(key) is not None, "A reader observed a partially written entry."
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(200)))
+
+    entry = cache.get(key)
+    assert entry is not None and entry.body == "x" * int(entry.etag.strip('"')), \
+        "The cache entry is inconsistent."
+    assert [p.name for p in tmp_path.iterdir()] == [f"{key}.json"], "Temporary files were left behind."
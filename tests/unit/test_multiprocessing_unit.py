@@ -0,0 +1,157 @@
+import os
+import pickle
+import multiprocessing
+import threading
+import pytest
+from pathlib import Path
+
+from synthex import Synthex
+from synthex.api_client import APIClient
+from synthex.client_pool import ClientPool
+from synthex.concurrency import AdaptiveLimiter
+from synthex.profiling import Profiler
+from synthex.recording import RecordingTransport
+from synthex.transports import RequestsTransport
+
+
+def _fetch_amount(synthex: Synthex) -> int:
+    return synthex.credits.promotional().amount
+
+
+@pytest.mark.unit
+def test_synthex_pickle_roundtrip(local_server: str):
+    """
+    Test that a `Synthex` instance that already holds open connections can be pickled, that only
+    its configuration travels, and that the unpickled copy works with fresh connections.
+    Args:
+        local_server (str): The base URL of the local stand-in server.
+    """
+
+    synthex = Synthex(api_key="test_api_key")
+    client = synthex._client
+    assert isinstance(client, APIClient)
+    client.BASE_URL = local_server
+    _fetch_amount(synthex)
+
+    copy = pickle.loads(pickle.dumps(synthex))
+    copy_client = copy._client
+
+    assert isinstance(copy_client, APIClient)
+    assert copy_client.API_KEY == "test_api_key", "The API key was not preserved."
+    assert copy_client.BASE_URL == local_server, "The base URL was not preserved."
+    assert copy_client.session is not client.session, "The session was not recreated."
+    assert copy.jobs._client is copy_client, "The API modules do not share the client."
+    assert _fetch_amount(copy) == 100, "The unpickled instance does not work."
+
+
+@pytest.mark.unit
+def test_client_pool_pickle_roundtrip():
+    """
+    Test that a `Synthex` instance backed by a `ClientPool` can be pickled, and that its routing
+    bookkeeping is reset in the copy.
+    """
+
+    synthex = Synthex(api_keys=["key-a", "key-b"], pool_strategy="least_in_flight")
+    pool = synthex._client
+    assert isinstance(pool, ClientPool)
+    pool.members[0].in_flight = 3
+
+    copy = pickle.loads(pickle.dumps(synthex))._client
+
+    assert isinstance(copy, ClientPool)
+    assert copy.strategy == "least_in_flight", "The strategy was not preserved."
+    assert [m.client.API_KEY for m in copy.members] == ["key-a", "key-b"], \
+        "The API keys were not preserved."
+    assert [m.in_flight for m in copy.members] == [0, 0], "The bookkeeping was not reset."
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not available on this platform")
+# The local server runs on a thread, which makes Python warn about forking.
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_forked_child_rebuilds_connection_pool(local_server: str):
+    """
+    Test that a forked child process does not reuse the sessions, and therefore the sockets, of
+    its parent, and that both processes can keep using the client.
+    Args:
+        local_server (str): The base URL of the local stand-in server.
+    """
+
+    synthex = Synthex(api_key="test_api_key")
+    client = synthex._client
+    assert isinstance(client, APIClient)
+    client.BASE_URL = local_server
+    _fetch_amount(synthex)
+    parent_session = client.session
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    def child() -> None:
+        queue.put((client.session is parent_session, _fetch_amount(synthex)))
+
+    process = context.Process(target=child)
+    process.start()
+    shared, amount = queue.get(timeout=10)
+    process.join(timeout=10)
+
+    assert process.exitcode == 0, "The child process failed."
+    assert not shared, "The child process reused the parent's session."
+    assert amount == 100, "The child process could not use the client."
+    assert client.session is parent_session, "The parent's session was replaced."
+    assert _fetch_amount(synthex) == 100, "The parent can no longer use the client."
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not available on this platform")
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_forked_child_resets_locks_and_counters(tmp_path: Path):
+    """
+    Test that a child forked while another thread holds the locks of a limiter, a profiler and a
+    recording transport can still use them, and does not inherit the requests in flight or the
+    call being profiled of its parent.
+    Args:
+        tmp_path (Path): A temporary directory for the profiling reports and the recording.
+    """
+
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    assert limiter.acquire() and limiter.acquire()
+    profiler = Profiler(str(tmp_path))
+    recorder = RecordingTransport(RequestsTransport(), str(tmp_path / "recording.jsonl.gz"))
+    holding, release = threading.Event(), threading.Event()
+
+    def hold_locks() -> None:
+        with limiter._condition, profiler._lock, recorder._lock:
+            profiler._busy = True
+            holding.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold_locks)
+    thread.start()
+    holding.wait()
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    def child() -> None:
+        acquired = limiter.acquire(timeout=1)
+        with profiler.profile("child"):
+            pass
+        queue.put((acquired, limiter.in_flight, profiler.last_report is not None,
+                   recorder._lock.acquire(timeout=1)))
+
+    process = context.Process(target=child)
+    process.start()
+    try:
+        acquired, in_flight, profiled, recorder_free = queue.get(timeout=10)
+        process.join(timeout=10)
+    finally:
+        release.set()
+        thread.join()
+        process.kill()
+
+    assert acquired and in_flight == 1, "The child inherited the parent's requests in flight."
+    assert profiled, "The child inherited the parent's profiled call."
+    assert recorder_free, "The child inherited the recorder's held lock."
+    assert process.exitcode == 0, "The child process failed."
+    assert limiter.in_flight == 2, "The parent's requests in flight were reset."
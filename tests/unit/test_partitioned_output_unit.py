@@ -0,0 +1,135 @@
+import csv
+import json
+import os
+import responses
+import pytest
+from pathlib import Path
+from typing import Any
+
+from synthex import Synthex
+from synthex.config import OUTPUT_NULL_PARTITION_NAME
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.exceptions import ValidationError
+from synthex.writers import OutputManifest, PartitionedWriter
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    return [{"id": i, "color": ["red", "blue/green"][i % 2]} for i in range(count)]
+
+
+def _read_csv(path: Path) -> list[dict[str, str]]:
+    with open(path, mode="r", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.unit
+def test_partitioned_writer_rotates_by_rows(tmp_path: Path):
+    """
+    Test that rows are split into files of at most `rotate_rows` rows, across batches, and that
+    the manifest lists every file with its row count.
+    Args:
+        tmp_path (Path): A temporary directory.
+    """
+
+    with PartitionedWriter("csv", str(tmp_path / "data.csv"), rotate_rows=4) as writer:
+        writer.write_rows(_rows(3))
+        writer.write_rows(_rows(7))
+
+    manifest = OutputManifest.model_validate_json((tmp_path / "data.manifest.json").read_text())
+    assert [(f.path, f.rows) for f in manifest.files] == [
+        ("data-00000.csv", 4), ("data-00001.csv", 4), ("data-00002.csv", 2)
+    ], "Files were not rotated every 4 rows."
+    assert manifest.rows == 10, "The manifest's row count is wrong."
+    for file in manifest.files:
+        assert len(_read_csv(tmp_path / file.path)) == file.rows, "A file has the wrong rows."
+        assert os.path.getsize(tmp_path / file.path) == file.bytes, "A file has the wrong size."
+
+
+@pytest.mark.unit
+def test_partitioned_writer_partitions_and_rotates_by_bytes(tmp_path: Path):
+    """
+    Test that rows are written to one subdirectory per value of the partition column, with
+    values escaped, and that files are completed once they reach `rotate_bytes`.
+    Args:
+        tmp_path (Path): A temporary directory.
+    """
+
+    with PartitionedWriter(
+        "jsonl", str(tmp_path / "data.jsonl"), rotate_bytes=40, partition_by="color"
+    ) as writer:
+        for _ in range(4):
+            writer.write_rows(_rows(4))
+
+    manifest = OutputManifest.model_validate_json((tmp_path / "data.manifest.json").read_text())
+    assert {f.path for f in manifest.files} >= {
+        os.path.join("color=red", "data-00000.jsonl"),
+        os.path.join("color=blue%2Fgreen", "data-00000.jsonl"),
+    }, "Rows were not partitioned by color."
+    assert all(f.rows == 2 for f in manifest.files), "Files were not completed after 40 bytes."
+    for file in manifest.files:
+        with open(tmp_path / file.path, mode="r", encoding="utf-8") as f:
+            colors = {json.loads(line)["color"] for line in f}
+        assert colors == set(file.partition.values()), "A file holds rows of another partition."
+
+
+@pytest.mark.unit
+def test_partitioned_writer_null_partition(tmp_path: Path):
+    """
+    Test that rows whose partition column is missing or null are written to the dedicated null
+    partition, rather than to a partition named after `None`.
+    Args:
+        tmp_path (Path): A temporary directory.
+    """
+
+    rows = [{"id": 0, "color": None}, {"id": 1}, {"id": 2, "color": "red"}]
+    with PartitionedWriter("jsonl", str(tmp_path / "data.jsonl"), partition_by="color") as writer:
+        writer.write_rows(rows)
+
+    manifest = OutputManifest.model_validate_json((tmp_path / "data.manifest.json").read_text())
+    partitions = {f.path: (f.partition, f.rows) for f in manifest.files}
+    assert partitions == {
+        os.path.join(f"color={OUTPUT_NULL_PARTITION_NAME}", "data-00000.jsonl"): (
+            {"color": OUTPUT_NULL_PARTITION_NAME}, 2
+        ),
+        os.path.join("color=red", "data-00000.jsonl"): ({"color": "red"}, 1),
+    }, "Rows without a partition value were not written to the null partition."
+    assert not (tmp_path / "color=None").exists(), "A 'None' partition was created."
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_partitioned_output(
+    synthex: Synthex, generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that `generate_data` writes partitioned output, and rejects partition columns that are
+    not in the schema definition.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory.
+    """
+
+    example = generate_data_params["examples"][0]
+    events = [[{**example, "answer": answer}] * 3 for answer in ["option-a", "option-b"]]
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body="".join(f"data: {json.dumps(event)}\n\n" for event in events),
+        content_type="text/event-stream",
+        status=200
+    )
+    params = {**generate_data_params, "output_path": str(tmp_path / "out.csv")}
+
+    synthex.jobs.generate_data(**params, rotate_rows=2, partition_by="answer")
+
+    manifest = OutputManifest.model_validate_json((tmp_path / "out.manifest.json").read_text())
+    assert manifest.rows == 6, "Rows are missing from the output."
+    assert sorted(f.path for f in manifest.files) == [
+        os.path.join(f"answer={answer}", f"out-0000{i}.csv")
+        for answer in ["option-a", "option-b"] for i in range(2)
+    ], "Files were not partitioned and rotated."
+    assert not (tmp_path / "out.csv").exists(), "A monolithic output file was written."
+
+    with pytest.raises(ValidationError):
+        synthex.jobs.generate_data(**params, partition_by="unknown")
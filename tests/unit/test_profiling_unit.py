@@ -0,0 +1,143 @@
+import json
+import os
+import responses
+import pytest
+from pathlib import Path
+from typing import Any, Iterator
+
+from synthex import Synthex, profiling
+from synthex.endpoints import API_BASE_URL, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.profiling import PROFILE_CATEGORIES, categorize, get_profiler, profiled
+
+
+@pytest.fixture(autouse=True)
+def reset_profiling(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """
+    Restore the process-wide profiling state after each test.
+    """
+
+    monkeypatch.setattr(profiling, "_profiler", None)
+    monkeypatch.setattr(profiling, "_profiler_resolved", False)
+    monkeypatch.delenv("SYNTHEX_PROFILE_DIR", raising=False)
+    yield
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("function, category", [
+    (("/usr/lib/python3/socket.py", 1, "readinto"), "network wait"),
+    (("~", 0, "<method 'recv_into' of '_ssl._SSLSocket' objects>"), "network wait"),
+    (("/site-packages/synthex/streaming.py", 1, "iter_sse_payloads"), "SSE parsing"),
+    (("/usr/lib/python3/json/decoder.py", 1, "raw_decode"), "JSON decoding"),
+    (("/site-packages/pydantic/main.py", 1, "__init__"), "validation"),
+    (("~", 0, "<method 'write' of '_io.BufferedWriter' objects>"), "file writes"),
+    (("/site-packages/synthex/sampling.py", 1, "select_examples"), "other"),
+])
+def test_categorize(function: tuple[str, int, str], category: str):
+    """
+    Test that functions of a profile are assigned to the category of the code they belong to.
+    Args:
+        function (tuple[str, int, str]): The function, as keyed in `pstats.Stats`.
+        category (str): The expected category.
+    """
+
+    assert categorize(function) == category, f"{function} is not in '{category}'."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_generate_data_profiled(generate_data_params: dict[Any, Any], tmp_path: Path):
+    """
+    Test that, with a `profile_dir`, a call to `generate_data` writes a single report (the calls
+    it makes to the API client are not profiled separately), which splits its time into
+    categories.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory.
+    """
+
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body=f"data: {json.dumps(generate_data_params['examples'] * 100)}\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+    synthex = Synthex(profile_dir=str(tmp_path / "profiles"))
+
+    synthex.jobs.generate_data(
+        **{**generate_data_params, "output_path": str(tmp_path / "out.csv")}
+    )
+
+    report = synthex._client.profiler.last_report
+    assert report is not None and report.name == "JobsAPI.generate_data", "No report was made."
+    assert sorted(os.listdir(tmp_path / "profiles")) == sorted([
+        os.path.basename(report.report_path), os.path.basename(report.stats_path)
+    ]), "Nested calls were profiled separately."
+    assert set(report.categories) == {name for name, _ in PROFILE_CATEGORIES} | {"other"}, \
+        "Categories are missing from the report."
+    assert report.categories["validation"] > 0, "Validation time was not measured."
+    assert report.peak_memory > 0, "Memory was not traced."
+    with open(report.report_path, mode="r", encoding="utf-8") as f:
+        assert "network wait" in f.read(), "The report does not list the categories."
+
+
+@pytest.mark.unit
+def test_profiling_enabled_from_environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that profiling is enabled by the SYNTHEX_PROFILE_DIR environment variable.
+    Args:
+        tmp_path (Path): A temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+    """
+
+    monkeypatch.setenv("SYNTHEX_PROFILE_DIR", str(tmp_path))
+
+    profiler = get_profiler()
+
+    assert profiler is not None and profiler.output_dir == str(tmp_path), \
+        "Profiling was not enabled."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_profiling_is_scoped_to_the_client(generate_data_params: dict[Any, Any], tmp_path: Path):
+    """
+    Test that giving a `profile_dir` to one client does not profile the calls of the others.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory.
+    """
+
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body=f"data: {json.dumps(generate_data_params['examples'])}\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+    profiled_client = Synthex(profile_dir=str(tmp_path / "profiles"))
+    other_client = Synthex()
+
+    other_client.jobs.generate_data(
+        **{**generate_data_params, "output_path": str(tmp_path / "out.csv")}
+    )
+
+    assert other_client._client.profiler is None, "The other client has a profiler."
+    assert profiled_client._client.profiler.last_report is None, \
+        "The call of the other client was profiled."
+    assert not (tmp_path / "profiles").exists(), "A report was written for the other client."
+
+
+@pytest.mark.unit
+def test_profiled_leaves_generator_functions_alone():
+    """
+    Test that `profiled` does not wrap generator functions, whose calls only create the
+    generator.
+    """
+
+    def rows(self: Any) -> Iterator[int]:
+        yield 1
+
+    assert profiled(rows) is rows, "A generator function was wrapped."
@@ -0,0 +1,104 @@
+import responses
+import pytest
+import gzip
+import time
+from pathlib import Path
+from typing import Any
+
+from synthex import Synthex
+from synthex.api_client import APIClient
+from synthex.credits_api import CreditsAPI
+from synthex.jobs_api import JobsAPI
+from synthex.endpoints import (
+    API_BASE_URL, GET_PROMOTIONAL_CREDITS_ENDPOINT, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+)
+from synthex.exceptions import ConfigurationError
+from synthex.recording import RecordedExchange, ReplayTransport, _ReplayResponse
+
+
+sse_body = 'data: [{"question": "Q1", "option-a": "a", "option-b": "b", "option-c": "c", ' \
+    '"option-d": "d", "answer": "option-a"}]\n\n'
+
+
+def _record(path: Path, generate_data_params: dict[Any, Any]) -> None:
+    """
+    Record a credits request and a data generation stream through a mocked API.
+    """
+
+    with responses.RequestsMock() as mock:
+        mock.add(
+            responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}",
+            json={"message": "ok", "data": {"amount": 42, "currency": "USD"}}, status=200
+        )
+        mock.add(
+            responses.POST, f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+            body=sse_body, content_type="text/event-stream", status=200
+        )
+        client = APIClient("secret_api_key", record_to=str(path))
+        CreditsAPI(client).promotional()
+        JobsAPI(client).generate_data(**generate_data_params)
+
+
+@pytest.mark.unit
+def test_record_and_replay_roundtrip(generate_data_params: dict[Any, Any], tmp_path: Path):
+    """
+    Test that requests recorded by an `APIClient` in recording mode are served by a
+    `ReplayTransport` without any network access, producing the same results, and that the API
+    key is never written to the recording.
+    Args:
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the recording and the output files.
+    """
+
+    recording = tmp_path / "recording.jsonl.gz"
+    params = {**generate_data_params, "output_path": str(tmp_path / "recorded.csv")}
+    _record(recording, params)
+
+    content = gzip.open(recording).read()
+    assert b"secret_api_key" not in content, "The API key was recorded."
+
+    # responses is not active here: any real network access would fail.
+    replay = Synthex(api_key="other_api_key", transport=ReplayTransport(str(recording)))
+    assert replay.credits.promotional().amount == 42, "The recorded response was not replayed."
+    replay.jobs.generate_data(**params)
+
+    assert (tmp_path / "recorded.csv").read_text().count("Q1") == 1, \
+        "The recorded stream was not replayed."
+
+
+@pytest.mark.unit
+def test_replay_unknown_request(tmp_path: Path):
+    """
+    Test that a `ReplayTransport` raises a `ConfigurationError` for requests it has no recording
+    for.
+    Args:
+        tmp_path (Path): A temporary directory for the recording.
+    """
+
+    recording = tmp_path / "recording.jsonl.gz"
+    gzip.open(recording, "wb").close()
+
+    synthex = Synthex(api_key="test_api_key", transport=ReplayTransport(str(recording)))
+    with pytest.raises(ConfigurationError):
+        synthex.credits.promotional()
+
+
+@pytest.mark.unit
+def test_replay_realtime_timing():
+    """
+    Test that, in realtime mode, replayed streams reproduce the recorded timing of their lines,
+    scaled by the replay speed.
+    """
+
+    exchange = RecordedExchange(
+        key="", method="POST", url="https://example.com", status_code=200, headers={},
+        lines=["data: []", "data: []"], offsets=[0.0, 0.4]
+    )
+
+    start = time.monotonic()
+    lines = list(_ReplayResponse(exchange, realtime=True, speed=2.0).iter_lines())
+    elapsed = time.monotonic() - start
+
+    assert lines == [b"data: []", b"data: []"], "The recorded lines were altered."
+    assert 0.15 <= elapsed < 0.4, f"The recorded timing was not reproduced ({elapsed:.2f}s)."
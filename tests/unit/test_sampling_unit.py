@@ -0,0 +1,81 @@
+import random
+import pytest
+from typing import Any
+
+from synthex.exceptions import ValidationError
+from synthex.sampling import select_examples
+
+
+schema_definition = {
+    "city": {"type": "string"},
+    "surface": {"type": "float"},
+    "description": {"type": "string"},
+}
+
+
+def _seed_set(count: int) -> list[dict[str, Any]]:
+    """
+    Build a seed set where a few cities are rare, and most surfaces are clustered around 100.
+    """
+
+    rng = random.Random(0)
+    examples = [
+        {
+            "city": rng.choice(["Denver", "Denver", "Denver", "Nashville", "Springfield"]),
+            "surface": rng.gauss(100, 5),
+            "description": "A flat" + "!" * rng.randint(0, 200),
+        }
+        for _ in range(count)
+    ]
+    if count > 1000:
+        examples[123]["city"] = "Anchorage"
+        examples[456]["surface"] = 1000.0
+        examples[789]["surface"] = 1.0
+    return examples
+
+
+@pytest.mark.unit
+def test_select_examples_covers_values_and_spread():
+    """
+    Test that the selected examples include every city, even rare ones, and the extremes of the
+    numeric columns.
+    """
+
+    examples = _seed_set(10000)
+    selected = select_examples(examples, schema_definition, k=10)
+
+    assert len(selected) == 10, "The wrong number of examples was selected."
+    assert {example["city"] for example in selected} == \
+        {"Denver", "Nashville", "Springfield", "Anchorage"}, "Some cities are not represented."
+    surfaces = [example["surface"] for example in selected]
+    assert min(surfaces) == 1.0 and max(surfaces) == 1000.0, "The numeric spread is not covered."
+    assert selected == [example for example in examples if example in selected], \
+        "The original order was not preserved."
+
+
+@pytest.mark.unit
+def test_select_examples_is_deterministic():
+    """
+    Test that the same seed always selects the same examples.
+    """
+
+    examples = _seed_set(2000)
+    first = select_examples(examples, schema_definition, k=20, seed=7)
+
+    assert first == select_examples(iter(examples), schema_definition, k=20, seed=7), \
+        "The same seed selected different examples."
+
+
+@pytest.mark.unit
+def test_select_examples_small_seed_set():
+    """
+    Test that every example is returned when there are no more than k of them, and that a
+    non-positive k is rejected.
+    """
+
+    examples = _seed_set(3)
+
+    assert select_examples(examples, schema_definition, k=5) == examples, \
+        "Examples were dropped from a small seed set."
+    with pytest.raises(ValidationError):
+        select_examples(examples, schema_definition, k=0)
@@ -0,0 +1,192 @@
+import json
+import responses
+import pytest
+from pathlib import Path
+from typing import Any
+
+from synthex import Synthex
+from synthex.endpoints import (
+    API_BASE_URL, GET_PROMOTIONAL_CREDITS_ENDPOINT, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+)
+from synthex.exceptions import InsufficientCreditsError, ValidationError
+from synthex.scheduler import CreditScheduler
+
+
+def _mock_credits(amount: int) -> None:
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}",
+        json={
+            "status_code": 200,
+            "status": "success",
+            "message": "Credits retrieved successfully",
+            "data": {"amount": amount, "currency": "USD"}
+        },
+        status=200
+    )
+
+
+def _jobs(
+    generate_data_params: dict[Any, Any], tmp_path: Path, samples: list[int]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "schema_definition": generate_data_params["schema_definition"],
+            "examples": generate_data_params["examples"],
+            "requirements": generate_data_params["requirements"],
+            "number_of_samples": number_of_samples,
+            "output_path": str(tmp_path / f"output-{i}.csv"),
+        }
+        for i, number_of_samples in enumerate(samples)
+    ]
+
+
+@pytest.mark.unit
+@responses.activate
+def test_scheduler_check_rejects_unaffordable_plan(
+    synthex: Synthex, generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that `CreditScheduler.check` estimates the cost of a plan and raises an
+    `InsufficientCreditsError` when it exceeds the credits balance.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the output files.
+    """
+
+    _mock_credits(100)
+    scheduler = CreditScheduler(synthex, cost_per_sample=2)
+
+    assert scheduler.check(_jobs(generate_data_params, tmp_path, [20, 30])) == 100, \
+        "The estimated cost is wrong."
+    with pytest.raises(InsufficientCreditsError):
+        scheduler.check(_jobs(generate_data_params, tmp_path, [20, 31]))
+
+
+@pytest.mark.unit
+@responses.activate
+def test_scheduler_run_stops_before_budget_is_exceeded(
+    synthex: Synthex, generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that `CreditScheduler.run` submits jobs only while the balance covers them, stops
+    submitting once a job is refused, and retrieves the balance once rather than per job.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the output files.
+    """
+
+    _mock_credits(50)
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body="data: []\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+    scheduler = CreditScheduler(synthex, cost_per_sample=1)
+
+    results = scheduler.run(_jobs(generate_data_params, tmp_path, [20, 20, 20, 5]), max_workers=2)
+
+    assert [r.admitted for r in results] == [True, True, False, False], \
+        "Jobs were admitted beyond the available balance."
+    assert all(r.error is None for r in results), "Admitted jobs failed."
+    assert scheduler.spent == 40, "The spent credits are wrong."
+    posts = [c for c in responses.calls if c.request.method == "POST"]
+    gets = [c for c in responses.calls if c.request.method == "GET"]
+    assert len(posts) == 2, "Refused jobs were submitted."
+    assert len(gets) == 1, "The balance was retrieved more than once."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_scheduler_budget_cap(synthex: Synthex):
+    """
+    Test that an explicit budget caps the credits a `CreditScheduler` admits, regardless of the
+    account balance.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+    """
+
+    _mock_credits(1000)
+    scheduler = CreditScheduler(synthex, cost_per_sample=1, budget=30)
+
+    assert scheduler.admit(20), "A job within the budget was refused."
+    assert not scheduler.admit(20), "A job beyond the budget was admitted."
+    scheduler.complete(20)
+    assert scheduler.available() == 10, "The remaining budget is wrong."
+
+
+@pytest.mark.unit
+@responses.activate
+def test_scheduler_run_rechecks_balance_between_admissions(
+    synthex: Synthex, generate_data_params: dict[Any, Any], tmp_path: Path
+):
+    """
+    Test that `CreditScheduler.run` admits jobs only as workers free up, so that a balance that
+    runs out while the first jobs run keeps the later ones from being started.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the output files.
+    """
+
+    def credits(_: Any) -> tuple[int, dict[str, str], str]:
+        # The balance runs out as soon as a job has been run.
+        started = any(c.request.method == "POST" for c in responses.calls)
+        amount = 5 if started else 1000
+        return 200, {}, json.dumps({"message": "ok", "data": {"amount": amount, "currency": "USD"}})
+
+    responses.add_callback(
+        responses.GET, f"{API_BASE_URL}/{GET_PROMOTIONAL_CREDITS_ENDPOINT}", callback=credits
+    )
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/{CREATE_JOB_WITH_SAMPLES_ENDPOINT}",
+        body="data: []\n\n",
+        content_type="text/event-stream",
+        status=200
+    )
+    scheduler = CreditScheduler(synthex, cost_per_sample=1, refresh_interval=0)
+
+    results = scheduler.run(_jobs(generate_data_params, tmp_path, [10, 10, 10]))
+
+    assert [r.admitted for r in results] == [True, False, False], \
+        "Jobs were admitted against a balance that had run out."
+    posts = [c for c in responses.calls if c.request.method == "POST"]
+    assert len(posts) == 1, "Jobs were started after the balance ran out."
+
+
+@pytest.mark.unit
+@responses.activate
+@pytest.mark.parametrize("number_of_samples", ["many", None])
+def test_scheduler_rejects_non_numeric_plan(
+    synthex: Synthex, generate_data_params: dict[Any, Any], tmp_path: Path,
+    number_of_samples: Any
+):
+    """
+    Test that a plan with a job whose number of samples is not a number is rejected with a
+    `ValidationError`, before any job is submitted.
+    Args:
+        synthex (Synthex): An instance of the `Synthex` class.
+        generate_data_params (dict[Any, Any]): A dictionary containing parameters for the
+            `generate_data` method.
+        tmp_path (Path): A temporary directory for the output files.
+        number_of_samples (Any): The invalid number of samples of the last job.
+    """
+
+    _mock_credits(1000)
+    jobs = _jobs(generate_data_params, tmp_path, [10, 10])
+    jobs[-1]["number_of_samples"] = number_of_samples
+    scheduler = CreditScheduler(synthex, cost_per_sample=1)
+
+    with pytest.raises(ValidationError):
+        scheduler.run(jobs)
+
+    assert not [c for c in responses.calls if c.request.method == "POST"], \
+        "Jobs were submitted before the plan was rejected."
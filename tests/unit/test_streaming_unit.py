@@ -0,0 +1,214 @@
+import json
+import tracemalloc
+import threading
+import time
+import pytest
+from pathlib import Path
+from typing import Iterator
+
+from synthex.config import INCREMENTAL_PARSE_WINDOW_BYTES
+from synthex.writers import JsonlWriter
+from synthex.streaming import ThreadedReader, iter_json_array, iter_row_batches, iter_sse_payloads
+
+
+@pytest.mark.unit
+def test_iter_sse_payloads_strips_framing():
+    """
+    Test that `iter_sse_payloads` yields the payload of `data:` events only, without the SSE
+    prefix and surrounding whitespace.
+    """
+
+    lines = [b"", b": keep-alive", b"data: [1, 2] ", b"event: done", b"data: []"]
+
+    assert list(iter_sse_payloads(lines)) == [b"[1, 2]", b"[]"], "SSE framing was not stripped."
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("payload", [
+    b'[{"a": 1}, {"b": [1, 2]}, "x", null]', b' [ {"a" : "]"} , 2 ] ', b"[]", b"[ ]",
+])
+def test_iter_json_array_matches_json_loads(payload: bytes):
+    """
+    Test that `iter_json_array` yields the same elements as `json.loads`, whatever the
+    whitespace between them.
+    Args:
+        payload (bytes): A JSON array.
+    """
+
+    assert list(iter_json_array(payload)) == json.loads(payload), "Elements were not decoded."
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("window_size", [1, 2, 3, 7])
+def test_iter_json_array_across_windows(window_size: int):
+    """
+    Test that `iter_json_array` decodes elements, numbers and multi-byte characters that span
+    the boundaries of its decoding windows.
+    Args:
+        window_size (int): The number of bytes decoded at a time.
+    """
+
+    rows = [{"text": "héllo wörld €", "n": 123456789}, 3.25, -17, "日本語", [], {}, True]
+    payload = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+
+    assert list(iter_json_array(payload, window_size)) == rows, "Elements were not decoded."
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(payload + b" 1", window_size))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("window_size, count", [
+    (1, 200), (7, 200), (16, 200), (INCREMENTAL_PARSE_WINDOW_BYTES, 5000)
+])
+def test_iter_json_array_raw_across_windows(window_size: int, count: int):
+    """
+    Test that the source text of elements spanning the boundaries of the decoding windows is
+    yielded whole, including with the default window on a payload several windows long.
+    Args:
+        window_size (int): The number of bytes decoded at a time.
+        count (int): The number of elements, enough for the payload to span many windows.
+    """
+
+    rows = [{"id": i, "text": "héllo wörld € " * (i % 7), "score": i / 3} for i in range(count)]
+    payload = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+    assert len(payload) > 4 * window_size
+
+    sources = list(iter_json_array(payload, window_size, raw=True))
+
+    assert [json.loads(source) for source in sources] == rows, "Elements were cut."
+
+
+@pytest.mark.unit
+def test_jsonl_passthrough_of_large_payload(tmp_path: Path):
+    """
+    Test that `JsonlWriter.write_payload` writes one parsable line per row of an event larger
+    than the decoding window.
+    Args:
+        tmp_path (Path): A temporary directory for the output file.
+    """
+
+    rows = [{"id": i, "text": "x" * (i % 100)} for i in range(5000)]
+    payload = json.dumps(rows).encode("utf-8")
+    assert len(payload) > INCREMENTAL_PARSE_WINDOW_BYTES
+    path = tmp_path / "output.jsonl"
+
+    with JsonlWriter(str(path)) as writer:
+        writer.write_payload(payload)
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == rows, \
+        "The rows were not written one per line."
+
+
+@pytest.mark.unit
+def test_iter_json_array_memory_does_not_grow_with_payload():
+    """
+    Test that decoding a large payload with `iter_json_array` allocates far less than the size
+    of the payload, i.e. that no decoded copy of the whole payload is made.
+    """
+
+    payload = json.dumps([{"id": i, "text": "x" * 100} for i in range(40_000)]).encode("utf-8")
+
+    tracemalloc.start()
+    try:
+        for _ in iter_json_array(payload):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < len(payload) / 10, f"Decoding allocated {peak} bytes for {len(payload)}."
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("payload", [b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1] 2'])
+def test_iter_json_array_rejects_invalid_payloads(payload: bytes):
+    """
+    Test that `iter_json_array` raises `json.JSONDecodeError` for payloads that are not valid
+    JSON arrays.
+    Args:
+        payload (bytes): An invalid payload.
+    """
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(payload))
+
+
+@pytest.mark.unit
+def test_iter_row_batches_decodes_large_payloads_incrementally():
+    """
+    Test that `iter_row_batches` decodes small payloads at once, and large ones in batches that
+    are yielded before the rest of the payload is decoded.
+    """
+
+    rows = [{"id": i} for i in range(10)]
+    payload = json.dumps(rows).encode("utf-8")
+
+    assert list(iter_row_batches(payload, batch_size=4)) == [rows], "Small payload was split."
+
+    batches = iter_row_batches(payload + b"garbage", batch_size=4, min_incremental_size=0)
+    assert next(batches) == rows[:4], "The first batch was not yielded."
+    assert next(batches) == rows[4:8], "The second batch was not yielded."
+    with pytest.raises(json.JSONDecodeError):
+        next(batches)
+
+
+@pytest.mark.unit
+def test_threaded_reader_yields_all_items():
+    """
+    Test that `ThreadedReader` yields every item of the source, in order, and calls `on_close`
+    once exhausted.
+    """
+
+    closed = threading.Event()
+    reader = ThreadedReader(iter(range(100)), maxsize=4, on_close=closed.set)
+
+    assert list(reader) == list(range(100)), "Items were lost or reordered."
+    assert closed.is_set(), "on_close was not called."
+
+
+@pytest.mark.unit
+def test_threaded_reader_propagates_reader_failure():
+    """
+    Test that an exception raised while reading the source is re-raised in the consuming thread,
+    after the items read before the failure.
+    """
+
+    def failing_source() -> Iterator[int]:
+        yield 1
+        raise ConnectionError("connection reset")
+
+    reader = ThreadedReader(failing_source())
+    received: list[int] = []
+
+    with pytest.raises(ConnectionError):
+        for item in reader:
+            received.append(item)
+    assert received == [1], "Items read before the failure were not delivered."
+
+
+@pytest.mark.unit
+def test_threaded_reader_backpressure_and_consumer_failure():
+    """
+    Test that the bounded queue stops the reader from running ahead of the consumer, and that a
+    failure in the consumer stops the reader thread and closes the source.
+    """
+
+    produced: list[int] = []
+    closed = threading.Event()
+
+    def source() -> Iterator[int]:
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    reader = ThreadedReader(source(), maxsize=2, on_close=closed.set)
+
+    with pytest.raises(RuntimeError):
+        for _ in reader:
+            # Give the reader time to fill the queue.
+            time.sleep(0.05)
+            raise RuntimeError("disk full")
+
+    assert closed.is_set(), "on_close was not called after a consumer failure."
+    assert not reader._thread.is_alive(), "Reader thread is still running."
+    assert len(produced) < 10, "The reader was not held back by the bounded queue."
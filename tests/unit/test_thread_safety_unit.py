@@ -0,0 +1,146 @@
+import gc
+import pytest
+import requests
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from synthex import Synthex
+from synthex.api_client import APIClient
+from synthex.sessions import SessionManager
+from synthex.transports import RequestsTransport
+
+
+@pytest.mark.unit
+def test_session_manager_per_thread_sessions():
+    """
+    Test that, in per-thread mode, `SessionManager` gives each thread its own session, reuses it
+    within the thread and applies the shared headers to it.
+    """
+
+    manager = SessionManager({"X-API-Key": "test_api_key"}, per_thread=True)
+    sessions = []
+
+    def collect() -> None:
+        sessions.append(manager.get())
+        assert manager.get() is sessions[-1], "The session of a thread was not reused."
+
+    threads = [threading.Thread(target=collect) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(s) for s in sessions}) == 4, "Threads shared a session."
+    assert all(s.headers["X-API-Key"] == "test_api_key" for s in sessions), \
+        "The shared headers were not applied."
+    manager.close()
+    assert manager.session_count == 0, "Sessions were not released."
+
+
+@pytest.mark.unit
+def test_session_manager_closes_sessions_of_exited_threads():
+    """
+    Test that, in per-thread mode, the session of a thread is closed and forgotten once the
+    thread exits, so that short-lived threads do not leak sessions and their connections.
+    """
+
+    manager = SessionManager({}, per_thread=True)
+    closed = []
+
+    def use() -> None:
+        session = manager.get()
+        close = session.close
+
+        def recorded_close() -> None:
+            closed.append(session)
+            close()
+
+        session.close = recorded_close  # type: ignore[method-assign]
+
+    for _ in range(3):
+        thread = threading.Thread(target=use)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(closed) == 3, "The sessions of the exited threads were not closed."
+    assert manager.session_count == 0, "The sessions of the exited threads were not forgotten."
+    assert manager.get() is manager.get(), "The session of a live thread was not reused."
+    assert manager.session_count == 1, "The session of the live thread was not kept."
+    manager.close()
+
+@pytest.mark.unit
+def test_shared_session_by_default():
+    """
+    Test that, unless thread-safe mode is requested, all threads share one session.
+    """
+
+    client = APIClient("test_api_key")
+    other = []
+    thread = threading.Thread(target=lambda: other.append(client.session))
+    thread.start()
+    thread.join()
+
+    assert other[0] is client.session, "The session is not shared."
+
+
+@pytest.mark.unit
+def test_thread_safe_client_stress(local_server: str, monkeypatch: pytest.MonkeyPatch):
+    """
+    Stress test a thread-safe `Synthex` instance shared by a pool of 64 threads, against a local
+    stand-in server: every call must send exactly one request, each worker thread must get exactly
+    one session and no session may be used from two threads.
+    Args:
+        local_server (str): The base URL of the local stand-in server.
+        monkeypatch (pytest.MonkeyPatch): Used to instrument the sessions.
+    """
+
+    calls, threads = 640, 64
+    lock = threading.Lock()
+    current = threading.local()
+    # The calls that sent each request, and the threads that used each session.
+    sent: list[int] = []
+    users: dict[int, set[int]] = defaultdict(set)
+    create = SessionManager._create
+
+    def instrumented_create(manager: SessionManager) -> requests.Session:
+        session = create(manager)
+        request = session.request
+
+        def recorded_request(*args: Any, **kwargs: Any) -> requests.Response:
+            response = request(*args, **kwargs)
+            with lock:
+                sent.append(current.call)
+                users[id(session)].add(threading.get_ident())
+            return response
+
+        monkeypatch.setattr(session, "request", recorded_request)
+        return session
+
+    monkeypatch.setattr(SessionManager, "_create", instrumented_create)
+    synthex = Synthex(api_key="test_api_key", thread_safe=True)
+    client = synthex._client
+    assert isinstance(client, APIClient) and isinstance(client.transport, RequestsTransport)
+    client.BASE_URL = local_server
+    # Disable coalescing, so that every call reaches the server.
+    client._single_flight = None
+
+    def call(i: int) -> tuple[int, int]:
+        current.call = i
+        return threading.get_ident(), synthex.credits.promotional().amount
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(call, range(calls)))
+
+    assert [amount for _, amount in results] == [100] * calls, "Some requests failed."
+    assert sorted(sent) == list(range(calls)), "Requests were lost or duplicated."
+    workers = {thread for thread, _ in results}
+    assert all(len(u) == 1 for u in users.values()), "A session was used from two threads."
+    assert set().union(*users.values()) == workers, "A worker thread did not use its own session."
+    assert len(users) == len(workers), "The sessions do not map one-to-one to the worker threads."
+    gc.collect()
+    assert client.transport.sessions.session_count == 0, \
+        "The sessions of the exited worker threads were not closed."
+    client.close()
@@ -0,0 +1,259 @@
+import importlib.util
+import json
+import pytest
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from synthex import Synthex
+from synthex.endpoints import GET_PROMOTIONAL_CREDITS_ENDPOINT, CREATE_JOB_WITH_SAMPLES_ENDPOINT
+from synthex.exceptions import ConfigurationError, NotFoundError, ServerError
+from synthex.transports import HTTP2Transport, Response, Transport
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, url: str, body: bytes):
+        self.status_code = status_code
+        self.url = url
+        self.body = body
+        self.read = False
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return {}
+
+    @property
+    def content(self) -> bytes:
+        self.read = True
+        return self.body
+
+    @property
+    def text(self) -> str:
+        self.read = True
+        return self.body.decode("utf-8")
+
+    def json(self) -> Any:
+        self.read = True
+        return json.loads(self.body)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        yield from self.body.splitlines()
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeTransport(Transport):
+    """A transport that records requests and answers them from a table of canned responses."""
+
+    def __init__(self, routes: dict[str, tuple[int, bytes]]):
+        self.routes = routes
+        self.requests: list[tuple[str, str, Optional[dict[str, str]]]] = []
+        self.responses: list[_FakeResponse] = []
+
+    def request(
+        self, method: str, url: str, params: Optional[dict[str, Any]] = None,
+        json: Optional[Any] = None, headers: Optional[dict[str, str]] = None,
+        stream: bool = False, content: Optional[Iterable[bytes]] = None,
+        timeout: Optional[float] = None
+    ) -> Response:
+        self.requests.append((method, url, headers))
+        status, body = self.routes[url.rsplit("/", 1)[-1]]
+        response = _FakeResponse(status, url, body)
+        self.responses.append(response)
+        return response
+
+
+@pytest.mark.unit
+def test_custom_transport_receives_all_requests():
+    """
+    Test that a `Synthex` instance sends its requests, with its authentication headers, through
+    the transport it was given, and that errors are still mapped to Synthex exceptions.
+    """
+
+    transport = _FakeTransport({
+        "promotional": (200, b'{"message": "ok", "data": {"amount": 7, "currency": "USD"}}'),
+        "user": (404, b'{"error": "not found"}'),
+    })
+    synthex = Synthex(api_key="test_api_key", transport=transport)
+
+    assert synthex.credits.promotional().amount == 7, "The response was not parsed."
+    with pytest.raises(NotFoundError):
+        synthex.users.me()
+
+    method, url, headers = transport.requests[0]
+    assert method == "GET" and url.endswith(GET_PROMOTIONAL_CREDITS_ENDPOINT), "Wrong request."
+    assert headers is not None and headers["X-API-Key"] == "test_api_key", \
+        "The authentication header was not sent."
+
+
+@pytest.mark.unit
+def test_post_stream_does_not_read_successful_body():
+    """
+    Test that a successful streamed response is returned without its body being read, so that
+    it can be consumed incrementally.
+    """
+
+    transport = _FakeTransport({"with-samples": (200, b"data: []\n\n")})
+    synthex = Synthex(api_key="test_api_key", transport=transport)
+
+    response = synthex._client.post_stream(CREATE_JOB_WITH_SAMPLES_ENDPOINT, {})
+
+    assert not transport.responses[0].read, "The streamed body was read before being returned."
+    assert list(response.iter_lines()) == [b"data: []", b""], "The stream was altered."
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(
+    importlib.util.find_spec("httpx") is not None and importlib.util.find_spec("h2") is not None,
+    reason="the http2 extra is installed"
+)
+def test_http2_transport_requires_extra():
+    """
+    Test that creating an `HTTP2Transport` without the `http2` extra installed raises a
+    `ConfigurationError` that explains how to install it.
+    """
+
+    with pytest.raises(ConfigurationError):
+        HTTP2Transport()
+
+
+@pytest.mark.unit
+def test_success_body_is_decoded_once_into_model():
+    """
+    Test that a successful response body is parsed straight from its raw bytes into the target
+    model, without going through `Response.json`, while error bodies are still decoded.
+    """
+
+    class _NoJSONResponse(_FakeResponse):
+        def json(self) -> Any:
+            if self.status_code < 400:
+                raise AssertionError("The success body was decoded as JSON before validation.")
+            return super().json()
+
+    class _NoJSONTransport(_FakeTransport):
+        def request(self, *args: Any, **kwargs: Any) -> Response:
+            response = super().request(*args, **kwargs)
+            return _NoJSONResponse(response.status_code, response.url, response.body)
+
+    transport = _NoJSONTransport({
+        "promotional": (200, b'{"message": "ok", "data": {"amount": 7, "currency": "USD"}}'),
+        "user": (404, b'{"error": "not found"}'),
+    })
+    synthex = Synthex(api_key="test_api_key", transport=transport)
+
+    assert synthex.credits.promotional().amount == 7, "The response was not parsed."
+    with pytest.raises(NotFoundError) as e:
+        synthex.users.me()
+    assert e.value.details == {"error": "not found"}, "The error body was not decoded."
+
+
+def _mock_http2_transport(handler: Any) -> HTTP2Transport:
+    """
+    Build an `HTTP2Transport` whose client answers requests with `handler`, through
+    `httpx.MockTransport`. Skips the calling test if the `http2` extra is not installed.
+    """
+
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    transport = HTTP2Transport()
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return transport
+
+
+@pytest.mark.unit
+def test_http2_transport_streams_lines():
+    """
+    Test that `HTTP2Transport` sends the request built by the client, and that a streamed
+    response is read line by line, as bytes, without its body being read up front, even when
+    lines are split across chunks.
+    """
+
+    httpx = pytest.importorskip("httpx")
+    received = []
+
+    class _ChunkedStream(httpx.SyncByteStream):
+        def __iter__(self) -> Iterator[bytes]:
+            # Lines are split across chunks, as they may be on the wire.
+            yield from (b"data: [", b"1]\n\nda", b"ta: [2]\n\n")
+
+    def handler(request: Any) -> Any:
+        received.append(request)
+        return httpx.Response(200, stream=_ChunkedStream())
+
+    transport = _mock_http2_transport(handler)
+    synthex = Synthex(api_key="test_api_key", transport=transport)
+
+    response = synthex._client.post_stream(CREATE_JOB_WITH_SAMPLES_ENDPOINT, {"examples": []})
+
+    assert not response._response.is_stream_consumed, "The streamed body was read up front."
+    assert [line for line in response.iter_lines() if line] == [b"data: [1]", b"data: [2]"], \
+        "The stream was altered."
+    request = received[0]
+    assert request.method == "POST" and request.url.path.endswith(CREATE_JOB_WITH_SAMPLES_ENDPOINT)
+    assert request.headers["X-API-Key"] == "test_api_key", "The authentication header was lost."
+    assert json.loads(request.content) == {"examples": []}, "The JSON body was lost."
+    response.close()
+
+
+@pytest.mark.unit
+def test_http2_transport_maps_errors():
+    """
+    Test that error statuses received through `HTTP2Transport` are mapped to Synthex exceptions,
+    and that `httpx` timeouts, raised when sending or while streaming, become `TimeoutError`.
+    """
+
+    httpx = pytest.importorskip("httpx")
+
+    class _StalledStream(httpx.SyncByteStream):
+        def __iter__(self) -> Iterator[bytes]:
+            yield b"data: [1]\n\n"
+            raise httpx.ReadTimeout("The stream stalled.")
+
+    def handler(request: Any) -> Any:
+        if request.url.path.endswith("user"):
+            return httpx.Response(404, json={"error": "not found"})
+        if request.url.path.endswith("promotional"):
+            return httpx.Response(503, text="unavailable")
+        if request.url.path.endswith("stalled"):
+            return httpx.Response(200, stream=_StalledStream())
+        raise httpx.ConnectTimeout("The connection timed out.", request=request)
+
+    transport = _mock_http2_transport(handler)
+    synthex = Synthex(api_key="test_api_key", transport=transport)
+
+    with pytest.raises(NotFoundError) as e:
+        synthex.users.me()
+    assert e.value.details == {"error": "not found"}, "The error body was not decoded."
+    with pytest.raises(ServerError):
+        synthex.credits.promotional()
+    with pytest.raises(TimeoutError):
+        transport.request("GET", "https://example.test/slow")
+    response = transport.request("GET", "https://example.test/stalled", stream=True)
+    with pytest.raises(TimeoutError):
+        list(response.iter_lines())
+
+
+@pytest.mark.unit
+def test_http2_transport_close():
+    """
+    Test that closing an `HTTP2Transport` closes its client and its responses, that a new client
+    is created on next use, and that a client inherited from a parent process is left open.
+    """
+
+    httpx = pytest.importorskip("httpx")
+    transport = _mock_http2_transport(lambda request: httpx.Response(200, content=b"data: []\n"))
+
+    response = transport.request("GET", "https://example.test/events", stream=True)
+    response.close()
+    assert response._response.is_closed, "The response was not closed."
+
+    client = transport.client
+    transport.close()
+    assert client.is_closed, "The client was not closed."
+    assert transport.client is not client, "No new client was created after closing."
+
+    inherited = transport.client
+    # Pretend the transport was inherited from a parent process.
+    transport._pid = -1
+    transport.close()
+    assert not inherited.is_closed, "The client of the parent process was closed."
+    inherited.close()